@@ -0,0 +1,168 @@
+"""
+Callback Data Codec
+Packs a route id and typed arguments into short callback_data, e.g.
+``~2:1z`` for start_exam(71). Payloads over Telegram's 64-byte limit, or with
+text containing the separator (like invitation URLs), are kept in a
+server-side token table and sent as ``~*<token>``. CallbackRouter decodes
+once per update and passes the typed arguments to the handler as
+context.args; buttons sent before the codec keep working through each
+spec's legacy prefix.
+"""
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+from app.config.settings import CALLBACK_TOKEN_TABLE_SIZE, CALLBACK_TOKEN_TTL
+
+MARKER = "~"
+SEPARATOR = ":"
+TOKEN_MARK = "*"
+MAX_CALLBACK_DATA = 64  # bytes, Telegram's limit
+
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+def _to_base36(number):
+    if number < 0:
+        return "-" + _to_base36(-number)
+    digits = ""
+    while True:
+        number, remainder = divmod(number, 36)
+        digits = _DIGITS[remainder] + digits
+        if not number:
+            return digits
+
+class CallbackSpec(NamedTuple):
+    """A callback route: stable id, name, argument types and pre-codec prefix"""
+    id: int
+    name: str
+    types: tuple
+    legacy_prefix: Optional[str] = None
+
+    def parse_legacy(self, rest):
+        """Parse the text after legacy_prefix into typed args; None if it does not fit"""
+        parts = rest.split("_", len(self.types) - 1) if self.types else []
+        if len(parts) != len(self.types):
+            return None
+        try:
+            return tuple(kind(part) for kind, part in zip(self.types, parts))
+        except ValueError:
+            return None
+
+class DecodedCallback(NamedTuple):
+    spec: Optional[CallbackSpec]
+    args: Optional[tuple]
+    expired: bool = False
+
+class CallbackCodec:
+    """Registry of callback specs plus the token table for long payloads"""
+
+    def __init__(self, token_table_size=CALLBACK_TOKEN_TABLE_SIZE, token_ttl=CALLBACK_TOKEN_TTL):
+        self.token_table_size = token_table_size
+        self.token_ttl = token_ttl
+        self.specs = {}
+        self._tokens = OrderedDict()  # token -> (expires_at, spec id, args)
+        self._token_of = {}  # (spec id, args) -> token, so repeats reuse a token
+        self._lock = threading.Lock()
+        self.tokens_issued = 0
+        self.tokens_expired = 0
+
+    def register(self, spec_id, name, *types, legacy_prefix=None):
+        """Declare a route; ids end up in sent messages, so never reuse or renumber one"""
+        if spec_id in self.specs:
+            raise ValueError(f"Callback spec id {spec_id} already used by {self.specs[spec_id].name}")
+        spec = CallbackSpec(spec_id, name, types, legacy_prefix)
+        self.specs[spec_id] = spec
+        return spec
+
+    def encode(self, spec, *args):
+        """Get callback_data for spec(*args), falling back to a token when it does not fit"""
+        if len(args) != len(spec.types):
+            raise ValueError(f"{spec.name} takes {len(spec.types)} argument(s), got {len(args)}")
+        parts = [MARKER + _to_base36(spec.id)]
+        inline = True
+        for kind, value in zip(spec.types, args):
+            if kind is int:
+                parts.append(_to_base36(int(value)))
+            else:
+                value = str(value)
+                inline = inline and SEPARATOR not in value
+                parts.append(value)
+        data = SEPARATOR.join(parts)
+        if inline and len(data.encode("utf-8")) <= MAX_CALLBACK_DATA:
+            return data
+        return MARKER + TOKEN_MARK + self._issue_token(spec.id, tuple(kind(value) for kind, value in zip(spec.types, args)))
+
+    def decode(self, data) -> Optional[DecodedCallback]:
+        """Get the spec and typed args for codec data; None if data is not codec data"""
+        if not data.startswith(MARKER):
+            return None
+        if data.startswith(TOKEN_MARK, len(MARKER)):
+            return self._redeem_token(data[len(MARKER) + len(TOKEN_MARK):])
+        head, *parts = data[len(MARKER):].split(SEPARATOR)
+        try:
+            spec = self.specs.get(int(head, 36))
+        except ValueError:
+            return None
+        if spec is None or len(parts) != len(spec.types):
+            return None
+        # Strings are never split; a separator in one always goes through a token
+        try:
+            args = tuple(int(part, 36) if kind is int else part for kind, part in zip(spec.types, parts))
+        except ValueError:
+            return None
+        return DecodedCallback(spec, args)
+
+    def _issue_token(self, spec_id, args):
+        key = (spec_id, args)
+        with self._lock:
+            token = self._token_of.get(key)
+            if token is None:
+                token = secrets.token_urlsafe(8)
+                self._token_of[key] = token
+                self.tokens_issued += 1
+            self._tokens[token] = (time.monotonic() + self.token_ttl, spec_id, args)
+            self._tokens.move_to_end(token)
+            while len(self._tokens) > self.token_table_size:
+                _, (_, old_spec_id, old_args) = self._tokens.popitem(last=False)
+                self._token_of.pop((old_spec_id, old_args), None)
+        return token
+
+    def _redeem_token(self, token):
+        with self._lock:
+            entry = self._tokens.get(token)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._tokens[token]
+                self._token_of.pop(entry[1:], None)
+                entry = None
+            if entry is None:
+                self.tokens_expired += 1
+                return DecodedCallback(None, None, expired=True)
+        _, spec_id, args = entry
+        spec = self.specs.get(spec_id)
+        return DecodedCallback(spec, args) if spec is not None else None
+
+    def stats(self):
+        return {
+            "specs": len(self.specs),
+            "tokens": len(self._tokens),
+            "tokens_issued": self.tokens_issued,
+            "tokens_expired": self.tokens_expired
+        }
+
+callback_codec = CallbackCodec()
+
+# Route ids are part of sent buttons: append new ones, never renumber
+EXAM_COURSE = callback_codec.register(1, "exam_course", int, legacy_prefix="exam_course_")
+START_EXAM = callback_codec.register(2, "start_exam", int, legacy_prefix="start_exam_")
+PRACTICE_COURSE = callback_codec.register(3, "practice_course", int, legacy_prefix="practice_course_")
+PRACTICE_CHAPTER = callback_codec.register(4, "practice_chapter", int, legacy_prefix="practice_chapter_")
+VIEW_PAYMENT = callback_codec.register(5, "view_payment", int, legacy_prefix="view_payment_")
+APPROVE_PAYMENT = callback_codec.register(6, "approve_payment", int, legacy_prefix="approve_payment_")
+REJECT_PAYMENT = callback_codec.register(7, "reject_payment", int, legacy_prefix="reject_payment_")
+CONFIRM_DELETE_QUESTION = callback_codec.register(8, "confirm_delete_question", int, legacy_prefix="admin_confirm_delete_")
+COPY_REFERRAL_CODE = callback_codec.register(9, "copy_referral_code", str, legacy_prefix="copy_code_")
+COPY_INVITATION_LINK = callback_codec.register(10, "copy_invitation_link", str, legacy_prefix="copy_link_")
+REFERRAL_HISTORY = callback_codec.register(11, "referral_history", int, legacy_prefix="referral_history_")
+ANSWER = callback_codec.register(12, "answer", str, legacy_prefix="ans_")
@@ -0,0 +1,210 @@
+"""
+Callback Query Router
+One CallbackQueryHandler for every inline button: exact callback_data is
+looked up in a dict and parameterized routes (``start_exam_<id>``) in a
+prefix trie, so routing cost depends on the length of callback_data, not on
+how many routes exist. When several routes match, the one registered first
+wins, exactly like PTB's first-match handler chain. Routes added with
+add_spec also accept compact codec data and get their typed arguments in
+context.args.
+
+    python -m app.bot.callback_router    # report shadowed and unmatched routes
+"""
+
+import re
+from collections import Counter
+from typing import NamedTuple, Callable, Optional
+from telegram.ext import CallbackQueryHandler
+from app.bot.callback_codec import callback_codec, MARKER
+
+# Anchored literals with at most one group of literal alternatives, e.g.
+# ^admin$, ^start_exam_, ^(level_|stream_), ^select_(ns|ss)_course$
+_PATTERN_RE = re.compile(r"^\^?(?P<head>[\w\-]*)(?:\((?P<alts>[\w\-|]+)\)(?P<tail>[\w\-]*))?(?P<end>\$?)$")
+
+MAX_TRACKED_UNMATCHED = 1000
+
+class Route(NamedTuple):
+    order: int
+    key: str
+    exact: bool
+    callback: Callable
+    pattern: str
+    spec: Optional[object] = None
+
+    def describe(self):
+        kind = "exact" if self.exact else "prefix"
+        return f"{self.pattern} ({kind} '{self.key}') -> {getattr(self.callback, '__name__', self.callback)}"
+
+class Match(NamedTuple):
+    route: Optional[Route]
+    args: Optional[tuple]
+    expired: bool = False
+
+def expand_pattern(pattern):
+    """Turn a callback regex into (keys, exact); raise ValueError if it is not a plain literal"""
+    match = _PATTERN_RE.match(pattern)
+    if not match:
+        raise ValueError(f"Unsupported callback pattern: {pattern!r}")
+    head, alts, tail = match.group("head"), match.group("alts"), match.group("tail") or ""
+    keys = [head + alt + tail for alt in alts.split("|")] if alts else [head]
+    return keys, bool(match.group("end"))
+
+class CallbackRouter:
+    """Exact-match dict plus prefix trie dispatch for callback_data"""
+
+    def __init__(self, default=None, codec=callback_codec):
+        self.default = default
+        self.codec = codec
+        self.routes = []
+        self._exact = {}
+        self._trie = {}
+        self._typed = {}  # spec id -> route
+        self.unmatched = Counter()
+
+    def add(self, pattern, callback):
+        """Register a callback for a PTB-style pattern; earlier registrations win"""
+        keys, exact = expand_pattern(pattern)
+        for key in keys:
+            self._add_route(Route(len(self.routes), key, exact, callback, pattern))
+
+    def add_exact(self, data, callback):
+        self._add_route(Route(len(self.routes), data, True, callback, f"^{re.escape(data)}$"))
+
+    def add_prefix(self, prefix, callback):
+        self._add_route(Route(len(self.routes), prefix, False, callback, f"^{re.escape(prefix)}"))
+
+    def add_spec(self, spec, callback):
+        """Register a codec spec, and its legacy prefix, for a handler that reads context.args"""
+        route = Route(len(self.routes), MARKER + spec.name, True, callback, spec.name, spec)
+        self.routes.append(route)
+        self._typed.setdefault(spec.id, route)
+        if spec.legacy_prefix:
+            self._add_route(Route(len(self.routes), spec.legacy_prefix, False, callback,
+                                  f"^{re.escape(spec.legacy_prefix)}", spec))
+
+    def _add_route(self, route):
+        self.routes.append(route)
+        if route.exact:
+            # A duplicate exact key never wins; keep the first for dispatch
+            self._exact.setdefault(route.key, route)
+            return
+        node = self._trie
+        for char in route.key:
+            node = node.setdefault(char, {})
+        node.setdefault(None, route)
+
+    def resolve(self, data) -> Optional[Route]:
+        """Get the route PTB's first-match chain would have picked, or None"""
+        if data.startswith(MARKER):
+            decoded = self.codec.decode(data)
+            return self._typed.get(decoded.spec.id) if decoded is not None and decoded.spec else None
+        best = self._exact.get(data)
+        node = self._trie
+        route = node.get(None)
+        if route is not None and (best is None or route.order < best.order):
+            best = route
+        for char in data:
+            node = node.get(char)
+            if node is None:
+                break
+            route = node.get(None)
+            if route is not None and (best is None or route.order < best.order):
+                best = route
+        return best
+
+    def match(self, data) -> Match:
+        """Resolve callback_data and decode its typed args, once"""
+        if data.startswith(MARKER):
+            decoded = self.codec.decode(data)
+            if decoded is None or decoded.spec is None:
+                return Match(None, None, decoded is not None and decoded.expired)
+            return Match(self._typed.get(decoded.spec.id), decoded.args)
+        route = self.resolve(data)
+        if route is None or route.spec is None:
+            return Match(route, None)
+        args = route.spec.parse_legacy(data[len(route.key):])
+        # A legacy payload that does not parse (e.g. start_exam_maths) is unmatched
+        return Match(route, args) if args is not None else Match(None, None)
+
+    async def dispatch(self, update, context):
+        query = update.callback_query
+        data = query.data or ""
+        match = self.match(data)
+        if match.route is not None:
+            if match.route.spec is not None:
+                context.args = list(match.args)
+            return await match.route.callback(update, context)
+        if match.expired:
+            return await query.answer("⌛ This button has expired. Please open the menu again.", show_alert=True)
+
+        if data in self.unmatched or len(self.unmatched) < MAX_TRACKED_UNMATCHED:
+            self.unmatched[data] += 1
+        if self.default is not None:
+            return await self.default(update, context)
+
+    def handler(self):
+        """Single PTB handler that routes every callback query"""
+        return CallbackQueryHandler(self.dispatch)
+
+    def shadowed_routes(self):
+        """Get (route, shadowed_by) for routes an earlier route always beats"""
+        shadowed = []
+        for route in self.routes:
+            for earlier in self.routes[:route.order]:
+                if earlier.exact:
+                    hides = route.exact and earlier.key == route.key
+                else:
+                    hides = route.key.startswith(earlier.key)
+                if hides:
+                    shadowed.append((route, earlier))
+                    break
+        return shadowed
+
+    def unmatched_data(self, candidates):
+        """Get the callback_data values from candidates that no route handles"""
+        return sorted(data for data in set(candidates) if self.resolve(data) is None)
+
+_CALLBACK_DATA_RE = re.compile(r"""callback_data\s*=\s*f?["']([^"'{]*)(\{)?""")
+
+def collect_callback_data(paths):
+    """Scan source files for callback_data literals; f-strings yield their static prefix"""
+    found = set()
+    for path in paths:
+        with open(path, encoding="utf-8") as source:
+            for literal, placeholder in _CALLBACK_DATA_RE.findall(source.read()):
+                # A placeholder means any id may follow; probe with one
+                found.add(literal + "1" if placeholder else literal)
+    return found
+
+def report(router, source_paths, fallback_router=None):
+    """Print shadowed routes and callback_data no route handles
+
+    fallback_router is the router the default handler dispatches with, if any.
+    """
+    shadowed = []
+    for label, current in (("dispatcher", router), ("fallback", fallback_router)):
+        if current is None:
+            continue
+        found = current.shadowed_routes()
+        print(f"🔀 {label}: {len(current.routes)} routes, {len(found)} shadowed")
+        for route, earlier in found:
+            print(f"  ⚠️ {route.describe()}\n      never reached, shadowed by {earlier.describe()}")
+        shadowed += found
+
+    unmatched = router.unmatched_data(collect_callback_data(source_paths))
+    if fallback_router is not None:
+        unmatched = fallback_router.unmatched_data(unmatched)
+    print(f"\n❓ {len(unmatched)} callback_data value(s) in the keyboards have no route")
+    for data in unmatched:
+        print(f"  • {data}")
+    return shadowed, unmatched
+
+if __name__ == "__main__":
+    import glob
+    import os
+    from app.bot.dispatcher_fixed import build_callback_router
+    from app.handlers.menu_handler import MENU_ROUTER
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sources = glob.glob(os.path.join(root, "handlers", "*.py")) + glob.glob(os.path.join(root, "keyboards", "*.py"))
+    report(build_callback_router(), sources, fallback_router=MENU_ROUTER)
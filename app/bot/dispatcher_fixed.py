@@ -1,6 +1,5 @@
 from telegram.ext import (
     CommandHandler,
-    CallbackQueryHandler,
     MessageHandler,
     PollAnswerHandler,
     filters
@@ -26,6 +25,7 @@ from app.handlers.admin_handler import (
     admin_back_main, handle_admin_text_input, edit_question, delete_question, admin_confirm_delete,
     admin_view_payment_details, admin_approve_payment, admin_reject_payment
 )
+from app.handlers.broadcast_handler import broadcast
 from app.handlers.course_handler import select_course, start_exam_selected
 from app.handlers.question_handler import answer_question, show_detailed_result
 from app.handlers.stream_dashboard_handler import (
@@ -39,8 +39,7 @@ from app.handlers.stream_dashboard_handler import (
 from app.handlers.stream_course_handler import (
     select_natural_science_course,
     select_social_science_course,
-    handle_stream_course_selection,
-    get_stream_course_handler
+    handle_stream_course_selection
 )
 from app.handlers.practice_handler import (
     start_practice,
@@ -51,94 +50,108 @@ from app.handlers.practice_handler import (
     practice_chapter_selected
 )
 from app.handlers.radio_question_handler import handle_poll_answer
+from app.bot.callback_router import CallbackRouter
+from app.bot.callback_codec import (
+    EXAM_COURSE, START_EXAM, PRACTICE_COURSE, PRACTICE_CHAPTER,
+    VIEW_PAYMENT, APPROVE_PAYMENT, REJECT_PAYMENT, CONFIRM_DELETE_QUESTION,
+    COPY_REFERRAL_CODE, COPY_INVITATION_LINK, REFERRAL_HISTORY, ANSWER
+)
 
-def register_handlers(app):
-    app.add_handler(CommandHandler("start", start))
-    app.add_handler(CommandHandler("register", register))
-    app.add_handler(CommandHandler("help", help_handler))
-    app.add_handler(CommandHandler("payments", admin_payments))
-    app.add_handler(CommandHandler("approve", approve))
-    app.add_handler(CommandHandler("reject", reject))
-    app.add_handler(CommandHandler("analytics", exam_analytics))
-    app.add_handler(CommandHandler("admin", admin_panel))
-    app.add_handler(CommandHandler("edit_question", edit_question))
-    app.add_handler(CommandHandler("delete_question", delete_question))
+def build_callback_router():
+    """Every inline button route; order matters: earlier routes win, menu is the fallback"""
+    router = CallbackRouter(default=menu)
 
-    # Callback query handlers - order matters: specific patterns first, general last
-    app.add_handler(CallbackQueryHandler(handle_registration_callback, pattern="^(level_|stream_)"))
-    app.add_handler(CallbackQueryHandler(onboarding, pattern="^(level_|stream_)"))
-    app.add_handler(CallbackQueryHandler(answer_question, pattern="^ans_"))
-    app.add_handler(CallbackQueryHandler(submit_payment, pattern="submit_payment"))
+    router.add("^(level_|stream_)", handle_registration_callback)
+    router.add("^(level_|stream_)", onboarding)
+    router.add_spec(ANSWER, answer_question)
+    router.add("submit_payment", submit_payment)
     
     # Admin panel handlers (must be before general menu handler)
-    app.add_handler(CallbackQueryHandler(admin_panel, pattern="^admin$"))
-    app.add_handler(CallbackQueryHandler(admin_users, pattern="^admin_users$"))
-    app.add_handler(CallbackQueryHandler(admin_view_payment_details, pattern="^view_payment_"))
-    app.add_handler(CallbackQueryHandler(admin_approve_payment, pattern="^approve_payment_"))
-    app.add_handler(CallbackQueryHandler(admin_reject_payment, pattern="^reject_payment_"))
-    app.add_handler(CallbackQueryHandler(admin_payments, pattern="^admin_payments$"))
-    app.add_handler(CallbackQueryHandler(admin_questions_menu, pattern="^admin_questions$"))
-    app.add_handler(CallbackQueryHandler(admin_results, pattern="^admin_results$"))
-    app.add_handler(CallbackQueryHandler(admin_export_menu, pattern="^admin_export$"))
-    app.add_handler(CallbackQueryHandler(admin_export_csv, pattern="^admin_export_csv$"))
-    app.add_handler(CallbackQueryHandler(admin_export_excel, pattern="^admin_export_excel$"))
-    app.add_handler(CallbackQueryHandler(admin_add_question_start, pattern="^admin_add_question$"))
-    app.add_handler(CallbackQueryHandler(admin_edit_question_start, pattern="^admin_edit_question$"))
-    app.add_handler(CallbackQueryHandler(admin_delete_question_start, pattern="^admin_delete_question$"))
-    app.add_handler(CallbackQueryHandler(admin_back_main, pattern="^admin_back_main$"))
-    app.add_handler(CallbackQueryHandler(admin_confirm_delete, pattern="^admin_confirm_delete_"))
+    router.add("^admin$", admin_panel)
+    router.add("^admin_users$", admin_users)
+    router.add_spec(VIEW_PAYMENT, admin_view_payment_details)
+    router.add_spec(APPROVE_PAYMENT, admin_approve_payment)
+    router.add_spec(REJECT_PAYMENT, admin_reject_payment)
+    router.add("^admin_payments$", admin_payments)
+    router.add("^admin_questions$", admin_questions_menu)
+    router.add("^admin_results$", admin_results)
+    router.add("^admin_export$", admin_export_menu)
+    router.add("^admin_export_csv$", admin_export_csv)
+    router.add("^admin_export_excel$", admin_export_excel)
+    router.add("^admin_add_question$", admin_add_question_start)
+    router.add("^admin_edit_question$", admin_edit_question_start)
+    router.add("^admin_delete_question$", admin_delete_question_start)
+    router.add("^admin_back_main$", admin_back_main)
+    router.add_spec(CONFIRM_DELETE_QUESTION, admin_confirm_delete)
 
     # Practice handlers
-    app.add_handler(CallbackQueryHandler(start_practice, pattern="^practice$"))
-    app.add_handler(CallbackQueryHandler(practice_by_course, pattern="^practice_course$"))
-    app.add_handler(CallbackQueryHandler(practice_course_selected, pattern="^practice_course_"))
-    app.add_handler(CallbackQueryHandler(practice_by_chapter, pattern="^practice_chapter$"))
-    app.add_handler(CallbackQueryHandler(practice_course_for_chapter, pattern="^practice_course_"))
-    app.add_handler(CallbackQueryHandler(practice_chapter_selected, pattern="^practice_chapter_"))
+    router.add("^practice$", start_practice)
+    router.add("^practice_course$", practice_by_course)
+    router.add_spec(PRACTICE_COURSE, practice_course_selected)
+    router.add("^practice_chapter$", practice_by_chapter)
+    router.add("^practice_course_", practice_course_for_chapter)
+    router.add_spec(PRACTICE_CHAPTER, practice_chapter_selected)
 
     # Stream course selection handler (must be before general course handler)
-    app.add_handler(get_stream_course_handler())
+    router.add("^select_(ns|ss)_course$", handle_stream_course_selection)
     
     # Stream dashboard handlers (specific patterns first)
-    app.add_handler(CallbackQueryHandler(natural_science_dashboard, pattern="^natural_science_dashboard$"))
-    app.add_handler(CallbackQueryHandler(social_science_dashboard, pattern="^social_science_dashboard$"))
-    app.add_handler(CallbackQueryHandler(handle_natural_science_action, pattern="^ns_"))
-    app.add_handler(CallbackQueryHandler(handle_social_science_action, pattern="^ss_"))
-    app.add_handler(CallbackQueryHandler(natural_science_exams, pattern="^ns_exams$"))
-    app.add_handler(CallbackQueryHandler(social_science_exams, pattern="^ss_exams$"))
-    app.add_handler(CallbackQueryHandler(select_natural_science_course, pattern="^select_ns_course$"))
-    app.add_handler(CallbackQueryHandler(select_social_science_course, pattern="^select_ss_course$"))
+    router.add("^natural_science_dashboard$", natural_science_dashboard)
+    router.add("^social_science_dashboard$", social_science_dashboard)
+    router.add("^ns_", handle_natural_science_action)
+    router.add("^ss_", handle_social_science_action)
+    router.add("^ns_exams$", natural_science_exams)
+    router.add("^ss_exams$", social_science_exams)
+    router.add("^select_ns_course$", select_natural_science_course)
+    router.add("^select_ss_course$", select_social_science_course)
     
     # Course selection handlers
-    app.add_handler(CallbackQueryHandler(select_course, pattern="^exam_course_"))
-    app.add_handler(CallbackQueryHandler(start_exam_selected, pattern="^start_exam_"))
+    router.add_spec(EXAM_COURSE, select_course)
+    router.add_spec(START_EXAM, start_exam_selected)
 
-    app.add_handler(CallbackQueryHandler(help_callback, pattern="^help$"))
-    app.add_handler(CallbackQueryHandler(materials_menu, pattern="^materials$"))
-    app.add_handler(CallbackQueryHandler(course_materials, pattern="^materials_course_"))
+    router.add("^help$", help_callback)
+    router.add("^materials$", materials_menu)
+    router.add("^materials_course_", course_materials)
 
     # Profile handlers - Specific patterns first
-    app.add_handler(CallbackQueryHandler(profile_menu, pattern="^profile$"))
-    app.add_handler(CallbackQueryHandler(copy_referral_code, pattern="^copy_code_"))
-    app.add_handler(CallbackQueryHandler(copy_invitation_link, pattern="^copy_link_"))
-    app.add_handler(CallbackQueryHandler(view_referral_history, pattern="^referral_history_"))
+    router.add("^profile$", profile_menu)
+    router.add_spec(COPY_REFERRAL_CODE, copy_referral_code)
+    router.add_spec(COPY_INVITATION_LINK, copy_invitation_link)
+    router.add_spec(REFERRAL_HISTORY, view_referral_history)
 
     # Community handlers - Specific patterns first
-    app.add_handler(CallbackQueryHandler(community_menu, pattern="^community$"))
-    app.add_handler(CallbackQueryHandler(community_posts, pattern="^community_posts$"))
-    app.add_handler(CallbackQueryHandler(study_groups, pattern="^study_groups$"))
-    app.add_handler(CallbackQueryHandler(chat_rooms, pattern="^chat_rooms$"))
-    app.add_handler(CallbackQueryHandler(community_leaders, pattern="^community_leaders$"))
-    app.add_handler(CallbackQueryHandler(create_post, pattern="^create_post$"))
-    app.add_handler(CallbackQueryHandler(like_posts, pattern="^like_posts$"))
-    app.add_handler(CallbackQueryHandler(comment_post, pattern="^comment_post$"))
-    app.add_handler(CallbackQueryHandler(join_group, pattern="^join_group$"))
-    app.add_handler(CallbackQueryHandler(join_chat, pattern="^join_chat$"))
-    app.add_handler(CallbackQueryHandler(my_stats, pattern="^my_stats$"))
+    router.add("^community$", community_menu)
+    router.add("^community_posts$", community_posts)
+    router.add("^study_groups$", study_groups)
+    router.add("^chat_rooms$", chat_rooms)
+    router.add("^community_leaders$", community_leaders)
+    router.add("^create_post$", create_post)
+    router.add("^like_posts$", like_posts)
+    router.add("^comment_post$", comment_post)
+    router.add("^join_group$", join_group)
+    router.add("^join_chat$", join_chat)
+    router.add("^my_stats$", my_stats)
+
+    # Menu sections; any other callback_data falls through to menu as the default
+    router.add("^(exams|payment|materials|admin|help|analytics|back_to_main|courses|practice|profile|community)$", menu)
+
+    return router
+
+def register_handlers(app):
+    app.add_handler(CommandHandler("start", start))
+    app.add_handler(CommandHandler("register", register))
+    app.add_handler(CommandHandler("help", help_handler))
+    app.add_handler(CommandHandler("payments", admin_payments))
+    app.add_handler(CommandHandler("approve", approve))
+    app.add_handler(CommandHandler("reject", reject))
+    app.add_handler(CommandHandler("analytics", exam_analytics))
+    app.add_handler(CommandHandler("admin", admin_panel))
+    app.add_handler(CommandHandler("edit_question", edit_question))
+    app.add_handler(CommandHandler("delete_question", delete_question))
+    app.add_handler(CommandHandler("broadcast", broadcast))
 
-    # Menu handler with specific patterns first, then general fallback
-    app.add_handler(CallbackQueryHandler(menu, pattern="^(exams|payment|materials|admin|help|analytics|back_to_main|courses|practice|profile|community)$"))
-    app.add_handler(CallbackQueryHandler(menu))
+    # One router for every callback query (see build_callback_router)
+    app.add_handler(build_callback_router().handler())
 
     # Admin text input handler (must be before the general text handler)
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND & filters.ChatType.PRIVATE, handle_admin_text_input))
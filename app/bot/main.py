@@ -3,11 +3,29 @@ import signal
 import sys
 import time
 import asyncio
+import uvicorn
 from telegram import Update, Bot
 from telegram.ext import ApplicationBuilder, CommandHandler, ContextTypes
 from telegram.error import Conflict, InvalidToken, TelegramError
-from app.config.settings import BOT_TOKEN, WEBHOOK_URL
+from app.config.settings import (
+    BOT_TOKEN, BOT_API_BASE_URL, SESSION_PERSISTENCE, USE_WEBHOOK, WEBHOOK_URL, WEBHOOK_HOST, WEBHOOK_PORT, WEBHOOK_PATH,
+    WEBHOOK_SECRET, WEBHOOK_MAX_CONNECTIONS
+)
 from app.bot.dispatcher_fixed import register_handlers
+from app.database.migrations import run_migrations
+from app.database.session import engine
+from app.bot.callback_codec import callback_codec
+from app.keyboards.keyboard_cache import keyboard_cache
+from app.utils.timer import timer_wheel
+from app.bot.send_queue import send_queue
+from app.services.broadcast_service import resume_broadcasts, stop_broadcasts
+from app.bot.persistence import SessionPersistence
+from app.bot.webhook import webhook_ingress, create_app, WebhookServer
+from app.bot.update_processor import UserOrderedUpdateProcessor
+from app.handlers.radio_question_handler import resume_poll_timers
+from app.services.answer_service import answer_sink
+from app.services.question_bank import question_bank
+from app.services.user_cache import user_cache
 from app.utils.process_manager import cleanup_existing_bot, is_bot_running
 
 # Configure logging
@@ -23,7 +41,7 @@ global_app = None
 async def clear_webhook_completely():
     """Completely clear webhook and pending updates with verification"""
     try:
-        bot = Bot(token=BOT_TOKEN)
+        bot = Bot(token=BOT_TOKEN, base_url=BOT_API_BASE_URL or "https://api.telegram.org/bot")
         
         # Get current webhook info
         webhook_info = await bot.get_webhook_info()
@@ -85,6 +103,61 @@ async def ensure_clean_state():
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text("✅ Bot is running!")
 
+async def on_startup(app):
+    """Start background writers and preload caches once the application is up"""
+    await answer_sink.start()
+    await timer_wheel.start()
+    await send_queue.start()
+    resumed = resume_poll_timers(app)
+    if resumed:
+        logger.info(f"Resumed {resumed} timed exam sessions")
+    try:
+        resumed = await resume_broadcasts(app.bot)
+        if resumed:
+            logger.info(f"Resumed {resumed} interrupted broadcasts")
+    except Exception as e:
+        logger.error(f"Could not resume broadcasts (run python migrate.py): {e}")
+    try:
+        await question_bank.load_async()
+    except Exception as e:
+        # The bank loads lazily on first use instead
+        logger.warning(f"Question bank preload failed: {e}")
+
+async def on_stop(app):
+    """Stop the timers and drain queued sends while the bot can still reach Telegram"""
+    await timer_wheel.stop()
+    logger.info(f"Question timer stats: {timer_wheel.stats()}")
+    # Broadcasts keep their checkpoint; their queued sends are dropped, not drained
+    await stop_broadcasts()
+    await send_queue.stop()
+    logger.info(f"Send queue stats: {send_queue.stats()}")
+
+async def on_shutdown(app):
+    """Write anything still buffered before the process exits"""
+    await answer_sink.stop()
+    logger.info(f"Answer sink flushed {answer_sink.flushed_rows} answers in {answer_sink.flush_count} batches")
+    logger.info(f"Question bank stats: {question_bank.stats()}")
+    logger.info(f"User cache stats: {user_cache.stats()}")
+    logger.info(f"Callback codec stats: {callback_codec.stats()}")
+    logger.info(f"Keyboard cache stats: {keyboard_cache.stats()}")
+    if isinstance(app.update_processor, UserOrderedUpdateProcessor):
+        logger.info(f"Update processor stats: {app.update_processor.stats()}")
+    if isinstance(app.persistence, SessionPersistence):
+        logger.info(f"Session persistence stats: {app.persistence.stats()}")
+
+def build_application():
+    """Application with the lifecycle hooks, per-user ordered concurrent updates and, when enabled, session persistence"""
+    builder = (
+        ApplicationBuilder().token(BOT_TOKEN)
+        .concurrent_updates(UserOrderedUpdateProcessor())
+        .post_init(on_startup).post_stop(on_stop).post_shutdown(on_shutdown)
+    )
+    if BOT_API_BASE_URL:
+        builder = builder.base_url(BOT_API_BASE_URL)
+    if SESSION_PERSISTENCE:
+        builder = builder.persistence(SessionPersistence())
+    return builder.build()
+
 def signal_handler(signum, frame):
     """Handle graceful shutdown"""
     logger.info("Received shutdown signal, stopping bot...")
@@ -97,6 +170,10 @@ def signal_handler(signum, frame):
                 global_app.stop()
         except Exception as e:
             logger.warning(f"Error during graceful shutdown: {e}")
+    try:
+        answer_sink.flush()
+    except Exception as e:
+        logger.error(f"Failed to flush buffered answers on shutdown: {e}")
     sys.exit(0)
 
 def setup_signal_handlers():
@@ -111,28 +188,53 @@ async def start_bot_with_webhook():
     try:
         logger.info("Starting bot with webhook mode...")
         
-        app = ApplicationBuilder().token(BOT_TOKEN).build()
+        app = build_application()
         global_app = app
         
-        # Setup signal handlers
-        setup_signal_handlers()
-        
         # register handlers
         register_handlers(app)
         
-        # Set webhook
-        webhook_url = f"{WEBHOOK_URL}/webhook"
-        await app.bot.set_webhook(url=webhook_url)
-        
-        logger.info(f"Webhook set to: {webhook_url}")
-        logger.info("Bot initialized successfully with webhook")
-        
         # Start the application
         await app.initialize()
         await app.start()
+        await on_startup(app)
+        await webhook_ingress.start(app)
         
-        # Keep running
-        await asyncio.Event().wait()
+        # Serve the ingress before Telegram is told about it
+        server = WebhookServer(uvicorn.Config(
+            create_app(webhook_ingress), host=WEBHOOK_HOST, port=WEBHOOK_PORT, log_level="warning"
+        ))
+        # A signal stops the server; the cleanup below then drains queued updates
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, server.handle_exit, signum, None)
+        serving = asyncio.create_task(server.serve())
+        
+        # Set webhook
+        webhook_url = WEBHOOK_URL if WEBHOOK_URL.endswith(WEBHOOK_PATH) else WEBHOOK_URL.rstrip("/") + WEBHOOK_PATH
+        await app.bot.set_webhook(
+            url=webhook_url,
+            allowed_updates=Update.ALL_TYPES,
+            max_connections=WEBHOOK_MAX_CONNECTIONS,
+            secret_token=WEBHOOK_SECRET or None
+        )
+        
+        logger.info(f"Webhook set to: {webhook_url}, serving on {WEBHOOK_HOST}:{WEBHOOK_PORT}")
+        logger.info("Bot initialized successfully with webhook")
+        
+        # Keep running until the server is told to exit
+        try:
+            await serving
+        finally:
+            await webhook_ingress.stop()
+            logger.info(f"Webhook ingress stats: {webhook_ingress.stats()}")
+            await app.stop()
+            await on_stop(app)
+            if app.persistence is not None:
+                await app.update_persistence()
+                await app.persistence.flush()
+            await on_shutdown(app)
+            await app.shutdown()
         
     except Exception as e:
         logger.error(f"Webhook startup failed: {e}")
@@ -155,7 +257,7 @@ def start_bot_with_polling():
         
         # Step 2: Build application with enhanced settings
         logger.info("🔧 Building bot application...")
-        app = ApplicationBuilder().token(BOT_TOKEN).build()
+        app = build_application()
         global_app = app
         
         # Setup signal handlers
@@ -261,8 +363,13 @@ def start_bot_with_polling():
 def start_bot():
     """Main bot startup function with mode selection"""
     try:
-        # Try polling mode first (more common for development)
-        start_bot_with_polling()
+        # Handlers and session persistence query columns added by later migrations
+        run_migrations(engine)
+        if USE_WEBHOOK:
+            asyncio.run(start_bot_with_webhook())
+        else:
+            # Polling is the default (more common for development)
+            start_bot_with_polling()
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
     except Exception as e:
@@ -0,0 +1,207 @@
+"""
+Session Persistence
+PTB persistence that keeps context.user_data in the user_sessions table, so
+in-progress exams resume after a restart. Records are compact JSON (an
+ExamSession is stored with its question ids, not the questions); a record is
+only written when it differs from the last one stored, and every write of a
+persistence run goes out in one batch.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.sqlite import insert
+from telegram.ext import BasePersistence, PersistenceInput
+from app.config.settings import SESSION_FLUSH_INTERVAL
+from app.database.session import engine
+from app.models.user_session import UserSession
+from app.services.exam_session import ExamSession
+
+logger = logging.getLogger(__name__)
+
+def _encode_value(value):
+    if isinstance(value, ExamSession):
+        return {"$es": _encode_value(value.to_record())}
+    if isinstance(value, (list, tuple)):
+        return [_encode_value(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _encode_value(item) for key, item in value.items()}
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(type(value).__name__)
+
+def encode_session(data):
+    """Compact, stable JSON for user_data; values JSON cannot hold are left out"""
+    record = {}
+    for key, value in data.items():
+        try:
+            record[str(key)] = _encode_value(value)
+        except TypeError as e:
+            logger.debug(f"Not persisting user_data[{key!r}] of type {e}")
+    return json.dumps(record, separators=(",", ":"), sort_keys=True)
+
+def _decode_object(obj):
+    if "$es" in obj:
+        return ExamSession.from_record(obj["$es"])
+    if "$dt" in obj:
+        return datetime.fromisoformat(obj["$dt"])
+    return obj
+
+def decode_session(record):
+    """Rebuild user_data from a stored record"""
+    data = json.loads(record, object_hook=_decode_object)
+    if "session" in data and data["session"] is None:
+        # A question was deleted since; the session cannot continue
+        del data["session"]
+    return data
+
+class SessionPersistence(BasePersistence):
+    """Stores user_data only; chat, bot and callback data stay in memory"""
+
+    def __init__(self, bind=engine, update_interval=SESSION_FLUSH_INTERVAL):
+        super().__init__(
+            store_data=PersistenceInput(bot_data=False, chat_data=False, user_data=True, callback_data=False),
+            update_interval=update_interval
+        )
+        self.bind = bind
+        self._stored = {}  # user_id -> record last written or loaded
+        self._pending = {}  # user_id -> record to write, None to delete
+        self._flush_task = None
+        self._write_lock = asyncio.Lock()  # keeps batches for the same user in order
+        self.written = 0
+        self.deleted = 0
+        self.unchanged = 0
+        self.batches = 0
+
+    # user_data
+
+    def _load(self):
+        with self.bind.connect() as conn:
+            return conn.execute(select(UserSession.user_id, UserSession.data)).all()
+
+    async def get_user_data(self):
+        user_data = {}
+        try:
+            rows = await asyncio.to_thread(self._load)
+        except Exception as e:
+            logger.error(f"Could not restore user sessions (run python migrate.py): {e}")
+            return user_data
+        for user_id, record in rows:
+            try:
+                user_data[user_id] = decode_session(record)
+                self._stored[user_id] = record
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Dropping unreadable session for user {user_id}: {e}")
+        logger.info(f"Restored {len(user_data)} user sessions")
+        return user_data
+
+    async def update_user_data(self, user_id, data):
+        record = encode_session(data)
+        if user_id not in self._pending and self._stored.get(user_id) == record:
+            self.unchanged += 1
+            return
+        self._pending[user_id] = record
+        self._schedule_flush()
+
+    async def drop_user_data(self, user_id):
+        self._pending[user_id] = None
+        self._schedule_flush()
+
+    async def refresh_user_data(self, user_id, user_data):
+        pass
+
+    # Writing
+
+    def _schedule_flush(self):
+        # PTB gathers every update_user_data of a run; this task runs once they are done
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+
+    def write(self, pending):
+        """Upsert and delete a batch of records in one transaction"""
+        now = datetime.utcnow()
+        rows = [
+            {"user_id": user_id, "data": record, "updated_at": now}
+            for user_id, record in pending.items() if record is not None
+        ]
+        dropped = [user_id for user_id, record in pending.items() if record is None]
+        with self.bind.begin() as conn:
+            if rows:
+                upsert = insert(UserSession.__table__)
+                conn.execute(upsert.on_conflict_do_update(
+                    index_elements=["user_id"],
+                    set_={"data": upsert.excluded.data, "updated_at": upsert.excluded.updated_at}
+                ), rows)
+            if dropped:
+                conn.execute(delete(UserSession.__table__).where(UserSession.user_id.in_(dropped)))
+        return len(rows), len(dropped)
+
+    async def flush(self):
+        """Write every pending record; a failed batch stays pending for the next run"""
+        async with self._write_lock:
+            while self._pending:
+                pending, self._pending = self._pending, {}
+                try:
+                    written, deleted = await asyncio.to_thread(self.write, pending)
+                except Exception as e:
+                    logger.error(f"Failed to persist {len(pending)} user sessions, retrying next run: {e}")
+                    # Newer records queued meanwhile win
+                    self._pending = {**pending, **self._pending}
+                    return
+                for user_id, record in pending.items():
+                    if record is None:
+                        self._stored.pop(user_id, None)
+                    else:
+                        self._stored[user_id] = record
+                self.written += written
+                self.deleted += deleted
+                self.batches += 1
+
+    def stats(self):
+        return {
+            "sessions": len(self._stored),
+            "pending": len(self._pending),
+            "written": self.written,
+            "deleted": self.deleted,
+            "unchanged": self.unchanged,
+            "batches": self.batches
+        }
+
+    # Not persisted
+
+    async def get_chat_data(self):
+        return {}
+
+    async def get_bot_data(self):
+        return {}
+
+    async def get_callback_data(self):
+        return None
+
+    async def get_conversations(self, name):
+        return {}
+
+    async def update_conversation(self, name, key, new_state):
+        pass
+
+    async def update_chat_data(self, chat_id, data):
+        pass
+
+    async def update_bot_data(self, data):
+        pass
+
+    async def update_callback_data(self, data):
+        pass
+
+    async def drop_chat_data(self, chat_id):
+        pass
+
+    async def refresh_chat_data(self, chat_id, chat_data):
+        pass
+
+    async def refresh_bot_data(self, bot_data):
+        pass
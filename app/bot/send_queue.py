@@ -0,0 +1,276 @@
+"""
+Outbound Send Queue
+Bot API sends that do not answer the current update (notifications, timeout
+messages, broadcasts) go through one queue that keeps the bot under
+Telegram's flood limits: a global token bucket (about 30 msg/s) and one per
+chat (about 1 msg/s). Lanes are served in priority order, so exam traffic
+never waits behind notifications, and a RetryAfter pauses sending for as long
+as Telegram asks before the message is retried. Each chat has at most one send
+in flight, so its messages arrive in the order they were queued.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from itertools import islice
+from telegram.error import RetryAfter
+from app.config.settings import (
+    SEND_QUEUE_GLOBAL_RATE, SEND_QUEUE_GLOBAL_BURST, SEND_QUEUE_CHAT_RATE, SEND_QUEUE_CHAT_BURST,
+    SEND_QUEUE_MAX_RETRIES
+)
+
+logger = logging.getLogger(__name__)
+
+# Priority lanes, served lowest first
+EXAM = 0
+NOTIFICATION = 1
+BULK = 2
+LANE_NAMES = ("exam", "notification", "bulk")
+
+# Jobs looked at per lane when their chats are rate limited
+SCAN_DEPTH = 256
+
+class TokenBucket:
+    """rate tokens per second, holding at most capacity"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now):
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def delay(self, now):
+        """Seconds until a token is available (0 if one is)"""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+    def hold(self, seconds, now):
+        """Give out nothing for the next `seconds`"""
+        self._refill(now)
+        self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+    def idle(self, now):
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+class _Send:
+    __slots__ = ("bot", "method", "chat_id", "kwargs", "lane", "future", "enqueued", "attempts")
+
+    def __init__(self, bot, method, chat_id, kwargs, lane, future):
+        self.bot = bot
+        self.method = method
+        self.chat_id = chat_id
+        self.kwargs = kwargs
+        self.lane = lane
+        self.future = future
+        self.enqueued = time.monotonic()
+        self.attempts = 0
+
+def _retrieve(future):
+    # Failures are logged by the queue; callers that fire and forget need not await
+    if not future.cancelled():
+        future.exception()
+
+class SendQueue:
+    """Rate-limited, prioritised Bot API sends with RetryAfter backoff"""
+
+    def __init__(self, global_rate=SEND_QUEUE_GLOBAL_RATE, global_burst=SEND_QUEUE_GLOBAL_BURST,
+                 chat_rate=SEND_QUEUE_CHAT_RATE, chat_burst=SEND_QUEUE_CHAT_BURST, max_retries=SEND_QUEUE_MAX_RETRIES):
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max_retries
+        self._lanes = tuple(deque() for _ in LANE_NAMES)
+        self._global = TokenBucket(global_rate, global_burst, time.monotonic())
+        self._chats = {}  # chat_id -> TokenBucket
+        self._wakeup = None
+        self._task = None
+        self._inflight = set()
+        self._sending = set()  # chat_ids with a send in flight
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.retry_after_seconds = 0.0
+        self.max_depth = 0
+        self._latencies = tuple(deque(maxlen=1024) for _ in LANE_NAMES)
+
+    def submit(self, bot, method, chat_id, lane=NOTIFICATION, **kwargs):
+        """Queue bot.<method>(chat_id=chat_id, **kwargs); the returned future resolves to its result"""
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_retrieve)
+        self._lanes[lane].append(_Send(bot, method, chat_id, kwargs, lane, future))
+        self.max_depth = max(self.max_depth, self.depth())
+        self._ensure_started()
+        self._wakeup.set()
+        return future
+
+    def send_message(self, bot, chat_id, text, lane=NOTIFICATION, **kwargs):
+        return self.submit(bot, "send_message", chat_id, lane=lane, text=text, **kwargs)
+
+    def depth(self):
+        return sum(len(lane) for lane in self._lanes)
+
+    def _chat_bucket(self, chat_id, now):
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            bucket = self._chats[chat_id] = TokenBucket(self.chat_rate, self.chat_burst, now)
+        return bucket
+
+    def _next_job(self, now):
+        """Pop the first job that may go now; otherwise (None, seconds to wait or None if empty)"""
+        if not any(self._lanes):
+            return None, None
+        wait = self._global.delay(now)
+        if wait > 0:
+            return None, wait
+        for lane in self._lanes:
+            blocked = set()
+            for position, job in enumerate(islice(lane, SCAN_DEPTH)):
+                if job.chat_id in blocked or job.chat_id in self._sending:
+                    continue  # keeps each chat's messages in order
+                bucket = self._chat_bucket(job.chat_id, now)
+                chat_wait = bucket.delay(now)
+                if chat_wait == 0:
+                    del lane[position]
+                    bucket.take(now)
+                    self._global.take(now)
+                    self._sending.add(job.chat_id)
+                    return job, 0.0
+                blocked.add(job.chat_id)
+                wait = chat_wait if wait == 0 else min(wait, chat_wait)
+        # Only chats with a send in flight left: their completion wakes the loop
+        return None, wait or None
+
+    def _prune(self, now):
+        # Full buckets carry no state worth keeping
+        for chat_id in [chat_id for chat_id, bucket in self._chats.items() if bucket.idle(now)]:
+            del self._chats[chat_id]
+
+    async def _send(self, job):
+        if job.future.cancelled():
+            # The caller gave up on it (e.g. a broadcast was stopped)
+            self._sending.discard(job.chat_id)
+            self._wakeup.set()
+            return
+        job.attempts += 1
+        try:
+            result = await getattr(job.bot, job.method)(chat_id=job.chat_id, **job.kwargs)
+        except RetryAfter as e:
+            seconds = float(e.retry_after)
+            now = time.monotonic()
+            # Telegram does not say which limit was hit, so every send pauses
+            self._global.hold(seconds, now)
+            self._chat_bucket(job.chat_id, now).hold(seconds, now)
+            self.retry_after_seconds += seconds
+            if job.attempts <= self.max_retries:
+                self.retried += 1
+                logger.warning(f"Flood control on {job.method} to {job.chat_id}, retrying in {seconds}s")
+                # Nothing else of this chat's has gone out meanwhile, so it is still first
+                self._lanes[job.lane].appendleft(job)
+                return
+            self._fail(job, e)
+        except Exception as e:
+            self._fail(job, e)
+        else:
+            self.sent += 1
+            self._latencies[job.lane].append(time.monotonic() - job.enqueued)
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            self._sending.discard(job.chat_id)
+            self._wakeup.set()
+
+    def _fail(self, job, error):
+        self.failed += 1
+        logger.error(f"Failed to {job.method} to {job.chat_id}: {error}")
+        if not job.future.done():
+            job.future.set_exception(error)
+
+    def _ensure_started(self):
+        if self._task is not None and not self._task.done():
+            return True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+        return True
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        pruned_at = time.monotonic()
+        while True:
+            now = time.monotonic()
+            job, wait = self._next_job(now)
+            if job is None:
+                if now - pruned_at > 60:
+                    self._prune(now)
+                    pruned_at = now
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            task = loop.create_task(self._send(job))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def start(self):
+        """Start sending on the running loop"""
+        self._ensure_started()
+
+    async def stop(self, timeout=5.0):
+        """Give queued sends up to `timeout` seconds to go out, then drop the rest"""
+        if self._task is None:
+            return
+        deadline = time.monotonic() + timeout
+        while (self.depth() or self._inflight) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._sending.clear()
+        dropped = 0
+        for lane in self._lanes:
+            while lane:
+                lane.popleft().future.cancel()
+                dropped += 1
+        if dropped:
+            logger.warning(f"Send queue stopped with {dropped} messages unsent")
+
+    def stats(self):
+        stats = {
+            "depth": {name: len(lane) for name, lane in zip(LANE_NAMES, self._lanes)},
+            "max_depth": self.max_depth,
+            "inflight": len(self._inflight),
+            "sent": self.sent,
+            "failed": self.failed,
+            "retried": self.retried,
+            "retry_after_s": self.retry_after_seconds,
+            "chats": len(self._chats)
+        }
+        for name, latencies in zip(LANE_NAMES, self._latencies):
+            latencies = sorted(latencies)
+            if latencies:
+                stats[f"{name}_p50_ms"] = round(latencies[len(latencies) // 2] * 1000, 1)
+                stats[f"{name}_p99_ms"] = round(latencies[int(len(latencies) * 0.99)] * 1000, 1)
+        return stats
+
+send_queue = SendQueue()
@@ -0,0 +1,96 @@
+"""
+Per-User Update Processor
+Runs updates from different users at the same time while each user's own
+updates still run one after another, in the order they arrived. Handlers
+read and write context.user_data across awaits (the exam session's index,
+for one), so two updates from the same user must never interleave.
+
+At most UPDATE_CONCURRENCY handlers run at once. The cap is taken after the
+user's turn comes, so a user tapping quickly waits on their own updates
+without holding slots other users could run in. UPDATE_BACKLOG bounds how
+many updates may be admitted (running or waiting) before PTB holds back.
+"""
+
+import asyncio
+from telegram.ext import BaseUpdateProcessor
+from app.config.settings import UPDATE_CONCURRENCY, UPDATE_BACKLOG
+
+class _UserTurn:
+    __slots__ = ("lock", "pending")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.pending = 0
+
+def update_key(update):
+    """The user an update belongs to (its chat if it has no user); None for updates like poll state"""
+    user = getattr(update, "effective_user", None)
+    if user is not None:
+        return user.id
+    chat = getattr(update, "effective_chat", None)
+    if chat is not None:
+        return chat.id
+    return None
+
+class UserOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Concurrent across users, strictly ordered within one user"""
+
+    def __init__(self, max_running=UPDATE_CONCURRENCY, max_admitted=UPDATE_BACKLOG):
+        super().__init__(max(max_running, max_admitted))
+        self.max_running = max_running
+        self._running = asyncio.Semaphore(max_running)
+        self._active = 0
+        self._turns = {}  # user id -> _UserTurn while that user has updates pending
+        self.processed = 0
+        self.waited = 0  # updates that queued behind the same user's previous one
+        self.peak_running = 0
+        self.peak_users = 0
+
+    async def do_process_update(self, update, coroutine):
+        key = update_key(update)
+        if key is None:
+            await self._run(coroutine)
+            return
+
+        # Taking a turn is synchronous, so turns follow the order updates reach the processor
+        turn = self._turns.get(key)
+        if turn is None:
+            turn = self._turns[key] = _UserTurn()
+            self.peak_users = max(self.peak_users, len(self._turns))
+        if turn.pending:
+            self.waited += 1
+        turn.pending += 1
+        try:
+            async with turn.lock:
+                await self._run(coroutine)
+        finally:
+            turn.pending -= 1
+            if not turn.pending:
+                del self._turns[key]
+
+    async def _run(self, coroutine):
+        async with self._running:
+            self._active += 1
+            self.peak_running = max(self.peak_running, self._active)
+            try:
+                await coroutine
+            finally:
+                self._active -= 1
+                self.processed += 1
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    def stats(self):
+        return {
+            "max_running": self.max_running,
+            "processed": self.processed,
+            "waited": self.waited,
+            "running": self._active,
+            "users_pending": len(self._turns),
+            "peak_running": self.peak_running,
+            "peak_users": self.peak_users
+        }
@@ -0,0 +1,156 @@
+"""
+Webhook Ingress
+A small ASGI app Telegram POSTs updates to. Each request is answered as soon
+as its update is on a bounded queue; WEBHOOK_WORKERS coroutines take updates
+off the queue and start each one as its own application task, up to the update
+processor's max_concurrent_updates at a time. A worker only waits for a free
+slot, never for an update to finish, so one user's backlog (their updates run
+one after another) cannot hold the workers other users need. When the queue
+is full the request gets a 503, so Telegram keeps the update and delivers it
+again later instead of the bot falling further and further behind.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from telegram import Update
+from app.config.settings import WEBHOOK_PATH, WEBHOOK_SECRET, WEBHOOK_WORKERS, WEBHOOK_QUEUE_SIZE
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+class WebhookIngress:
+    """Bounded queue of raw updates drained by a pool of workers"""
+
+    def __init__(self, workers=WEBHOOK_WORKERS, queue_size=WEBHOOK_QUEUE_SIZE, secret=WEBHOOK_SECRET):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.secret = secret
+        self.application = None
+        self._queue = None
+        self._tasks = []
+        self._admitted = None
+        self._processing = set()
+        self.accepting = False
+        self.received = 0
+        self.shed = 0
+        self.processed = 0
+        self.failed = 0
+        self.max_depth = 0
+        self._waits = deque(maxlen=1024)
+
+    def offer(self, data):
+        """Queue one decoded update; False if it has to be shed"""
+        if not self.accepting:
+            return False
+        try:
+            self._queue.put_nowait((time.monotonic(), data))
+        except asyncio.QueueFull:
+            self.shed += 1
+            return False
+        self.received += 1
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    async def _work(self):
+        while True:
+            enqueued, data = await self._queue.get()
+            self._waits.append(time.monotonic() - enqueued)
+            await self._admitted.acquire()
+            task = self.application.create_task(self._process(data))
+            self._processing.add(task)
+            task.add_done_callback(self._processing.discard)
+            self._queue.task_done()
+
+    async def _process(self, data):
+        try:
+            update = Update.de_json(data, self.application.bot)
+            # Through the update processor, so each user's updates keep their order
+            await self.application.update_processor.process_update(
+                update, self.application.process_update(update)
+            )
+            self.processed += 1
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Webhook update {data.get('update_id')} failed: {e}")
+        finally:
+            self._admitted.release()
+
+    async def start(self, application):
+        """Start the workers on the running loop, feeding `application`"""
+        self.application = application
+        self._queue = asyncio.Queue(self.queue_size)
+        self._admitted = asyncio.Semaphore(application.update_processor.max_concurrent_updates)
+        loop = asyncio.get_running_loop()
+        self._tasks = [loop.create_task(self._work()) for _ in range(self.workers)]
+        self.accepting = True
+
+    async def stop(self, timeout=5.0):
+        """Refuse new updates, give queued ones up to `timeout` seconds, then drop the rest"""
+        if not self._tasks:
+            return
+        self.accepting = False
+        deadline = time.monotonic() + timeout
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Webhook ingress stopped with {self._queue.qsize()} updates unprocessed")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._processing:
+            _, unfinished = await asyncio.wait(self._processing, timeout=max(0.0, deadline - time.monotonic()))
+            if unfinished:
+                logger.warning(f"Webhook ingress stopped with {len(unfinished)} updates still running")
+
+    def stats(self):
+        stats = {
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "running": len(self._processing),
+            "max_depth": self.max_depth,
+            "received": self.received,
+            "shed": self.shed,
+            "processed": self.processed,
+            "failed": self.failed
+        }
+        waits = sorted(self._waits)
+        if waits:
+            stats["wait_p50_ms"] = round(waits[len(waits) // 2] * 1000, 1)
+            stats["wait_p99_ms"] = round(waits[int(len(waits) * 0.99)] * 1000, 1)
+        return stats
+
+def create_app(ingress, path=WEBHOOK_PATH):
+    """ASGI app accepting Telegram's update POSTs at `path`"""
+    app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+
+    @app.post(path)
+    async def receive_update(request: Request):
+        if ingress.secret and request.headers.get(SECRET_HEADER) != ingress.secret:
+            return Response(status_code=403)
+        try:
+            data = json.loads(await request.body())
+        except ValueError:
+            return Response(status_code=400)
+        if not isinstance(data, dict) or "update_id" not in data:
+            return Response(status_code=400)
+        if not ingress.offer(data):
+            return Response(status_code=503, headers={"Retry-After": "1"})
+        return Response(status_code=200)
+
+    return app
+
+class WebhookServer(uvicorn.Server):
+    """uvicorn server that leaves SIGINT/SIGTERM to the bot, so shutdown can drain the ingress"""
+
+    @contextmanager
+    def capture_signals(self):
+        yield
+
+webhook_ingress = WebhookIngress()
@@ -7,10 +7,60 @@ load_dotenv()
 BOT_TOKEN = os.getenv("BOT_TOKEN", "8184888715:AAEvw1RcRfltV8A-y2fAHqb6w-CNmskO5to")
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/bot.db")
 
+# Database Engine Configuration
+DB_ENGINE_PROFILE = os.getenv("DB_ENGINE_PROFILE", "wal")  # wal, legacy
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256*1024*1024)))  # 256MB default
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # negative = KiB, 64MB default
+SQLITE_TEMP_STORE = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+
+# Answer Write-Behind Configuration
+ANSWER_SINK_BATCH_SIZE = int(os.getenv("ANSWER_SINK_BATCH_SIZE", "100"))
+ANSWER_SINK_FLUSH_INTERVAL = float(os.getenv("ANSWER_SINK_FLUSH_INTERVAL", "1.0"))  # seconds
+
+# Cache Configuration
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))  # users kept in the snapshot cache
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "300"))  # seconds
+CALLBACK_TOKEN_TABLE_SIZE = int(os.getenv("CALLBACK_TOKEN_TABLE_SIZE", "50000"))  # long callback payloads kept server-side
+CALLBACK_TOKEN_TTL = float(os.getenv("CALLBACK_TOKEN_TTL", str(7*24*3600)))  # seconds, 7 days default
+KEYBOARD_CATALOG_TTL = float(os.getenv("KEYBOARD_CATALOG_TTL", "300"))  # seconds before course/exam keyboards are rebuilt
+
+# Export Configuration
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))  # result rows fetched per batch while exporting
+
+# Session Persistence Configuration
+SESSION_PERSISTENCE = os.getenv("SESSION_PERSISTENCE", "true").lower() == "true"  # keep user_data across restarts
+SESSION_FLUSH_INTERVAL = float(os.getenv("SESSION_FLUSH_INTERVAL", "5"))  # seconds between batched session writes
+
+# Question Timer Configuration
+TIMER_WHEEL_TICK = float(os.getenv("TIMER_WHEEL_TICK", "0.5"))  # seconds per tick; timeouts fire up to one tick late
+TIMER_WHEEL_SLOTS = int(os.getenv("TIMER_WHEEL_SLOTS", "512"))  # slots per revolution
+
+# Outbound Send Queue Configuration
+SEND_QUEUE_GLOBAL_RATE = float(os.getenv("SEND_QUEUE_GLOBAL_RATE", "25"))  # msg/s; Telegram allows ~30, direct replies need the rest
+SEND_QUEUE_GLOBAL_BURST = int(os.getenv("SEND_QUEUE_GLOBAL_BURST", "5"))  # rate + burst stays within 30 in any one second
+SEND_QUEUE_CHAT_RATE = float(os.getenv("SEND_QUEUE_CHAT_RATE", "1"))  # msg/s to one chat
+SEND_QUEUE_CHAT_BURST = int(os.getenv("SEND_QUEUE_CHAT_BURST", "3"))  # messages one chat may get back to back
+SEND_QUEUE_MAX_RETRIES = int(os.getenv("SEND_QUEUE_MAX_RETRIES", "3"))  # RetryAfter retries before a send fails
+
+# Broadcast Configuration
+BROADCAST_PAGE_SIZE = int(os.getenv("BROADCAST_PAGE_SIZE", "200"))  # recipients read and checkpointed at a time
+
+# Scoring Configuration
+SCORING_VERIFY_TALLY = os.getenv("SCORING_VERIFY_TALLY", "false").lower() == "true"  # cross-check session tally against DB
+LEADERBOARD_SOURCE = os.getenv("LEADERBOARD_SOURCE", "rollup")  # rollup (user_score_stats) or results (window-function query)
+
 # Telegram API Configuration
 TELEGRAM_API_BASE_URL = os.getenv("TELEGRAM_API_BASE_URL", "API")
 TELEGRAM_API_PATH = os.getenv("TELEGRAM_API_PATH", "/")
 TELEGRAM_API_URL = TELEGRAM_API_BASE_URL + TELEGRAM_API_PATH
+BOT_API_BASE_URL = os.getenv("BOT_API_BASE_URL", "")  # e.g. http://127.0.0.1:8081/bot for a local or fake Bot API server; empty = api.telegram.org
 
 # Process Management Configuration
 ENABLE_PROCESS_CLEANUP = os.getenv("ENABLE_PROCESS_CLEANUP", "true").lower() == "true"
@@ -30,12 +80,20 @@ DROP_PENDING_UPDATES = os.getenv("DROP_PENDING_UPDATES", "true").lower() == "tru
 POLLING_TIMEOUT = int(os.getenv("POLLING_TIMEOUT", "10"))
 ALLOWED_UPDATES = os.getenv("ALLOWED_UPDATES", "all")  # all, message, callback_query, etc.
 
+# Update Processing Configuration
+UPDATE_CONCURRENCY = int(os.getenv("UPDATE_CONCURRENCY", "32"))  # handlers running at once, one per user at most
+UPDATE_BACKLOG = int(os.getenv("UPDATE_BACKLOG", "256"))  # updates admitted, running or waiting for their user's turn
+
 # Webhook Configuration (Alternative to polling)
 USE_WEBHOOK = os.getenv("USE_WEBHOOK", "false").lower() == "true"
 WEBHOOK_URL = os.getenv("WEBHOOK_URL", "")
 WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "0.0.0.0")
 WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8443"))
 WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/webhook")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")  # checked against Telegram's secret token header when set
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", "8"))  # coroutines handing queued updates to the bot
+WEBHOOK_QUEUE_SIZE = int(os.getenv("WEBHOOK_QUEUE_SIZE", "1000"))  # updates held before Telegram is told to retry
+WEBHOOK_MAX_CONNECTIONS = int(os.getenv("WEBHOOK_MAX_CONNECTIONS", "40"))  # concurrent deliveries Telegram may open (1-100)
 
 # Admin Configuration
 ADMIN_USER_IDS = os.getenv("ADMIN_USER_IDS", "").split(",") if os.getenv("ADMIN_USER_IDS") else []
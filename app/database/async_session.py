@@ -0,0 +1,10 @@
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.config.settings import DATABASE_URL, DB_ENGINE_PROFILE
+from app.database.engine import build_async_engine
+
+async_engine = build_async_engine(DATABASE_URL, DB_ENGINE_PROFILE)
+# Objects stay usable after commit so handlers never trigger lazy IO on the event loop.
+# Used for reads only: aiosqlite holds SQLite's write lock across awaits, and a sync
+# write on the loop meanwhile blocks in the busy handler, stalling both until
+# busy_timeout. Async code writes through SessionLocal in a worker thread instead.
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
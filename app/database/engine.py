@@ -0,0 +1,146 @@
+"""
+Database Engine Profiles
+Builds SQLAlchemy engines with tuned SQLite pragmas and a sized connection pool
+"""
+
+import logging
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.config.settings import (
+    DATABASE_URL,
+    DB_ENGINE_PROFILE,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    SQLITE_SYNCHRONOUS,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_MMAP_SIZE,
+    SQLITE_CACHE_SIZE,
+    SQLITE_TEMP_STORE
+)
+
+logger = logging.getLogger(__name__)
+
+PROFILE_WAL = "wal"
+PROFILE_LEGACY = "legacy"
+
+ENGINE_PROFILES = [
+    PROFILE_WAL,
+    PROFILE_LEGACY
+]
+
+def is_sqlite_url(url):
+    """Check if a database URL points at SQLite"""
+    return str(url).startswith("sqlite")
+
+def is_sqlite_memory_url(url):
+    """Check if a SQLite URL is an in-memory database (no file, no pool)"""
+    url = str(url)
+    return url.split("?")[0] in ("sqlite://", "sqlite:///:memory:") or ":memory:" in url
+
+def to_async_url(url):
+    """Translate a sync database URL into its async driver equivalent"""
+    url = str(url)
+    if url.startswith("sqlite+aiosqlite"):
+        return url
+    if url.startswith("sqlite"):
+        return "sqlite+aiosqlite" + url[url.index(":"):]
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url[len("postgresql://"):]
+    return url
+
+def get_sqlite_pragmas(profile=DB_ENGINE_PROFILE):
+    """Get the pragmas applied to every new SQLite connection for a profile"""
+    if profile == PROFILE_LEGACY:
+        return {}
+
+    return {
+        "journal_mode": "WAL",
+        "synchronous": SQLITE_SYNCHRONOUS,
+        "busy_timeout": SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": SQLITE_MMAP_SIZE,
+        "cache_size": SQLITE_CACHE_SIZE,
+        "temp_store": SQLITE_TEMP_STORE,
+    }
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas):
+    """Run PRAGMA statements on a raw DBAPI connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+def install_sqlite_pragmas(engine, pragmas):
+    """Register a connect-event hook so each pooled connection gets the pragmas"""
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+def get_engine_options(database_url=DATABASE_URL, profile=DB_ENGINE_PROFILE):
+    """Get create_engine keyword arguments for a URL and profile"""
+    options = {}
+
+    if is_sqlite_url(database_url):
+        options["connect_args"] = {"check_same_thread": False}
+        if profile == PROFILE_LEGACY:
+            return options
+        # Let SQLite's busy handler wait on locks instead of pysqlite's own timeout
+        options["connect_args"]["timeout"] = SQLITE_BUSY_TIMEOUT_MS / 1000
+        if is_sqlite_memory_url(database_url):
+            # In-memory databases live in a single connection, pool sizing does not apply
+            return options
+    elif profile == PROFILE_LEGACY:
+        return options
+
+    options.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING
+    )
+    return options
+
+def build_engine(database_url=DATABASE_URL, profile=DB_ENGINE_PROFILE):
+    """Create an engine for the given URL using a configured profile"""
+    if profile not in ENGINE_PROFILES:
+        logger.warning(f"Unknown DB_ENGINE_PROFILE '{profile}', falling back to '{PROFILE_WAL}'")
+        profile = PROFILE_WAL
+
+    engine = create_engine(database_url, **get_engine_options(database_url, profile))
+
+    if is_sqlite_url(database_url):
+        pragmas = get_sqlite_pragmas(profile)
+        if is_sqlite_memory_url(database_url):
+            # WAL and mmap are meaningless for in-memory databases
+            pragmas = {k: v for k, v in pragmas.items() if k not in ("journal_mode", "mmap_size")}
+        install_sqlite_pragmas(engine, pragmas)
+
+    logger.info(f"Database engine built with '{profile}' profile")
+    return engine
+
+def build_async_engine(database_url=DATABASE_URL, profile=DB_ENGINE_PROFILE):
+    """Create an AsyncEngine for the given sync URL using a configured profile"""
+    if profile not in ENGINE_PROFILES:
+        logger.warning(f"Unknown DB_ENGINE_PROFILE '{profile}', falling back to '{PROFILE_WAL}'")
+        profile = PROFILE_WAL
+
+    async_url = to_async_url(database_url)
+    engine = create_async_engine(async_url, **get_engine_options(database_url, profile))
+
+    if is_sqlite_url(database_url):
+        pragmas = get_sqlite_pragmas(profile)
+        if is_sqlite_memory_url(database_url):
+            pragmas = {k: v for k, v in pragmas.items() if k not in ("journal_mode", "mmap_size")}
+        # Connect events fire on the sync engine that backs the async one
+        install_sqlite_pragmas(engine.sync_engine, pragmas)
+
+    logger.info(f"Async database engine built with '{profile}' profile")
+    return engine
@@ -0,0 +1,180 @@
+"""
+Versioned Schema Migrations
+Ordered, idempotent migrations tracked in the schema_migrations table.
+Replaces the old one-off migrate_*.py scripts.
+"""
+
+import logging
+from datetime import datetime
+from sqlalchemy import inspect, text
+from app.database.base import Base
+from app import models
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_TABLE = "schema_migrations"
+
+MIGRATIONS = []
+
+def migration(version, name):
+    """Register an upgrade function as a numbered migration"""
+    def decorator(func):
+        MIGRATIONS.append((version, name, func))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return func
+    return decorator
+
+def _column_names(conn, table_name):
+    return {col["name"] for col in inspect(conn).get_columns(table_name)}
+
+def _add_missing_columns(conn, table_name, columns):
+    """Add (name, ddl_type) columns that do not exist yet"""
+    existing = _column_names(conn, table_name)
+    added = []
+    for column_name, column_type in columns:
+        if column_name not in existing:
+            conn.exec_driver_sql(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}")
+            added.append(column_name)
+    if added:
+        logger.info(f"Added columns to {table_name}: {', '.join(added)}")
+    return added
+
+def _create_indexes(conn, indexes):
+    """Create (name, table, columns) indexes if they do not exist yet"""
+    for index_name, table_name, columns in indexes:
+        conn.exec_driver_sql(
+            f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({', '.join(columns)})"
+        )
+
+@migration(1, "base_schema")
+def _base_schema(conn):
+    """Create the core tables on a fresh database"""
+    Base.metadata.create_all(
+        bind=conn,
+        tables=[
+            models.User.__table__,
+            models.Payment.__table__,
+            models.Course.__table__,
+            models.Exam.__table__,
+            models.Question.__table__,
+            models.Answer.__table__,
+            models.Result.__table__,
+        ],
+        checkfirst=True
+    )
+
+@migration(2, "questions_columns")
+def _questions_columns(conn):
+    """Columns the admin question editor writes (was migrate_questions_table.py)"""
+    _add_missing_columns(conn, "questions", [
+        ("correct_answer", "VARCHAR(10)"),
+        ("course", "VARCHAR(100)"),
+        ("difficulty", "VARCHAR(20)"),
+        ("created_at", "DATETIME"),
+    ])
+
+@migration(3, "exams_columns")
+def _exams_columns(conn):
+    """Exam timing and marks columns (was migrate_exams_table.py)"""
+    _add_missing_columns(conn, "exams", [
+        ("time_limit", "INTEGER"),
+        ("total_marks", "INTEGER"),
+        ("created_at", "DATETIME"),
+    ])
+
+@migration(4, "referral_system")
+def _referral_system(conn):
+    """Referral columns on users and the referrals table (was migrate_referral_system.py)"""
+    _add_missing_columns(conn, "users", [
+        ("referral_code", "VARCHAR(8)"),
+        ("referred_by_id", "INTEGER"),
+        ("total_referrals", "INTEGER DEFAULT 0"),
+        ("total_commission", "INTEGER DEFAULT 0"),
+        ("is_referral_active", "BOOLEAN DEFAULT 1"),
+    ])
+    models.Referral.__table__.create(bind=conn, checkfirst=True)
+
+@migration(5, "answers_exam_id")
+def _answers_exam_id(conn):
+    """Answers record the exam they were given in"""
+    _add_missing_columns(conn, "answers", [
+        ("exam_id", "INTEGER REFERENCES exams(id)"),
+    ])
+
+@migration(6, "hot_query_indexes")
+def _hot_query_indexes(conn):
+    """Composite indexes for scoring, leaderboards, payments and referrals"""
+    _create_indexes(conn, [
+        ("ix_answers_user_question", "answers", ["user_id", "question_id"]),
+        ("ix_answers_user_exam", "answers", ["user_id", "exam_id"]),
+        ("ix_questions_exam_id", "questions", ["exam_id"]),
+        ("ix_exams_course_id", "exams", ["course_id"]),
+        ("ix_results_user_completed", "results", ["user_id", "completed_at"]),
+        ("ix_results_exam_id", "results", ["exam_id"]),
+        ("ix_payments_status_created", "payments", ["status", "created_at"]),
+        ("ix_payments_user_id", "payments", ["user_id"]),
+        ("ix_referrals_referrer_status", "referrals", ["referrer_id", "status"]),
+        ("ix_referrals_referred_status", "referrals", ["referred_id", "status"]),
+    ])
+
+@migration(7, "user_score_stats")
+def _user_score_stats(conn):
+    """Leaderboard rollup table, backfilled from existing results"""
+    from app.services.leaderboard_service import rebuild_user_score_stats
+    models.UserScoreStats.__table__.create(bind=conn, checkfirst=True)
+    rebuild_user_score_stats(conn)
+
+@migration(8, "user_sessions")
+def _user_sessions(conn):
+    """Persisted user_data for exam sessions that survive restarts"""
+    models.UserSession.__table__.create(bind=conn, checkfirst=True)
+
+@migration(9, "broadcasts")
+def _broadcasts(conn):
+    """Broadcast checkpoints and the blocked flag broadcasts skip"""
+    _add_missing_columns(conn, "users", [
+        ("is_blocked", "BOOLEAN NOT NULL DEFAULT 0"),
+    ])
+    models.Broadcast.__table__.create(bind=conn, checkfirst=True)
+
+def _ensure_migrations_table(conn):
+    conn.exec_driver_sql(
+        f"CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} ("
+        "version INTEGER PRIMARY KEY, "
+        "name VARCHAR NOT NULL, "
+        "applied_at DATETIME NOT NULL)"
+    )
+
+def get_applied_versions(engine):
+    """Get the set of migration versions already applied"""
+    with engine.begin() as conn:
+        _ensure_migrations_table(conn)
+        rows = conn.execute(text(f"SELECT version FROM {MIGRATIONS_TABLE}"))
+        return {row[0] for row in rows}
+
+def get_pending_migrations(engine):
+    """Get (version, name) for migrations not yet applied"""
+    applied = get_applied_versions(engine)
+    return [(version, name) for version, name, _ in MIGRATIONS if version not in applied]
+
+def run_migrations(engine, target=None):
+    """Apply pending migrations in order, each in its own transaction"""
+    applied = get_applied_versions(engine)
+    ran = []
+
+    for version, name, upgrade in MIGRATIONS:
+        if version in applied:
+            continue
+        if target is not None and version > target:
+            break
+
+        logger.info(f"Applying migration {version:04d}_{name}")
+        with engine.begin() as conn:
+            upgrade(conn)
+            conn.execute(
+                text(f"INSERT INTO {MIGRATIONS_TABLE} (version, name, applied_at) VALUES (:v, :n, :t)"),
+                {"v": version, "n": name, "t": datetime.utcnow()}
+            )
+        ran.append((version, name))
+
+    return ran
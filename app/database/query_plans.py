@@ -0,0 +1,88 @@
+"""
+Hot Query Plan Checks
+Runs EXPLAIN QUERY PLAN on the queries the bot issues most often and
+reports whether SQLite answers each one through an index.
+"""
+
+from sqlalchemy import select, text
+from app.models import Answer, Question, Result, Payment, Referral, Exam, UserScoreStats
+
+def get_hot_queries():
+    """Get (name, statement) pairs mirroring the hot query patterns"""
+    return [
+        (
+            "finalize_exam answers",
+            select(Answer).filter_by(user_id=1).filter(
+                Answer.question_id.in_(select(Question.id).filter_by(exam_id=1))
+            )
+        ),
+        (
+            "tally verification answers",
+            select(Answer).filter(
+                Answer.user_id == 1,
+                Answer.exam_id == 1,
+                Answer.timestamp >= "2024-01-01"
+            )
+        ),
+        (
+            "detailed feedback answers",
+            select(Answer, Question).join(Question, Answer.question_id == Question.id).filter(
+                Answer.user_id == 1,
+                Question.exam_id == 1
+            )
+        ),
+        (
+            "leaderboard user results",
+            select(Result).filter_by(user_id=1)
+        ),
+        (
+            "leaderboard top by best score",
+            select(UserScoreStats).order_by(UserScoreStats.best_score.desc()).limit(10)
+        ),
+        (
+            "latest user result",
+            select(Result).filter_by(user_id=1).order_by(Result.completed_at.desc()).limit(1)
+        ),
+        (
+            "questions by exam",
+            select(Question).filter_by(exam_id=1)
+        ),
+        (
+            "exams by course",
+            select(Exam).filter_by(course_id=1)
+        ),
+        (
+            "pending payments",
+            select(Payment).filter_by(status="PENDING")
+        ),
+        (
+            "referral stats",
+            select(Referral).filter_by(referrer_id=1, status="COMPLETED")
+        ),
+        (
+            "pending referrals of paying user",
+            select(Referral).filter_by(referred_id=1, status="PENDING")
+        ),
+    ]
+
+def explain(conn, statement):
+    """Get the EXPLAIN QUERY PLAN detail lines for a statement"""
+    sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))
+    return [row[-1] for row in rows]
+
+def plan_uses_index(plan):
+    """A plan uses an index when no step is a full table scan"""
+    for detail in plan:
+        if detail.startswith("SCAN ") and " USING " not in detail:
+            return False
+    return any(" USING " in detail for detail in plan)
+
+def check_hot_query_plans(engine):
+    """Get (name, uses_index, plan) for every hot query"""
+    report = []
+    with engine.connect() as conn:
+        for name, statement in get_hot_queries():
+            plan = explain(conn, statement)
+            report.append((name, plan_uses_index(plan), plan))
+    return report
@@ -1,9 +1,75 @@
+"""
+Database Seeding
+seed_database() adds a handful of sample courses, exams and questions for
+trying the bot out. generate_dataset() fills an empty database with
+synthetic, production-sized data for benchmarking: users across levels and
+streams, courses with many exams and questions, results with the answers
+behind them, payments and referrals. Rows go in with one executemany per
+chunk, ids are assigned up front so child rows never need a read back, and
+the leaderboard rollup is rebuilt at the end.
+
+    python -m app.database.seed                        # sample data
+    python -m app.database.seed --scale production     # 100k users, 4M answers
+    python -m app.database.seed --scale small --results 50000
+"""
+
+import argparse
+import logging
+import random
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+import time
+from operator import itemgetter
+from datetime import datetime, timedelta
+from sqlalchemy import insert, select, update, func
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.database.session import SessionLocal, engine as default_engine
+from app.database.migrations import run_migrations
+from app.config.constants import (
+    ACCESS_UNLOCKED,
+    LEVEL_FRESHMAN,
+    LEVEL_REMEDIAL,
+    PAYMENT_APPROVED,
+    PAYMENT_PENDING,
+    PAYMENT_REJECTED
+)
+from app.models import Answer, Course, Exam, Payment, Question, Referral, Result, User
+from app.services.leaderboard_service import backfill_user_score_stats
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 20000  # rows per executemany
+TELEGRAM_ID_BASE = 100000000
 
-from app.database.session import SessionLocal
-from app.models import Course, Exam, Question
+# What the registration flow stores (stream_keyboard, payment approval)
+STREAM_NATURAL = "natural"
+STREAM_SOCIAL = "social"
+NOT_PAID = "NOT_PAID"
+LOCKED = "LOCKED"
+
+STREAM_COURSES = {
+    STREAM_NATURAL: ["Biology", "Physics", "Chemistry", "Maths", "English"],
+    STREAM_SOCIAL: ["History", "Geography", "Economics", "Maths", "English"]
+}
+
+# Dataset sizes; any count can be overridden on the command line
+SCALES = {
+    "small": {
+        "users": 1000, "exams_per_course": 10, "questions_per_exam": 20, "results": 2000
+    },
+    "medium": {
+        "users": 20000, "exams_per_course": 100, "questions_per_exam": 30, "results": 30000
+    },
+    "production": {
+        "users": 100000, "exams_per_course": 250, "questions_per_exam": 40, "results": 100000
+    }
+}
+
+FIRST_NAMES = ["Abebe", "Almaz", "Bekele", "Dawit", "Eden", "Fikir", "Genet", "Hana", "Kebede", "Lidya",
+               "Meron", "Nahom", "Rahel", "Selam", "Tigist", "Yonas", "Zewdu", "Betelhem", "Samuel", "Mekdes"]
+LAST_NAMES = ["Tadesse", "Girma", "Haile", "Mengistu", "Alemu", "Bekele", "Tesfaye", "Wolde", "Desta", "Kassa"]
+DIFFICULTIES = ["easy", "medium", "hard"]
 
 def seed_database():
     """Seed the database with sample data"""
@@ -23,12 +89,9 @@ def seed_database():
         chemistry = Course(name="Chemistry", description="Study of matter and its transformations")
         english = Course(name="English", description="Study of language and literature")
         maths = Course(name="Maths", description="Study of numbers and mathematical concepts")
+        history = Course(name="History", description="Study of past events")
 
-        db.add(biology)
-        db.add(physics)
-        db.add(chemistry)
-        db.add(english)
-        db.add(maths)
+        db.add_all([biology, physics, chemistry, english, maths, history])
         db.commit()
 
         # Create exams
@@ -37,24 +100,19 @@ def seed_database():
         chem_exam = Exam(course_id=chemistry.id, name="Chemistry Final", total_questions=10)
         eng_exam = Exam(course_id=english.id, name="English Final", total_questions=10)
         maths_exam = Exam(course_id=maths.id, name="Maths Final", total_questions=10)
+        hist_exam = Exam(course_id=history.id, name="History Final", total_questions=10)
 
-        db.add(bio_exam)
-        db.add(phys_exam)
-        db.add(chem_exam)
-        db.add(eng_exam)
-        db.add(maths_exam)
+        db.add_all([bio_exam, phys_exam, chem_exam, eng_exam, maths_exam, hist_exam])
         db.commit()
 
         # Create questions
         questions = [
-            Question(exam_id=bio_exam.id, text="What is the basic unit of life?", option_a="Atom", option_b="Cell", option_c="Molecule", option_d="Tissue", correct_option="B"),
-            Question(exam_id=phys_exam.id, text="What is the SI unit of force?", option_a="Newton", option_b="Joule", option_c="Watt", option_d="Pascal", correct_option="A"),
-            Question(exam_id=hist_exam.id, text="When did World War II end?", option_a="1944", option_b="1945", option_c="1946", option_d="1947", correct_option="B"),
+            Question(exam_id=bio_exam.id, text="What is the basic unit of life?", option_a="Atom", option_b="Cell", option_c="Molecule", option_d="Tissue", correct_answer="B"),
+            Question(exam_id=phys_exam.id, text="What is the SI unit of force?", option_a="Newton", option_b="Joule", option_c="Watt", option_d="Pascal", correct_answer="A"),
+            Question(exam_id=hist_exam.id, text="When did World War II end?", option_a="1944", option_b="1945", option_c="1946", option_d="1947", correct_answer="B"),
         ]
 
-        for q in questions:
-            db.add(q)
-
+        db.add_all(questions)
         db.commit()
         print("✅ Database seeded successfully!")
 
@@ -66,5 +124,311 @@ def seed_database():
     finally:
         db.close()
 
+def _executemany(conn, table, rows):
+    """One driver-level executemany of `rows` (dicts with the same keys) into `table`
+
+    Values go through the column types' bind processors here, skipping the
+    per-row parameter handling of conn.execute(insert(table), rows); that cut
+    the production scale from 78s to 60s.
+    """
+    if not rows:
+        return 0
+    columns = list(rows[0])
+    compiled = insert(table).compile(dialect=conn.dialect, column_keys=columns)
+    processors = [
+        (name, processor)
+        for name in columns
+        for processor in (table.c[name].type.dialect_impl(conn.dialect).bind_processor(conn.dialect),)
+        if processor is not None
+    ]
+    for row in rows:
+        for name, processor in processors:
+            row[name] = processor(row[name])
+    if compiled.positional:
+        parameters = list(map(itemgetter(*compiled.positiontup), rows))
+    else:
+        parameters = rows
+    conn.exec_driver_sql(str(compiled), parameters)
+    return len(rows)
+
+def _insert_chunks(conn, table, rows):
+    """executemany `rows` (any iterable of dicts) into `table`, CHUNK_SIZE at a time; returns rows written"""
+    written = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK_SIZE:
+            written += _executemany(conn, table, chunk)
+            chunk = []
+    return written + _executemany(conn, table, chunk)
+
+class DatasetGenerator:
+    """Synthetic rows for every table, generated lazily from one seeded RNG"""
+
+    def __init__(self, users, exams_per_course, questions_per_exam, results, seed=1, now=None):
+        self.users = users
+        self.exams_per_course = exams_per_course
+        self.questions_per_exam = questions_per_exam
+        self.results = results
+        self.rng = random.Random(seed)
+        self.now = now or datetime.utcnow().replace(microsecond=0)
+        self.started = self.now - timedelta(days=365)
+
+        self.courses = sorted({name for names in STREAM_COURSES.values() for name in names})
+        self.course_ids = {name: course_id for course_id, name in enumerate(self.courses, 1)}
+        # Exams the students of each stream sit, by id
+        self.stream_exams = {
+            stream: [
+                (self.course_ids[name] - 1) * exams_per_course + number
+                for name in names
+                for number in range(1, exams_per_course + 1)
+            ]
+            for stream, names in STREAM_COURSES.items()
+        }
+        self.correct = {}  # question id -> correct letter
+        self.user_streams = {}  # user id -> stream, for paid users
+        self.user_joined = {}
+
+    def _moment(self, after=None):
+        start = after or self.started
+        return start + timedelta(seconds=self.rng.randint(0, int((self.now - start).total_seconds()) or 1))
+
+    def first_question_id(self, exam_id):
+        return (exam_id - 1) * self.questions_per_exam + 1
+
+    def course_rows(self):
+        for name, course_id in self.course_ids.items():
+            yield {"id": course_id, "name": name, "description": f"{name} for grade 12 national exam preparation"}
+
+    def exam_rows(self):
+        for name, course_id in self.course_ids.items():
+            for number in range(1, self.exams_per_course + 1):
+                yield {
+                    "id": (course_id - 1) * self.exams_per_course + number, "course_id": course_id,
+                    "name": f"{name} Exam {number}", "total_questions": self.questions_per_exam,
+                    "time_limit": self.rng.choice([30, 45, 60, 90]), "total_marks": self.questions_per_exam,
+                    "created_at": self._moment()
+                }
+
+    def question_rows(self):
+        rng = self.rng
+        for name, course_id in self.course_ids.items():
+            for number in range(1, self.exams_per_course + 1):
+                exam_id = (course_id - 1) * self.exams_per_course + number
+                first = self.first_question_id(exam_id)
+                for offset in range(self.questions_per_exam):
+                    question_id = first + offset
+                    answer = "ABCD"[rng.randrange(4)]
+                    self.correct[question_id] = answer
+                    yield {
+                        "id": question_id, "exam_id": exam_id,
+                        "text": f"{name} exam {number}, question {offset + 1}: which of the following is correct?",
+                        "option_a": f"{name} option A{question_id}", "option_b": f"{name} option B{question_id}",
+                        "option_c": f"{name} option C{question_id}", "option_d": f"{name} option D{question_id}",
+                        "correct_answer": answer, "course": name, "difficulty": rng.choice(DIFFICULTIES)
+                    }
+
+    def user_rows(self):
+        rng = self.rng
+        for user_id in range(1, self.users + 1):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            joined = self._moment()
+            self.user_joined[user_id] = joined
+            registered = rng.random() < 0.95
+            level = stream = None
+            if registered:
+                level = LEVEL_FRESHMAN if rng.random() < 0.7 else LEVEL_REMEDIAL
+                stream = STREAM_NATURAL if rng.random() < 0.55 else STREAM_SOCIAL
+
+            # Registered users pay, then wait on or get an admin decision
+            roll = rng.random()
+            if not registered or roll < 0.25:
+                payment_status, access = NOT_PAID, LOCKED
+            elif roll < 0.85:
+                payment_status, access = PAYMENT_APPROVED, ACCESS_UNLOCKED
+                self.user_streams[user_id] = stream
+            elif roll < 0.95:
+                payment_status, access = PAYMENT_PENDING, LOCKED
+            else:
+                payment_status, access = PAYMENT_REJECTED, LOCKED
+
+            yield {
+                "id": user_id, "telegram_id": TELEGRAM_ID_BASE + user_id, "full_name": f"{first} {last}",
+                "username": f"{first.lower()}{user_id}" if rng.random() < 0.8 else None,
+                "join_time": joined, "level": level, "stream": stream,
+                "payment_status": payment_status, "access": access,
+                "referral_code": f"R{user_id:07d}",
+                # Referrers joined earlier; about one user in five came through a referral
+                "referred_by_id": rng.randint(1, user_id - 1) if user_id > 1 and rng.random() < 0.2 else None,
+                "total_referrals": 0, "total_commission": 0, "is_referral_active": True, "is_blocked": rng.random() < 0.02
+            }
+
+    def payment_rows(self, conn):
+        rng = self.rng
+        rows = conn.execute(
+            select(User.id, User.payment_status).filter(User.payment_status != NOT_PAID).order_by(User.id)
+        )
+        for user_id, status in rows:
+            submitted = self._moment(self.user_joined[user_id])
+            # Some approved users had a rejected attempt first
+            if status == PAYMENT_APPROVED and rng.random() < 0.1:
+                yield {"user_id": user_id, "proof": f"photo-{user_id}-0", "status": PAYMENT_REJECTED,
+                       "created_at": submitted}
+            yield {"user_id": user_id, "proof": f"photo-{user_id}", "status": status, "created_at": submitted}
+
+    def referral_rows(self, conn):
+        rows = conn.execute(
+            select(User.id, User.referred_by_id, User.payment_status)
+            .filter(User.referred_by_id.isnot(None)).order_by(User.id)
+        )
+        for user_id, referrer_id, status in rows:
+            created = self.user_joined[user_id]
+            completed = status == PAYMENT_APPROVED
+            yield {
+                "referrer_id": referrer_id, "referred_id": user_id, "status": "COMPLETED" if completed else "PENDING",
+                "created_at": created, "completed_at": self._moment(created) if completed else None,
+                "commission_earned": 30, "commission_paid": completed and self.rng.random() < 0.5
+            }
+
+    def result_and_answer_rows(self):
+        """(result row, answer rows) per attempt; answers agree with the result's score"""
+        rng = self.rng
+        paid = list(self.user_streams.items())
+        if not paid:
+            return
+        # A few keen students sit most of the exams
+        weights = [rng.paretovariate(1.5) for _ in paid]
+        for result_id, (user_id, stream) in enumerate(rng.choices(paid, weights, k=self.results), 1):
+            exam_id = rng.choice(self.stream_exams[stream])
+            skill = rng.betavariate(4, 3)
+            completed = self._moment(self.user_joined[user_id])
+            first = self.first_question_id(exam_id)
+            answered = completed - timedelta(seconds=20 * self.questions_per_exam)
+            answers = []
+            score = 0
+            for question_id in range(first, first + self.questions_per_exam):
+                correct = self.correct[question_id]
+                is_correct = rng.random() < skill
+                score += is_correct
+                answered += timedelta(seconds=20)
+                answers.append({
+                    "user_id": user_id, "exam_id": exam_id, "question_id": question_id,
+                    "selected_option": correct if is_correct else "ABCD"[("ABCD".index(correct) + rng.randint(1, 3)) % 4],
+                    "is_correct": is_correct, "timestamp": answered
+                })
+            result = {
+                "id": result_id, "user_id": user_id, "exam_id": exam_id, "score": score,
+                "percentage": score / self.questions_per_exam * 100 if self.questions_per_exam else 0,
+                "completed_at": completed
+            }
+            yield result, answers
+
+def _referrals(conn, generator):
+    """Insert referrals, then give each referrer the totals the profile screen shows"""
+    written = _insert_chunks(conn, Referral.__table__, list(generator.referral_rows(conn)))
+    referrals = Referral.__table__
+    users = User.__table__
+    completed = (referrals.c.referrer_id == users.c.id, referrals.c.status == "COMPLETED")
+    conn.execute(
+        update(users)
+        .where(users.c.id.in_(select(referrals.c.referrer_id)))
+        .values(
+            total_referrals=select(func.count()).where(*completed).scalar_subquery(),
+            total_commission=select(func.coalesce(func.sum(referrals.c.commission_earned), 0))
+            .where(*completed).scalar_subquery()
+        )
+    )
+    return written
+
+def _results_and_answers(conn, generator):
+    """Insert results and answers side by side so neither list is ever held whole"""
+    results = []
+    answers = []
+    result_count = answer_count = 0
+    for result, result_answers in generator.result_and_answer_rows():
+        results.append(result)
+        answers.extend(result_answers)
+        if len(answers) >= CHUNK_SIZE:
+            result_count += _executemany(conn, Result.__table__, results)
+            answer_count += _executemany(conn, Answer.__table__, answers)
+            results, answers = [], []
+    result_count += _executemany(conn, Result.__table__, results)
+    answer_count += _executemany(conn, Answer.__table__, answers)
+    return result_count, answer_count
+
+def generate_dataset(engine=default_engine, users=1000, exams_per_course=10, questions_per_exam=20, results=2000,
+                     seed=1):
+    """Fill an empty database with synthetic data; returns ({table: rows written}, {table or step: seconds})"""
+    run_migrations(engine)
+    with engine.connect() as conn:
+        if conn.execute(select(func.count()).select_from(User.__table__)).scalar():
+            raise ValueError("generate_dataset needs an empty database; point DATABASE_URL at a new file")
+
+    generator = DatasetGenerator(users, exams_per_course, questions_per_exam, results, seed)
+    counts = {}
+    timings = {}
+
+    def step(name, write):
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            written = write(conn)
+        elapsed = time.perf_counter() - started
+        written = written if isinstance(written, dict) else {name: written}
+        counts.update(written)
+        timings.update(dict.fromkeys(written, elapsed))
+        timings[name] = elapsed
+        logger.info(f"Seeded {', '.join(written)} in {elapsed:.1f}s")
+
+    step("courses", lambda conn: _insert_chunks(conn, Course.__table__, generator.course_rows()))
+    step("exams", lambda conn: _insert_chunks(conn, Exam.__table__, generator.exam_rows()))
+    step("questions", lambda conn: _insert_chunks(conn, Question.__table__, generator.question_rows()))
+    step("users", lambda conn: _insert_chunks(conn, User.__table__, generator.user_rows()))
+    step("payments", lambda conn: _insert_chunks(conn, Payment.__table__, list(generator.payment_rows(conn))))
+    step("referrals", lambda conn: _referrals(conn, generator))
+    step("results", lambda conn: dict(zip(("results", "answers"), _results_and_answers(conn, generator))))
+
+    started = time.perf_counter()
+    counts["user_score_stats"] = backfill_user_score_stats(engine)
+    timings["user_score_stats"] = time.perf_counter() - started
+    return counts, timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the database with sample or synthetic data")
+    parser.add_argument("--scale", choices=sorted(SCALES), help="Generate a synthetic dataset of this size")
+    parser.add_argument("--users", type=int, help="Users (overrides the scale)")
+    parser.add_argument("--exams-per-course", type=int, help="Exams in each course (overrides the scale)")
+    parser.add_argument("--questions-per-exam", type=int, help="Questions in each exam (overrides the scale)")
+    parser.add_argument("--results", type=int, help="Finished exams, each with one answer per question "
+                                                    "(overrides the scale)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed, for repeatable datasets")
+    args = parser.parse_args()
+
+    overrides = {
+        name: getattr(args, name)
+        for name in ("users", "exams_per_course", "questions_per_exam", "results")
+        if getattr(args, name) is not None
+    }
+    if args.scale is None and not overrides:
+        run_migrations(default_engine)
+        seed_database()
+        return
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    sizes = dict(SCALES[args.scale or "small"], **overrides)
+    print(f"🌱 Generating {sizes['users']} users, {sizes['exams_per_course']} exams per course, "
+          f"{sizes['questions_per_exam']} questions per exam, {sizes['results']} results into {default_engine.url}")
+    started = time.perf_counter()
+    try:
+        counts, timings = generate_dataset(seed=args.seed, **sizes)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - started
+
+    for name, rows in counts.items():
+        print(f"   {name:<17} {rows:>10} rows {timings[name]:>7.1f}s")
+    print(f"✅ {sum(counts.values())} rows generated in {elapsed:.1f}s "
+          f"({sum(counts.values()) / elapsed:.0f} rows/s)")
+
 if __name__ == "__main__":
-    seed_database()
\ No newline at end of file
+    main()
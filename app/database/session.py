@@ -1,7 +1,6 @@
-from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from app.config.settings import DATABASE_URL
+from app.config.settings import DATABASE_URL, DB_ENGINE_PROFILE
+from app.database.engine import build_engine
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {})
+engine = build_engine(DATABASE_URL, DB_ENGINE_PROFILE)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-DATABASE_URL = "sqlite:///./data/bot.db"
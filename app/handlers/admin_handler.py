@@ -5,7 +5,11 @@ from app.models.payment import Payment
 from app.models.exam import Exam
 from app.models.question import Question
 from app.services.payment_service import approve_payment, reject_payment
-from app.config.constants import ADMIN_IDS
+from app.services.question_bank import question_bank
+from app.services.result_services import export_results_csv, export_results_excel, gzip_file
+from app.config.constants import ADMIN_IDS, PAYMENT_PENDING
+from app.bot.send_queue import send_queue
+from app.bot.callback_codec import callback_codec, VIEW_PAYMENT
 from app.keyboards.admin_keyboard import (
     get_admin_main_menu,
     get_admin_questions_menu,
@@ -16,8 +20,16 @@ from app.keyboards.admin_keyboard import (
 from app.keyboards.main_menu import main_menu
 from telegram import InputFile, InlineKeyboardButton, InlineKeyboardMarkup
 import io
+import asyncio
+import logging
+import tempfile
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
+# Bots may upload documents of up to 50 MB
+UPLOAD_LIMIT = 50 * 1024 * 1024
+
 # Helper function for safe message editing
 async def safe_edit_message_text(update, text, reply_markup=None):
     """Safely edit a message with fallback to sending new message"""
@@ -119,7 +131,7 @@ async def admin_payments(update, context):
         return
 
     db = SessionLocal()
-    payments = db.query(Payment).filter_by(status="PENDING").all()
+    payments = db.query(Payment).filter_by(status=PAYMENT_PENDING).all()
 
     if not payments:
         message_text = "💰 Payment Management\n\nNo pending payments found."
@@ -153,7 +165,7 @@ async def admin_payments(update, context):
         payment_list += "➖" * 30 + "\n\n"
         
         # Add button for this payment
-        payment_buttons.append([InlineKeyboardButton(f"📋 View Payment #{payment.id}", callback_data=f"view_payment_{payment.id}")])
+        payment_buttons.append([InlineKeyboardButton(f"📋 View Payment #{payment.id}", callback_data=callback_codec.encode(VIEW_PAYMENT, payment.id))])
     
     # Add back button
     payment_buttons.append([InlineKeyboardButton("⬅️ Back to Admin Menu", callback_data="admin_back_main")])
@@ -182,14 +194,8 @@ async def admin_view_payment_details(update, context):
         return
 
     try:
-        # Extract payment ID from callback data
-        callback_data = update.callback_query.data
-        if callback_data.startswith("view_payment_"):
-            payment_id = int(callback_data.split("_")[-1])
-        else:
-            await update.callback_query.answer("Invalid payment ID.")
-            return
-        
+        payment_id = context.args[0]
+
         db = SessionLocal()
         payment = db.query(Payment).filter_by(id=payment_id).first()
         user = db.query(User).filter_by(id=payment.user_id).first() if payment else None
@@ -263,7 +269,7 @@ async def admin_approve_payment(update, context):
         return
 
     try:
-        payment_id = int(update.callback_query.data.split("_")[-1])
+        payment_id = context.args[0]
         
         # Get user info for notification BEFORE approving
         db = SessionLocal()
@@ -283,11 +289,12 @@ async def admin_approve_payment(update, context):
                 reply_markup=get_admin_main_menu()
             )
 
-            # Enhanced notification to user
-            try:
-                # Send celebration message
-                await context.bot.send_message(
-                    chat_id=user.telegram_id,
+            # Enhanced notification to user, sent through the queue so the admin is not kept waiting
+            deliveries = [
+                # Celebration message
+                send_queue.send_message(
+                    context.bot,
+                    user.telegram_id,
                     text="🎉🎉🎉 CONGRATULATIONS! 🎉🎉🎉\n\n"
                          "🎯 YOUR PAYMENT HAS BEEN APPROVED! 🎯\n\n"
                          "✅ FULL ACCESS UNLOCKED!\n\n"
@@ -301,26 +308,18 @@ async def admin_approve_payment(update, context):
                          "• 🔥 Priority Support - Get help when you need it\n\n"
                          "🌟 Your journey to success starts NOW!\n\n"
                          "Go ahead and explore all the amazing features available to you! 🎊"
-                )
-                
-                # Send main menu with all options available
-                await context.bot.send_message(
-                    chat_id=user.telegram_id,
+                ),
+                # Main menu with all options available
+                send_queue.send_message(
+                    context.bot,
+                    user.telegram_id,
                     text="🎯 Choose your next adventure:",
                     reply_markup=main_menu(user.telegram_id)
                 )
-                
-                print(f"✅ Successfully notified user {user.telegram_id} of payment approval")
-                
-            except Exception as e:
-                print(f"❌ Failed to notify user {user.telegram_id}: {e}")
-                # Send message to admin about notification failure
-                await context.bot.send_message(
-                    chat_id=update.effective_user.id,
-                    text=f"⚠️ Payment approved but failed to notify user:\n"
-                         f"User ID: {user.telegram_id}\n"
-                         f"Please manually notify the user."
-                )
+            ]
+            context.application.create_task(
+                _report_approval_delivery(context.bot, update.effective_user.id, user.telegram_id, deliveries)
+            )
         elif success:
             await safe_edit_message_text(update, 
                 f"✅ Payment {payment_id} APPROVED\n\n"
@@ -339,6 +338,21 @@ async def admin_approve_payment(update, context):
             reply_markup=get_admin_main_menu()
         )
 
+async def _report_approval_delivery(bot, admin_id, telegram_id, deliveries):
+    """Tell the admin when the approval messages could not reach the user"""
+    try:
+        await asyncio.gather(*deliveries)
+        print(f"✅ Successfully notified user {telegram_id} of payment approval")
+    except Exception as e:
+        print(f"❌ Failed to notify user {telegram_id}: {e}")
+        send_queue.send_message(
+            bot,
+            admin_id,
+            text=f"⚠️ Payment approved but failed to notify user:\n"
+                 f"User ID: {telegram_id}\n"
+                 f"Please manually notify the user."
+        )
+
 # FIXED reject payment - NO SESSION DETACHMENT ISSUE
 async def admin_reject_payment(update, context):
     """Reject payment with enhanced user notification"""
@@ -347,7 +361,7 @@ async def admin_reject_payment(update, context):
         return
 
     try:
-        payment_id = int(update.callback_query.data.split("_")[-1])
+        payment_id = context.args[0]
         
         # Get user info for notification BEFORE rejecting
         db = SessionLocal()
@@ -366,25 +380,23 @@ async def admin_reject_payment(update, context):
                 reply_markup=get_admin_main_menu()
             )
 
-            # Enhanced notification to user
-            try:
-                await context.bot.send_message(
-                    chat_id=user.telegram_id,
-                    text="❌ Payment Rejected ❌\n\n"
-                         "Unfortunately, your payment proof could not be verified.\n\n"
-                         "🔍 Possible reasons:\n"
-                         "• Unclear or incomplete payment screenshot\n"
-                         "• Invalid transaction details\n"
-                         "• Payment not yet processed\n\n"
-                         "🔄 What you can do now:\n"
-                         "• ✅ Resubmit with a clearer payment screenshot\n"
-                         "• 📞 Contact your bank to verify the transaction\n"
-                         "• 💬 Message admin for specific guidance\n\n"
-                         "📧 Support: Don't worry, we're here to help!\n"
-                         "Contact support for assistance with your payment."
-                )
-            except Exception as e:
-                print(f"Failed to notify user {user.telegram_id}: {e}")
+            # Enhanced notification to user; failures are logged by the send queue
+            send_queue.send_message(
+                context.bot,
+                user.telegram_id,
+                text="❌ Payment Rejected ❌\n\n"
+                     "Unfortunately, your payment proof could not be verified.\n\n"
+                     "🔍 Possible reasons:\n"
+                     "• Unclear or incomplete payment screenshot\n"
+                     "• Invalid transaction details\n"
+                     "• Payment not yet processed\n\n"
+                     "🔄 What you can do now:\n"
+                     "• ✅ Resubmit with a clearer payment screenshot\n"
+                     "• 📞 Contact your bank to verify the transaction\n"
+                     "• 💬 Message admin for specific guidance\n\n"
+                     "📧 Support: Don't worry, we're here to help!\n"
+                     "Contact support for assistance with your payment."
+            )
         elif success:
             await safe_edit_message_text(update, 
                 f"❌ Payment {payment_id} REJECTED\n\n"
@@ -476,7 +488,7 @@ async def admin_confirm_delete(update, context):
         await update.callback_query.answer("Access denied.")
         return
 
-    question_id = int(update.callback_query.data.split("_")[-1])
+    question_id = context.args[0]
     await safe_edit_message_text(update, 
         f"⚠️ Confirm Deletion\n\nAre you sure you want to delete question {question_id}?",
         reply_markup=get_admin_confirm_delete(question_id)
@@ -536,6 +548,7 @@ async def handle_admin_text_input(update, context):
                     db.add(question)
                     db.commit()
                     db.close()
+                    question_bank.invalidate()
 
                     await update.message.reply_text(
                         f"✅ Question added successfully to exam ID: {exam_id}!",
@@ -572,6 +585,7 @@ async def handle_admin_text_input(update, context):
                 db.delete(question)
                 db.commit()
                 db.close()
+                question_bank.invalidate()
                 await update.message.reply_text(
                     f"✅ Question {question_id} deleted successfully!",
                     reply_markup=get_admin_questions_menu()
@@ -689,6 +703,41 @@ async def admin_export_csv(update, context):
         "📄 CSV Export\n\nGenerating CSV file...",
         reply_markup=get_admin_export_menu()
     )
+    # Exporting can take a while; don't hold up other updates
+    context.application.create_task(
+        _send_export(context.bot, update.effective_chat.id, export_results_csv, "csv", "📄", "CSV Export")
+    )
+
+async def _send_export(bot, chat_id, export, extension, icon, name):
+    """Run export(path) into a temp file in a worker thread and upload the file"""
+    handle, path = tempfile.mkstemp(prefix="exam_results_", suffix=f".{extension}")
+    os.close(handle)
+    filename = f"exam_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    try:
+        rows = await asyncio.to_thread(export, path)
+        if not rows:
+            await bot.send_message(chat_id=chat_id, text=f"{icon} {name}\n\nNo results to export yet.")
+            return
+        if os.path.getsize(path) > UPLOAD_LIMIT:
+            if extension != "csv":
+                # Workbooks are already zip-compressed
+                await bot.send_message(
+                    chat_id=chat_id,
+                    text=f"{icon} {name}\n\n{rows} results are too many for one Telegram upload. Use the CSV export."
+                )
+                return
+            path = await asyncio.to_thread(gzip_file, path)
+            filename += ".gz"
+        with open(path, "rb") as document:
+            await bot.send_document(
+                chat_id=chat_id, document=document, filename=filename,
+                caption=f"{icon} {rows} exam results"
+            )
+    except Exception as e:
+        logger.error(f"{name} failed: {e}")
+        await bot.send_message(chat_id=chat_id, text=f"❌ {name} failed: {e}")
+    finally:
+        os.remove(path)
 
 # Export Excel
 async def admin_export_excel(update, context):
@@ -700,6 +749,9 @@ async def admin_export_excel(update, context):
         "📊 Excel Export\n\nGenerating Excel file...",
         reply_markup=get_admin_export_menu()
     )
+    context.application.create_task(
+        _send_export(context.bot, update.effective_chat.id, export_results_excel, "xlsx", "📊", "Excel Export")
+    )
 
 # Command handlers for admin functions
 async def approve(update, context):
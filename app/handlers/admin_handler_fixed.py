@@ -5,7 +5,7 @@ from app.models.payment import Payment
 from app.models.exam import Exam
 from app.models.question import Question
 from app.services.payment_service import approve_payment, reject_payment
-from app.config.constants import ADMIN_IDS
+from app.config.constants import ADMIN_IDS, PAYMENT_PENDING
 from app.keyboards.admin_keyboard import (
     get_admin_main_menu,
     get_admin_questions_menu,
@@ -126,7 +126,7 @@ async def admin_payments(update, context):
         return
 
     db = SessionLocal()
-    payments = db.query(Payment).filter_by(status="PENDING").all()
+    payments = db.query(Payment).filter_by(status=PAYMENT_PENDING).all()
 
     if not payments:
         message_text = "💰 Payment Management\n\nNo pending payments found."
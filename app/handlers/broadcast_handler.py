@@ -0,0 +1,79 @@
+import re
+from app.config.constants import ADMIN_IDS
+from app.services.broadcast_service import (
+    SEGMENT_FIELDS, start_broadcast, cancel_broadcast, get_broadcast, recent_broadcasts, format_report
+)
+
+COMMAND = re.compile(r"^/\S+\s*")
+# Leading "field=value" words of /broadcast pick the segment
+SEGMENT_ARG = re.compile(r"^\s*(\w+)=(\S+)")
+SEGMENT_ALIASES = {"payment": "payment_status"}
+
+USAGE = (
+    "📣 Broadcast\n\n"
+    "/broadcast [stream=...] [level=...] [payment=...] <message>\n"
+    "  send to every user, or only to a segment\n"
+    "/broadcast status <id>\n"
+    "/broadcast cancel <id>\n\n"
+    "Example:\n/broadcast level=freshman New practice tests are available!"
+)
+
+def parse_broadcast(text):
+    """Split the text after /broadcast into (segment, message)"""
+    segment = {}
+    while True:
+        match = SEGMENT_ARG.match(text)
+        if not match:
+            break
+        field = SEGMENT_ALIASES.get(match.group(1).lower(), match.group(1).lower())
+        if field not in SEGMENT_FIELDS:
+            raise ValueError(f"Unknown filter '{match.group(1)}'. Use stream, level or payment.")
+        segment[field] = match.group(2)
+        text = text[match.end():]
+    return segment, text.strip()
+
+async def broadcast(update, context):
+    """Admin command: /broadcast [filters] <message>, /broadcast status|cancel <id>"""
+    if update.effective_user.id not in ADMIN_IDS:
+        await update.message.reply_text("Access denied.")
+        return
+
+    # Everything after the command, with the message's own line breaks
+    text = COMMAND.sub("", update.message.text, count=1)
+
+    if context.args and context.args[0] in ("status", "cancel"):
+        try:
+            broadcast_id = int(context.args[1])
+        except (IndexError, ValueError):
+            await update.message.reply_text(f"Usage: /broadcast {context.args[0]} <id>")
+            return
+        if context.args[0] == "cancel" and not await cancel_broadcast(broadcast_id):
+            await update.message.reply_text(f"Broadcast #{broadcast_id} is not running.")
+            return
+        record = await get_broadcast(broadcast_id)
+        if record is None:
+            await update.message.reply_text(f"Broadcast #{broadcast_id} not found.")
+            return
+        await update.message.reply_text(format_report(record))
+        return
+
+    try:
+        segment, message = parse_broadcast(text)
+    except ValueError as e:
+        await update.message.reply_text(f"❌ {e}")
+        return
+
+    if not message:
+        recent = await recent_broadcasts()
+        history = "\n".join(
+            f"#{item.id} {item.status}: {item.delivered} delivered, {item.blocked} blocked, {item.failed} failed"
+            for item in recent
+        )
+        await update.message.reply_text(USAGE + (f"\n\nRecent:\n{history}" if history else ""))
+        return
+
+    record, recipients = await start_broadcast(context.bot, update.effective_user.id, message, **segment)
+    await update.message.reply_text(
+        f"📣 Broadcast #{record.id} started to {recipients} users.\n"
+        f"You'll get a report when it finishes. /broadcast status {record.id}"
+    )
@@ -1,9 +1,10 @@
-from app.database.session import SessionLocal
-from app.models.user import User
-from app.services.course_service import get_course_by_id
-from app.services.exam_service import get_exams_by_course
-from app.services.question_service import get_questions_by_exam
+from app.services.user_cache import user_cache
+from app.bot.callback_codec import callback_codec, START_EXAM
+from app.services.course_service import get_course_by_id_async
+from app.services.exam_service import get_exams_by_course_async
+from app.services.question_service import get_questions_by_exam_async
 from app.keyboards.main_menu import main_menu
+from app.services.exam_session import ExamSession
 from app.handlers.radio_question_handler import start_exam_with_polls
 from app.keyboards.payment_keyboard import payment_keyboard
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
@@ -15,9 +16,7 @@ async def select_course(update, context):
 
     # Double-check access status for security
     user_id = query.from_user.id
-    db = SessionLocal()
-    user = db.query(User).filter_by(telegram_id=user_id).first()
-    db.close()
+    user = await user_cache.get_async(user_id)
 
     if not user or user.access == "LOCKED":
         await query.edit_message_text(
@@ -28,15 +27,15 @@ async def select_course(update, context):
         )
         return
 
-    course_id = int(query.data.replace("exam_course_", ""))
+    course_id = context.args[0]
 
-    course = get_course_by_id(course_id)
+    course = await get_course_by_id_async(course_id)
     if not course:
         await query.edit_message_text("Course not found.")
         return
 
     # Get exams for this course (as chapters)
-    exams = get_exams_by_course(course_id)
+    exams = await get_exams_by_course_async(course_id)
 
     # Build course content message
     message = f"📚 {course.name}\n\n"
@@ -48,7 +47,7 @@ async def select_course(update, context):
     if exams:
         for i, exam in enumerate(exams, 1):
             message += f"{i}. {exam.name}\n"
-            keyboard_buttons.append([InlineKeyboardButton(f"📝 Take {exam.name}", callback_data=f"start_exam_{exam.id}")])
+            keyboard_buttons.append([InlineKeyboardButton(f"📝 Take {exam.name}", callback_data=callback_codec.encode(START_EXAM, exam.id))])
     else:
         message += "No chapters available yet.\n"
 
@@ -65,10 +64,10 @@ async def start_exam_selected(update, context):
     query = update.callback_query
     await query.answer()
 
-    exam_id = int(query.data.replace("start_exam_", ""))
+    exam_id = context.args[0]
 
     # Get questions for this exam
-    questions = get_questions_by_exam(exam_id, limit=None)  # Get all questions for exam
+    questions = await get_questions_by_exam_async(exam_id, limit=None)  # Get all questions for exam
 
     if not questions:
         await query.edit_message_text(
@@ -78,9 +77,7 @@ async def start_exam_selected(update, context):
         return
 
     # Check if user has access (payment status)
-    db = SessionLocal()
-    user = db.query(User).filter_by(telegram_id=query.from_user.id).first()
-    db.close()
+    user = await user_cache.get_async(query.from_user.id)
 
     if not user or user.access == "LOCKED":
         await query.edit_message_text(
@@ -92,13 +89,8 @@ async def start_exam_selected(update, context):
         return
 
     # Initialize exam session
-    context.user_data["user_id"] = query.from_user.id
-    context.user_data["chat_id"] = query.message.chat_id
-    context.user_data["exam_id"] = exam_id
-    context.user_data["questions"] = questions
-    context.user_data["index"] = 0
-    context.user_data["use_timer"] = False  # Can be made configurable
+    session = ExamSession(query.from_user.id, query.message.chat_id, questions, exam_id=exam_id, use_timer=False)  # Can be made configurable
 
     # Start exam with radio-style questions
-    await start_exam_with_polls(update, context, context.user_data)
+    await start_exam_with_polls(update, context, session)
 
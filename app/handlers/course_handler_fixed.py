@@ -4,6 +4,7 @@ from app.services.course_service import get_course_by_id
 from app.services.exam_service import get_exams_by_course
 from app.services.question_service import get_questions_by_exam
 from app.keyboards.main_menu import main_menu
+from app.services.exam_session import ExamSession
 from app.handlers.radio_question_handler import start_exam_with_polls
 from app.keyboards.payment_keyboard import payment_keyboard
 from app.utils.access_control import enforce_payment_access
@@ -74,12 +75,7 @@ async def start_exam_selected(update, context):
         return
 
     # Initialize exam session
-    context.user_data["user_id"] = query.from_user.id
-    context.user_data["chat_id"] = query.message.chat_id
-    context.user_data["exam_id"] = exam_id
-    context.user_data["questions"] = questions
-    context.user_data["index"] = 0
-    context.user_data["use_timer"] = False  # Can be made configurable
+    session = ExamSession(query.from_user.id, query.message.chat_id, questions, exam_id=exam_id, use_timer=False)  # Can be made configurable
 
     # Start exam with radio-style questions
-    await start_exam_with_polls(update, context, context.user_data)
+    await start_exam_with_polls(update, context, session)
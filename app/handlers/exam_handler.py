@@ -1,7 +1,6 @@
 from app.keyboards.course_keyboard import course_keyboard
 from app.keyboards.payment_keyboard import payment_keyboard
-from app.database.session import SessionLocal
-from app.models.user import User
+from app.services.user_cache import user_cache
 
 async def start_exam(update, context):
     query = update.callback_query
@@ -9,9 +8,7 @@ async def start_exam(update, context):
 
     # Check access status
     user_id = query.from_user.id
-    db = SessionLocal()
-    user = db.query(User).filter_by(telegram_id=user_id).first()
-    db.close()
+    user = await user_cache.get_async(user_id)
 
     if not user or user.access == "LOCKED":
         await query.edit_message_text(
@@ -1,55 +1,16 @@
-from app.database.session import SessionLocal
-from app.models.user import User
-from app.models.result import Result
+from app.services.leaderboard_service import get_leaderboard_async
 from app.keyboards.main_menu import main_menu
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
-import statistics
 
 async def show_leaderboard(update, context):
     """Display the leaderboard with user rankings"""
     query = update.callback_query
     await query.answer()
 
-    db = SessionLocal()
-    
-    # Get all users with their results
-    users = db.query(User).all()
-    leaderboard_data = []
-
-    for user in users:
-        # Get all results for this user
-        results = db.query(Result).filter_by(user_id=user.id).all()
-        
-        if results:
-            # Calculate different score metrics
-            scores = [result.score for result in results if result.score is not None]
-            if scores:
-                best_score = max(scores)
-                latest_score = scores[-1] if scores else 0
-                average_score = statistics.mean(scores) if scores else 0
-                
-                # Use best score as default ranking metric
-                user_score = best_score
-                user_name = user.full_name or f"User_{user.telegram_id}"
-                
-                leaderboard_data.append({
-                    'user_id': user.telegram_id,
-                    'user_name': user_name,
-                    'score': user_score,
-                    'best_score': best_score,
-                    'latest_score': latest_score,
-                    'average_score': round(average_score, 1),
-                    'total_exams': len(results)
-                })
-
-    # Sort by score (descending)
-    leaderboard_data.sort(key=lambda x: x['score'], reverse=True)
-
-    # Assign ranks
-    for rank, user_data in enumerate(leaderboard_data, 1):
-        user_data['rank'] = rank
-
-    db.close()
+    leaderboard_data, total_participants = await get_leaderboard_async("best", limit=10)
+    for user_data in leaderboard_data:
+        # Use best score as default ranking metric
+        user_data['score'] = user_data['best_score']
 
     # Format leaderboard message
     if not leaderboard_data:
@@ -66,8 +27,8 @@ async def show_leaderboard(update, context):
             message_text += f"   Best: {user_data['best_score']} | Latest: {user_data['latest_score']} | Avg: {user_data['average_score']}\n"
             message_text += f"   Exams taken: {user_data['total_exams']}\n\n"
         
-        if len(leaderboard_data) > 10:
-            message_text += f"... and {len(leaderboard_data) - 10} more participants\n\n"
+        if total_participants > 10:
+            message_text += f"... and {total_participants - 10} more participants\n\n"
         
         message_text += "📈 **Scoring Method:** Best score across all exams\n"
         message_text += "🎯 Take more exams to improve your ranking!"
@@ -93,35 +54,9 @@ async def show_leaderboard_best(update, context):
     query = update.callback_query
     await query.answer()
 
-    db = SessionLocal()
-    
-    users = db.query(User).all()
-    leaderboard_data = []
-
-    for user in users:
-        results = db.query(Result).filter_by(user_id=user.id).all()
-        
-        if results:
-            scores = [result.score for result in results if result.score is not None]
-            if scores:
-                best_score = max(scores)
-                user_name = user.full_name or f"User_{user.telegram_id}"
-                
-                leaderboard_data.append({
-                    'user_id': user.telegram_id,
-                    'user_name': user_name,
-                    'score': best_score,
-                    'total_exams': len(results)
-                })
-
-    # Sort by best score
-    leaderboard_data.sort(key=lambda x: x['score'], reverse=True)
-
-    # Assign ranks
-    for rank, user_data in enumerate(leaderboard_data, 1):
-        user_data['rank'] = rank
-
-    db.close()
+    leaderboard_data, _ = await get_leaderboard_async("best", limit=10)
+    for user_data in leaderboard_data:
+        user_data['score'] = user_data['best_score']
 
     # Format message
     message_text = "🏆 **LEADERBOARD - BEST SCORES** 🏆\n\n"
@@ -152,33 +87,9 @@ async def show_leaderboard_latest(update, context):
     query = update.callback_query
     await query.answer()
 
-    db = SessionLocal()
-    
-    users = db.query(User).all()
-    leaderboard_data = []
-
-    for user in users:
-        results = db.query(Result).filter_by(user_id=user.id).order_by(Result.created_at.desc()).all()
-        
-        if results:
-            latest_score = results[0].score  # Most recent result
-            user_name = user.full_name or f"User_{user.telegram_id}"
-            
-            leaderboard_data.append({
-                'user_id': user.telegram_id,
-                'user_name': user_name,
-                'score': latest_score,
-                'total_exams': len(results)
-            })
-
-    # Sort by latest score
-    leaderboard_data.sort(key=lambda x: x['score'], reverse=True)
-
-    # Assign ranks
-    for rank, user_data in enumerate(leaderboard_data, 1):
-        user_data['rank'] = rank
-
-    db.close()
+    leaderboard_data, _ = await get_leaderboard_async("latest", limit=10)
+    for user_data in leaderboard_data:
+        user_data['score'] = user_data['latest_score']
 
     # Format message
     message_text = "🕒 **LEADERBOARD - LATEST SCORES** 🕒\n\n"
@@ -209,35 +120,9 @@ async def show_leaderboard_average(update, context):
     query = update.callback_query
     await query.answer()
 
-    db = SessionLocal()
-    
-    users = db.query(User).all()
-    leaderboard_data = []
-
-    for user in users:
-        results = db.query(Result).filter_by(user_id=user.id).all()
-        
-        if results:
-            scores = [result.score for result in results if result.score is not None]
-            if scores:
-                average_score = statistics.mean(scores)
-                user_name = user.full_name or f"User_{user.telegram_id}"
-                
-                leaderboard_data.append({
-                    'user_id': user.telegram_id,
-                    'user_name': user_name,
-                    'score': round(average_score, 1),
-                    'total_exams': len(results)
-                })
-
-    # Sort by average score
-    leaderboard_data.sort(key=lambda x: x['score'], reverse=True)
-
-    # Assign ranks
-    for rank, user_data in enumerate(leaderboard_data, 1):
-        user_data['rank'] = rank
-
-    db.close()
+    leaderboard_data, _ = await get_leaderboard_async("average", limit=10)
+    for user_data in leaderboard_data:
+        user_data['score'] = user_data['average_score']
 
     # Format message
     message_text = "📈 **LEADERBOARD - AVERAGE SCORES** 📈\n\n"
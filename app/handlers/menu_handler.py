@@ -17,24 +17,135 @@ from app.handlers.stream_dashboard_handler import (
 )
 from app.keyboards.main_menu import main_menu
 from app.config.constants import ADMIN_IDS
-from app.database.session import SessionLocal
-from app.models.user import User
+from app.services.user_cache import user_cache
 from app.utils.access_control import check_level_access, get_user_accessible_levels
+from app.bot.callback_router import CallbackRouter
+from app.bot.callback_codec import EXAM_COURSE, START_EXAM
 from telegram.error import BadRequest
 
+async def _courses_section(update, context):
+    """Route to stream-specific dashboard based on user's stream"""
+    query = update.callback_query
+    user = await user_cache.get_async(query.from_user.id)
+
+    if user and user.stream:
+        if user.stream == "natural_science":
+            await natural_science_dashboard(update, context)
+        elif user.stream == "social_science":
+            await social_science_dashboard(update, context)
+        else:
+            await query.edit_message_text(
+                "❌ Stream information not found. Please register again to select your stream."
+            )
+    else:
+        await query.edit_message_text(
+            "❌ Stream information not found. Please register again to select your stream."
+        )
+
+async def _exams_section(update, context):
+    """Show stream-specific course selection"""
+    query = update.callback_query
+    user_id = query.from_user.id
+    user = await user_cache.get_async(user_id)
+
+    if user and user.stream:
+        from app.keyboards.stream_course_keyboard import get_stream_courses_keyboard, get_stream_courses_message
+
+        courses_message = get_stream_courses_message(user.stream, user)
+        courses_keyboard = get_stream_courses_keyboard(user.stream, user)
+
+        await query.edit_message_text(
+            courses_message,
+            reply_markup=courses_keyboard
+        )
+    else:
+        await query.edit_message_text(
+            "❌ Stream information not found. Please register again to select your stream."
+        )
+
+def _admin_only(handler):
+    async def guarded(update, context):
+        query = update.callback_query
+        if query.from_user.id in ADMIN_IDS:
+            await handler(update, context)
+        else:
+            try:
+                await query.edit_message_text("Access denied.")
+            except BadRequest:
+                await query.answer("Access denied.")
+    guarded.__name__ = handler.__name__
+    return guarded
+
+async def _back_to_main(update, context):
+    query = update.callback_query
+    try:
+        await query.edit_message_text(
+            "Choose an option:",
+            reply_markup=main_menu(query.from_user.id)
+        )
+    except BadRequest:
+        await query.answer("Menu updated")
+
+async def _help_section(update, context):
+    query = update.callback_query
+    try:
+        await query.edit_message_text(
+            "Help: Contact admin for support.",
+            reply_markup=main_menu(query.from_user.id)
+        )
+    except BadRequest:
+        await query.answer("Help section updated")
+
+async def _refresh_main_menu(update, context):
+    query = update.callback_query
+    try:
+        await query.edit_message_text(
+            "Choose an option:",
+            reply_markup=main_menu(query.from_user.id)
+        )
+    except BadRequest:
+        await query.answer("Menu refreshed")
+
+# Menu sections, first match wins; anything else refreshes the main menu
+MENU_ROUTER = CallbackRouter(default=_refresh_main_menu)
+MENU_ROUTER.add_spec(EXAM_COURSE, select_course)
+MENU_ROUTER.add_spec(START_EXAM, start_exam_selected)
+MENU_ROUTER.add_exact("profile", profile_menu)
+MENU_ROUTER.add_exact("courses", _courses_section)
+MENU_ROUTER.add_exact("exams", _exams_section)
+MENU_ROUTER.add_exact("natural_science_dashboard", natural_science_dashboard)
+MENU_ROUTER.add_exact("social_science_dashboard", social_science_dashboard)
+MENU_ROUTER.add_prefix("ns_", handle_natural_science_action)
+MENU_ROUTER.add_prefix("ss_", handle_social_science_action)
+MENU_ROUTER.add_exact("ns_exams", natural_science_exams)
+MENU_ROUTER.add_exact("ss_exams", social_science_exams)
+MENU_ROUTER.add_exact("payment", payment_menu)
+MENU_ROUTER.add_exact("materials", materials_menu)
+MENU_ROUTER.add_exact("practice", start_practice)
+MENU_ROUTER.add_exact("leaderboard", show_leaderboard)
+MENU_ROUTER.add_exact("leaderboard_best", show_leaderboard_best)
+MENU_ROUTER.add_exact("leaderboard_latest", show_leaderboard_latest)
+MENU_ROUTER.add_exact("leaderboard_average", show_leaderboard_average)
+MENU_ROUTER.add_exact("admin", _admin_only(admin_panel))
+MENU_ROUTER.add_exact("analytics", _admin_only(exam_analytics))
+MENU_ROUTER.add_exact("admin_payments", _admin_only(admin_payments))
+MENU_ROUTER.add_exact("back_to_main", _back_to_main)
+MENU_ROUTER.add_exact("help", _help_section)
+
+# Sections that need an unlocked account - CRITICAL SECURITY FIX
+# Include course and exam patterns to prevent bypass
+PROTECTED_SECTIONS = frozenset(["courses", "exams", "materials", "practice", "leaderboard"])
+PROTECTED_PREFIXES = ("exam_course_", "start_exam_")
+
 async def menu(update, context):
     query = update.callback_query
     await query.answer()
 
     user_id = query.from_user.id
 
-    # Check access for protected sections - CRITICAL SECURITY FIX
-    # Include course and exam patterns to prevent bypass
-    if (query.data in ["courses", "exams", "materials", "practice", "leaderboard"] or 
-        query.data.startswith("exam_course_") or query.data.startswith("start_exam_")):
-        db = SessionLocal()
-        user = db.query(User).filter_by(telegram_id=user_id).first()
-        db.close()
+    # Check access for protected sections
+    if query.data in PROTECTED_SECTIONS or query.data.startswith(PROTECTED_PREFIXES):
+        user = await user_cache.get_async(user_id)
 
         if user and user.access == "LOCKED":
             from app.keyboards.payment_keyboard import payment_keyboard
@@ -46,123 +157,4 @@ async def menu(update, context):
             )
             return
 
-    # Handle course and exam patterns with access control
-    if query.data.startswith("exam_course_"):
-        await select_course(update, context)
-    elif query.data.startswith("start_exam_"):
-        await start_exam_selected(update, context)
-    elif query.data == "profile":
-        await profile_menu(update, context)
-    elif query.data == "courses":
-        # Route to stream-specific dashboard based on user's stream
-        db = SessionLocal()
-        user = db.query(User).filter_by(telegram_id=user_id).first()
-        db.close()
-        
-        if user and user.stream:
-            if user.stream == "natural_science":
-                await natural_science_dashboard(update, context)
-            elif user.stream == "social_science":
-                await social_science_dashboard(update, context)
-            else:
-                await query.edit_message_text(
-                    "❌ Stream information not found. Please register again to select your stream."
-                )
-        else:
-            await query.edit_message_text(
-                "❌ Stream information not found. Please register again to select your stream."
-            )
-    elif query.data == "exams":
-        # Show stream-specific course selection
-        db = SessionLocal()
-        user = db.query(User).filter_by(telegram_id=user_id).first()
-        db.close()
-        
-        if user and user.stream:
-            from app.keyboards.stream_course_keyboard import get_stream_courses_keyboard, get_stream_courses_message
-            
-            courses_message = get_stream_courses_message(user.stream, user_id)
-            courses_keyboard = get_stream_courses_keyboard(user.stream, user_id)
-            
-            await query.edit_message_text(
-                courses_message,
-                reply_markup=courses_keyboard
-            )
-        else:
-            await query.edit_message_text(
-                "❌ Stream information not found. Please register again to select your stream."
-            )
-    elif query.data == "natural_science_dashboard":
-        await natural_science_dashboard(update, context)
-    elif query.data == "social_science_dashboard":
-        await social_science_dashboard(update, context)
-    elif query.data.startswith("ns_"):
-        await handle_natural_science_action(update, context)
-    elif query.data.startswith("ss_"):
-        await handle_social_science_action(update, context)
-    elif query.data == "ns_exams":
-        await natural_science_exams(update, context)
-    elif query.data == "ss_exams":
-        await social_science_exams(update, context)
-    elif query.data == "payment":
-        await payment_menu(update, context)
-    elif query.data == "materials":
-        await materials_menu(update, context)
-    elif query.data == "practice":
-        await start_practice(update, context)
-    elif query.data == "leaderboard":
-        await show_leaderboard(update, context)
-    elif query.data == "leaderboard_best":
-        await show_leaderboard_best(update, context)
-    elif query.data == "leaderboard_latest":
-        await show_leaderboard_latest(update, context)
-    elif query.data == "leaderboard_average":
-        await show_leaderboard_average(update, context)
-    elif query.data == "admin":
-        if user_id in ADMIN_IDS:
-            await admin_panel(update, context)
-        else:
-            try:
-                await query.edit_message_text("Access denied.")
-            except BadRequest:
-                await query.answer("Access denied.")
-    elif query.data == "analytics":
-        if user_id in ADMIN_IDS:
-            await exam_analytics(update, context)
-        else:
-            try:
-                await query.edit_message_text("Access denied.")
-            except BadRequest:
-                await query.answer("Access denied.")
-    elif query.data == "admin_payments":
-        if user_id in ADMIN_IDS:
-            await admin_payments(update, context)
-        else:
-            try:
-                await query.edit_message_text("Access denied.")
-            except BadRequest:
-                await query.answer("Access denied.")
-    elif query.data == "back_to_main":
-        try:
-            await query.edit_message_text(
-                "Choose an option:",
-                reply_markup=main_menu(user_id)
-            )
-        except BadRequest:
-            await query.answer("Menu updated")
-    elif query.data == "help":
-        try:
-            await query.edit_message_text(
-                "Help: Contact admin for support.",
-                reply_markup=main_menu(user_id)
-            )
-        except BadRequest:
-            await query.answer("Help section updated")
-    else:
-        try:
-            await query.edit_message_text(
-                "Choose an option:",
-                reply_markup=main_menu(user_id)
-            )
-        except BadRequest:
-            await query.answer("Menu refreshed")
+    await MENU_ROUTER.dispatch(update, context)
@@ -1,5 +1,6 @@
 from app.database.session import SessionLocal
 from app.models.user import User
+from app.services.user_cache import user_cache
 from app.keyboards.stream_keyboard import stream_keyboard
 from app.keyboards.main_menu import main_menu
 
@@ -15,6 +16,7 @@ async def onboarding(update, context):
     if query.data.startswith("level_"):
         user.level = query.data.replace("level_", "")
         db.commit()
+        user_cache.invalidate(query.from_user.id)
         await query.edit_message_text(
             "Select your stream:",
             reply_markup=stream_keyboard()
@@ -23,6 +25,7 @@ async def onboarding(update, context):
     elif query.data.startswith("stream_"):
         user.stream = query.data.replace("stream_", "")
         db.commit()
+        user_cache.invalidate(query.from_user.id)
         await query.edit_message_text(
             "Registration completed ✅",
             reply_markup=main_menu(query.from_user.id)
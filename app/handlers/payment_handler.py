@@ -2,6 +2,7 @@ from app.database.session import SessionLocal
 from app.models.user import User
 from app.services.payment_service import create_payment
 from app.keyboards.payment_keyboard import payment_keyboard
+from app.bot.send_queue import send_queue
 
 async def payment_menu(update, context):
     query = update.callback_query
@@ -71,24 +72,22 @@ async def receive_payment_proof(update, context):
             "⏱️ Please wait for admin approval. This usually takes a few minutes."
         )
 
-        # Notify admin (if admin is online)
+        # Notify admins through the send queue; failures are logged there
         from app.config.constants import ADMIN_IDS
         from app.keyboards.admin_keyboard import get_admin_main_menu
         
         for admin_id in ADMIN_IDS:
-            try:
-                await context.bot.send_message(
-                    chat_id=admin_id,
-                    text="🔔 **NEW PAYMENT SUBMISSION**\n\n"
-                         f"📋 **Payment Details:**\n"
-                         f"• User: @{user.username or 'N/A'} (ID: {user.telegram_id})\n"
-                         f"• Payment ID: {user.id}\n"
-                         f"• Proof: {proof[:100]}...\n\n"
-                         "💰 Please review in admin panel",
-                    reply_markup=get_admin_main_menu()
-                )
-            except Exception as e:
-                print(f"Failed to notify admin {admin_id}: {e}")
+            send_queue.send_message(
+                context.bot,
+                admin_id,
+                text="🔔 **NEW PAYMENT SUBMISSION**\n\n"
+                     f"📋 **Payment Details:**\n"
+                     f"• User: @{user.username or 'N/A'} (ID: {user.telegram_id})\n"
+                     f"• Payment ID: {user.id}\n"
+                     f"• Proof: {proof[:100]}...\n\n"
+                     "💰 Please review in admin panel",
+                reply_markup=get_admin_main_menu()
+            )
 
     except Exception as e:
         db.close()
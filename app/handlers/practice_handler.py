@@ -1,6 +1,6 @@
-from app.database.session import SessionLocal
-from app.models.user import User
+from app.services.user_cache import user_cache
 from app.services.question_service import get_questions_by_course, get_questions_by_exam
+from app.services.exam_session import ExamSession
 from app.handlers.radio_question_handler import start_exam_with_polls
 from app.keyboards.main_menu import main_menu
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
@@ -14,9 +14,7 @@ async def start_practice(update, context):
     user_id = query.from_user.id
 
     # Check access
-    db = SessionLocal()
-    user = db.query(User).filter_by(telegram_id=user_id).first()
-    db.close()
+    user = await user_cache.get_async(user_id)
 
     if not user or user.access != "UNLOCKED":
         await query.edit_message_text(
@@ -54,7 +52,7 @@ async def practice_course_selected(update, context):
     query = update.callback_query
     await query.answer()
 
-    course_id = int(query.data.replace("practice_course_", ""))
+    course_id = context.args[0]
 
     # Get questions for this course
     questions = get_questions_by_course(course_id, limit=10)
@@ -67,15 +65,10 @@ async def practice_course_selected(update, context):
         return
 
     # Initialize practice session
-    context.user_data["user_id"] = query.from_user.id
-    context.user_data["chat_id"] = query.message.chat_id
-    context.user_data["questions"] = questions
-    context.user_data["index"] = 0
-    context.user_data["practice_mode"] = True
-    context.user_data["use_timer"] = False  # Can be made configurable
+    session = ExamSession(query.from_user.id, query.message.chat_id, questions, use_timer=False)  # Can be made configurable
 
     # Start practice with radio-style questions
-    await start_exam_with_polls(update, context, context.user_data)
+    await start_exam_with_polls(update, context, session)
 
 async def practice_by_chapter(update, context):
     """Show chapters (exams) for practice"""
@@ -108,7 +101,7 @@ async def practice_chapter_selected(update, context):
     query = update.callback_query
     await query.answer()
 
-    exam_id = int(query.data.replace("practice_chapter_", ""))
+    exam_id = context.args[0]
 
     # Get questions for this exam
     questions = get_questions_by_exam(exam_id, limit=10)
@@ -121,12 +114,7 @@ async def practice_chapter_selected(update, context):
         return
 
     # Initialize practice session
-    context.user_data["user_id"] = query.from_user.id
-    context.user_data["chat_id"] = query.message.chat_id
-    context.user_data["questions"] = questions
-    context.user_data["index"] = 0
-    context.user_data["practice_mode"] = True
-    context.user_data["use_timer"] = False
+    session = ExamSession(query.from_user.id, query.message.chat_id, questions, use_timer=False)
 
     # Start practice with radio-style questions
-    await start_exam_with_polls(update, context, context.user_data)
+    await start_exam_with_polls(update, context, session)
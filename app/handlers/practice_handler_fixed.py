@@ -1,6 +1,7 @@
 from app.database.session import SessionLocal
 from app.models.user import User
 from app.services.question_service import get_questions_by_course, get_questions_by_exam
+from app.services.exam_session import ExamSession
 from app.handlers.radio_question_handler import start_exam_with_polls
 from app.keyboards.main_menu import main_menu
 from app.keyboards.payment_keyboard import payment_keyboard
@@ -60,15 +61,10 @@ async def practice_course_selected(update, context):
         return
 
     # Initialize practice session
-    context.user_data["user_id"] = query.from_user.id
-    context.user_data["chat_id"] = query.message.chat_id
-    context.user_data["questions"] = questions
-    context.user_data["index"] = 0
-    context.user_data["practice_mode"] = True
-    context.user_data["use_timer"] = False  # Can be made configurable
+    session = ExamSession(query.from_user.id, query.message.chat_id, questions, use_timer=False)  # Can be made configurable
 
     # Start practice with radio-style questions
-    await start_exam_with_polls(update, context, context.user_data)
+    await start_exam_with_polls(update, context, session)
 
 async def practice_by_chapter(update, context):
     """Show chapters (exams) for practice"""
@@ -114,12 +110,7 @@ async def practice_chapter_selected(update, context):
         return
 
     # Initialize practice session
-    context.user_data["user_id"] = query.from_user.id
-    context.user_data["chat_id"] = query.message.chat_id
-    context.user_data["questions"] = questions
-    context.user_data["index"] = 0
-    context.user_data["practice_mode"] = True
-    context.user_data["use_timer"] = False
+    session = ExamSession(query.from_user.id, query.message.chat_id, questions, use_timer=False)
 
     # Start practice with radio-style questions
-    await start_exam_with_polls(update, context, context.user_data)
+    await start_exam_with_polls(update, context, session)
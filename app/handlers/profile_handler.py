@@ -5,6 +5,7 @@ from app.database.session import SessionLocal
 from app.models.user import User
 from app.models.referral import Referral
 from app.keyboards.main_menu import main_menu
+from app.bot.send_queue import send_queue
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from datetime import datetime
 
@@ -274,20 +275,17 @@ async def process_successful_referral_payment(user_id, context):
         result = process_referral_commission_sync(user_id)
         
         if result and result['referrals_completed']:
-            # Notify all referrers
+            # Notify all referrers through the send queue; failures are logged there
             for referral_data in result['referrals_completed']:
-                try:
-                    await context.bot.send_message(
-                        chat_id=referral_data['referrer_telegram_id'],
-                        text=f"🎉 **Commission Earned!**\n\n"
-                             f"✅ Your referral has paid!\n"
-                             f"💰 You earned: **30 ETB**\n\n"
-                             f"📊 Total Commission: **{referral_data['referrer_name'] or 'Unknown'}**\n\n"
-                             f"Keep sharing your link to earn more! 🚀"
-                    )
-                    print(f"Successfully notified referrer {referral_data['referrer_telegram_id']} of commission")
-                except Exception as e:
-                    print(f"Failed to notify referrer {referral_data['referrer_telegram_id']}: {e}")
+                send_queue.send_message(
+                    context.bot,
+                    referral_data['referrer_telegram_id'],
+                    text=f"🎉 **Commission Earned!**\n\n"
+                         f"✅ Your referral has paid!\n"
+                         f"💰 You earned: **30 ETB**\n\n"
+                         f"📊 Total Commission: **{referral_data['referrer_name'] or 'Unknown'}**\n\n"
+                         f"Keep sharing your link to earn more! 🚀"
+                )
         
         return result
         
@@ -1,10 +1,16 @@
+import asyncio
 import random
 import string
 import uuid
+from sqlalchemy import select, func
 from app.database.session import SessionLocal
+from app.database.async_session import AsyncSessionLocal
 from app.models.user import User
 from app.models.referral import Referral
+from app.services.user_service import set_referral_code
 from app.keyboards.main_menu import main_menu
+from app.bot.callback_codec import callback_codec, COPY_REFERRAL_CODE, COPY_INVITATION_LINK, REFERRAL_HISTORY
+from app.bot.send_queue import send_queue
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from datetime import datetime
 
@@ -15,11 +21,34 @@ def generate_referral_code():
 async def profile_menu(update, context):
     """Display user profile with referral information"""
     try:
-        db = SessionLocal()
-        user = db.query(User).filter_by(telegram_id=update.effective_user.id).first()
-        
+        async with AsyncSessionLocal() as db:
+            user = (await db.execute(
+                select(User).filter_by(telegram_id=update.effective_user.id)
+            )).scalars().first()
+
+            if user:
+                # Get referral statistics
+                completed_referrals = (await db.execute(
+                    select(func.count(Referral.id)).filter_by(
+                        referrer_id=user.id,
+                        status="COMPLETED"
+                    )
+                )).scalar_one()
+
+                # Get total commission earned
+                total_commission = (await db.execute(
+                    select(func.count(Referral.id)).filter_by(
+                        referrer_id=user.id,
+                        commission_paid=True
+                    )
+                )).scalar_one() * 30  # 30 ETB per successful referral
+
+        # Generate referral code if not exists
+        if user and not user.referral_code:
+            user.referral_code = generate_referral_code()
+            await asyncio.to_thread(set_referral_code, user.id, user.referral_code)
+
         if not user:
-            db.close()
             if hasattr(update, 'callback_query') and update.callback_query:
                 await update.callback_query.edit_message_text(
                     "❌ **Profile not found**\n\nPlease register first.",
@@ -32,23 +61,6 @@ async def profile_menu(update, context):
                 )
             return
 
-        # Generate referral code if not exists
-        if not user.referral_code:
-            user.referral_code = generate_referral_code()
-            db.commit()
-
-        # Get referral statistics
-        completed_referrals = db.query(Referral).filter_by(
-            referrer_id=user.id, 
-            status="COMPLETED"
-        ).count()
-
-        # Get total commission earned
-        total_commission = db.query(Referral).filter_by(
-            referrer_id=user.id, 
-            commission_paid=True
-        ).count() * 30  # 30 ETB per successful referral
-
         # Build profile message
         message_text = f"👤 **Your Profile**\n\n"
         message_text += f"🆔 **User ID:** {user.telegram_id}\n"
@@ -80,9 +92,9 @@ async def profile_menu(update, context):
 
         # Create keyboard for profile actions
         keyboard = [
-            [InlineKeyboardButton("📋 Copy Referral Code", callback_data=f"copy_code_{user.referral_code}")],
-            [InlineKeyboardButton("🔗 Copy Invitation Link", callback_data=f"copy_link_{invitation_link}")],
-            [InlineKeyboardButton("📊 View Referral History", callback_data=f"referral_history_{user.id}")],
+            [InlineKeyboardButton("📋 Copy Referral Code", callback_data=callback_codec.encode(COPY_REFERRAL_CODE, user.referral_code))],
+            [InlineKeyboardButton("🔗 Copy Invitation Link", callback_data=callback_codec.encode(COPY_INVITATION_LINK, invitation_link))],
+            [InlineKeyboardButton("📊 View Referral History", callback_data=callback_codec.encode(REFERRAL_HISTORY, user.id))],
             [InlineKeyboardButton("⬅️ Back to Main Menu", callback_data="back_to_main")]
         ]
         
@@ -104,8 +116,6 @@ async def profile_menu(update, context):
                 reply_markup=reply_markup,
                 parse_mode="Markdown"
             )
-
-        db.close()
         
     except Exception as e:
         print(f"Error in profile_menu: {e}")
@@ -117,7 +127,7 @@ async def profile_menu(update, context):
 async def copy_referral_code(update, context):
     """Copy referral code to clipboard"""
     try:
-        referral_code = update.callback_query.data.split("_")[-1]
+        referral_code = context.args[0]
         
         await update.callback_query.answer(f"📋 Referral Code: {referral_code}")
         
@@ -133,7 +143,7 @@ async def copy_referral_code(update, context):
 async def copy_invitation_link(update, context):
     """Copy invitation link to clipboard"""
     try:
-        invitation_link = update.callback_query.data.split("_", 2)[-1]  # Get everything after "copy_link_"
+        invitation_link = context.args[0]
         
         await update.callback_query.answer(f"🔗 Invitation Link copied!")
         
@@ -308,20 +318,17 @@ async def process_successful_referral_payment(user_id, context):
         result = process_referral_commission_sync(user_id)
         
         if result and result['referrals_completed']:
-            # Notify all referrers
+            # Notify all referrers through the send queue; failures are logged there
             for referral_data in result['referrals_completed']:
-                try:
-                    await context.bot.send_message(
-                        chat_id=referral_data['referrer_telegram_id'],
-                        text=f"🎉 **Commission Earned!**\n\n"
-                             f"✅ Your referral has paid!\n"
-                             f"💰 You earned: **30 ETB**\n\n"
-                             f"📊 Total Commission: **{referral_data['referrer_name'] or 'Unknown'}**\n\n"
-                             f"Keep sharing your link to earn more! 🚀"
-                    )
-                    print(f"Successfully notified referrer {referral_data['referrer_telegram_id']} of commission")
-                except Exception as e:
-                    print(f"Failed to notify referrer {referral_data['referrer_telegram_id']}: {e}")
+                send_queue.send_message(
+                    context.bot,
+                    referral_data['referrer_telegram_id'],
+                    text=f"🎉 **Commission Earned!**\n\n"
+                         f"✅ Your referral has paid!\n"
+                         f"💰 You earned: **30 ETB**\n\n"
+                         f"📊 Total Commission: **{referral_data['referrer_name'] or 'Unknown'}**\n\n"
+                         f"Keep sharing your link to earn more! 🚀"
+                )
         
         return result
         
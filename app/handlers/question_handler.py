@@ -1,49 +1,50 @@
-from app.database.session import SessionLocal
-from app.models.answer import Answer
+from app.database.async_session import AsyncSessionLocal
 from app.models.result import Result
-from app.services.scoring_service import finalize_exam, get_detailed_feedback
+from app.services.answer_service import answer_sink
+from app.services.scoring_service import finalize_exam_async, get_detailed_feedback_async
 from app.keyboards.exam_keyboard import question_keyboard, format_question_text
 from app.services.question_service import is_true_false_question
-import asyncio
+from app.utils.timer import timer_wheel
+from app.bot.send_queue import send_queue, EXAM
 
 async def answer_question(update, context):
     query = update.callback_query
     await query.answer()
 
-    data = context.user_data
-    question = data["questions"][data["index"]]
+    session = context.user_data.get("session")
+    if session is None or session.finished:
+        return
+    question = session.question
 
-    selected = query.data.replace("ans_", "")
+    selected = context.args[0]
 
     # Handle true/false questions
-    if is_true_false_question(question):
+    if question is None:
+        is_correct = False
+    elif is_true_false_question(question):
         is_correct = selected == question.correct_option
     else:
         is_correct = selected == question.correct_option
 
-    # Cancel any existing timer for this question to prevent conflicts
-    if "current_timer" in data and data["current_timer"]:
-        data["current_timer"].cancel()
-        data["current_timer"] = None
+    # Cancel this question's countdown
+    timer_wheel.cancel(session.timer_key)
 
-    db = SessionLocal()
-    answer = Answer(
-        user_id=data["user_id"],
-        exam_id=data.get("exam_id"),  # Include exam_id if available (for exams, not practice)
-        question_id=question.id,
+    answer_sink.add(
+        user_id=session.user_id,
+        exam_id=session.exam_id,  # None for practice
+        question_id=session.question_id,
         selected_option=selected,
         is_correct=is_correct
     )
-    db.add(answer)
-    db.commit()
-    db.close()
 
-    data["index"] += 1
+    session.record(is_correct)
+    next_q = session.current()
 
-    if data["index"] >= len(data["questions"]):
+    if next_q is None:
         # Exam completed
-        if "exam_id" in data:
-            result_data = finalize_exam(data["user_id"], data["exam_id"])
+        context.user_data.pop("session", None)
+        if not session.is_practice:
+            result_data = await finalize_exam_async(session.user_id, session.exam_id, session.tally())
 
             status = "✅ PASSED" if result_data["passed"] else "❌ FAILED"
             message = (
@@ -68,7 +69,6 @@ async def answer_question(update, context):
             )
     else:
         # Show next question immediately
-        next_q = data["questions"][data["index"]]
         question_text = format_question_text(next_q)
 
         await query.edit_message_text(
@@ -77,9 +77,8 @@ async def answer_question(update, context):
         )
 
         # Start new timer for next question if enabled
-        if data.get("use_timer", False):
-            timer_task = asyncio.create_task(question_timer(context, 30))  # 30 second timer
-            data["current_timer"] = timer_task
+        if session.use_timer:
+            timer_wheel.schedule(session.timer_key, session.start_countdown(30), question_timeout, context, session.index)  # 30 second timer
 
 async def show_detailed_result(update, context):
     """Show detailed exam result with feedback"""
@@ -89,15 +88,14 @@ async def show_detailed_result(update, context):
         await update.message.reply_text("Invalid result ID format. Use /result_{id}")
         return
 
-    db = SessionLocal()
-    result = db.query(Result).filter_by(id=result_id).first()
+    async with AsyncSessionLocal() as db:
+        result = await db.get(Result, result_id)
 
     if not result or result.user_id != update.effective_user.id:
         await update.message.reply_text("Result not found or access denied.")
-        db.close()
         return
 
-    feedback = get_detailed_feedback(result.user_id, result.exam_id)
+    feedback = await get_detailed_feedback_async(result.user_id, result.exam_id)
 
     status = "✅ PASSED" if result.percentage >= 70 else "❌ FAILED"
 
@@ -118,36 +116,32 @@ async def show_detailed_result(update, context):
         message += f"... and {len(feedback) - 10} more questions"
 
     await update.message.reply_text(message, parse_mode="Markdown")
-    db.close()
-
-async def question_timer(context, seconds):
-    """Timer for individual questions"""
-    await asyncio.sleep(seconds)
 
-    data = context.user_data
-    if "questions" in data and data["index"] < len(data["questions"]):
+async def question_timeout(context, index):
+    """Countdown expired for question `index`"""
+    session = context.user_data.get("session")
+    # Ignore a timeout that lost the race with an answer
+    if session is None or session.index != index or session.finished:
+        return
+    try:
         # Time's up - auto-submit with no answer
-        question = data["questions"][data["index"]]
-
-        db = SessionLocal()
-        answer = Answer(
-            user_id=data["user_id"],
-            exam_id=data.get("exam_id"),  # Include exam_id if available
-            question_id=question.id,
+        answer_sink.add(
+            user_id=session.user_id,
+            exam_id=session.exam_id,  # None for practice
+            question_id=session.question_id,
             selected_option=None,
             is_correct=False
         )
-        db.add(answer)
-        db.commit()
-        db.close()
 
-        data["index"] += 1
+        session.record(False)
+        next_q = session.current()
 
-        if data["index"] >= len(data["questions"]):
+        if next_q is None:
             # Session completed
-            if "exam_id" in data:
+            context.user_data.pop("session", None)
+            if not session.is_practice:
                 # Exam completed due to timeout
-                result_data = finalize_exam(data["user_id"], data["exam_id"])
+                result_data = await finalize_exam_async(session.user_id, session.exam_id, session.tally())
                 status = "✅ PASSED" if result_data["passed"] else "❌ FAILED"
                 message = (
                     f"⏰ **Time's Up - Exam Completed!**\n\n"
@@ -159,29 +153,30 @@ async def question_timer(context, seconds):
                     f"• Status: {status}\n\n"
                     f"💡 Want detailed feedback? Use /result_{result_data['result_id']}"
                 )
-                await context.bot.send_message(
-                    chat_id=context.user_data.get("chat_id"),
+                await send_queue.send_message(
+                    context.bot, session.chat_id, lane=EXAM,
                     text=message,
                     parse_mode="Markdown"
                 )
             else:
                 # Practice mode completed
-                await context.bot.send_message(
-                    chat_id=context.user_data.get("chat_id"),
+                await send_queue.send_message(
+                    context.bot, session.chat_id, lane=EXAM,
                     text="⏰ Time's up! Practice session completed."
                 )
         else:
             # Show next question
-            next_q = data["questions"][data["index"]]
             question_text = format_question_text(next_q)
 
-            await context.bot.send_message(
-                chat_id=context.user_data.get("chat_id"),
+            await send_queue.send_message(
+                context.bot, session.chat_id, lane=EXAM,
                 text=f"⏰ Time's up for previous question!\n\n{question_text}",
                 reply_markup=question_keyboard(next_q)
             )
 
             # Start timer for next question
-            if data.get("use_timer", False):
-                timer_task = asyncio.create_task(question_timer(context, 30))
-                data["current_timer"] = timer_task
+            if session.use_timer:
+                timer_wheel.schedule(session.timer_key, session.start_countdown(30), question_timeout, context, session.index)
+    finally:
+        # Timer callbacks run outside update processing, so PTB only persists this user when told
+        context.application.mark_data_for_update_persistence(user_ids=[session.user_id])
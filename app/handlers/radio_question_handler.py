@@ -1,8 +1,9 @@
-from app.database.session import SessionLocal
-from app.models.answer import Answer
-from app.services.scoring_service import finalize_exam, get_detailed_feedback
+from app.database.async_session import AsyncSessionLocal
+from app.services.answer_service import answer_sink
+from app.services.scoring_service import finalize_exam_async, get_detailed_feedback_async
 from app.keyboards.radio_exam_keyboard import create_poll_question, create_result_keyboard, create_detailed_result_keyboard
-import asyncio
+from app.utils.timer import timer_wheel
+from app.bot.send_queue import send_queue, EXAM
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,11 +14,9 @@ async def handle_poll_answer(update, context):
     user_id = update.effective_user.id
     poll_id = poll_answer.poll_id
     
-    # Get user data
-    data = context.user_data
-    
     # Skip if user is not in exam/practice mode
-    if "current_poll_id" not in data or data["current_poll_id"] != poll_id:
+    session = context.user_data.get("session")
+    if session is None or session.poll_id != poll_id:
         return
     
     # Get selected option
@@ -26,59 +25,53 @@ async def handle_poll_answer(update, context):
         return
     
     selected_option_id = selected_option_ids[0]  # Take first selected option
-    question = data["questions"][data["index"]]
+    question = session.question
+    question_id = session.question_id
     
     # Convert option ID to letter (A=0, B=1, C=2, D=3)
     option_letters = ['A', 'B', 'C', 'D']
     selected_option = option_letters[selected_option_id] if selected_option_id < len(option_letters) else 'A'
     
     # Check if answer is correct
-    is_correct = selected_option == question.correct_option
+    is_correct = question is not None and selected_option == question.correct_option
     
     # Save answer to database
-    db = SessionLocal()
-    answer = Answer(
-        user_id=data["user_id"],
-        exam_id=data.get("exam_id"),
-        question_id=question.id,
+    answer_sink.add(
+        user_id=session.user_id,
+        exam_id=session.exam_id,
+        question_id=question_id,
         selected_option=selected_option,
         is_correct=is_correct
     )
-    db.add(answer)
-    db.commit()
-    db.close()
     
-    logger.info(f"User {user_id} answered question {question.id}: {selected_option} (Correct: {is_correct})")
+    logger.info(f"User {user_id} answered question {question_id}: {selected_option} (Correct: {is_correct})")
     
-    # Cancel any existing poll timer to prevent conflicts
-    if "current_poll_timer" in data and data["current_poll_timer"]:
-        data["current_poll_timer"].cancel()
-        data["current_poll_timer"] = None
+    # Cancel this question's countdown
+    timer_wheel.cancel(session.timer_key)
     
     # Move to next question immediately
-    data["index"] += 1
-    data["current_poll_id"] = None  # Clear current poll
-    
-    if data["index"] >= len(data["questions"]):
-        # Exam/Practice completed
-        await complete_exam_or_practice(update, context, data)
-    else:
-        # Show next question immediately
-        await show_next_question(update, context, data)
+    session.record(is_correct)
+    await show_next_question(update, context, session)
 
-async def show_question_as_poll(update, context, data):
+async def show_question_as_poll(update, context, session):
     """Display question as a poll"""
-    question = data["questions"][data["index"]]
-    question_number = data["index"] + 1
-    total_questions = len(data["questions"])
+    question = session.current()
+    if question is None:
+        # Exam/Practice completed
+        await complete_exam_or_practice(update, context, session)
+        return
+    question_number = session.index + 1
+    total_questions = len(session)
     
     # Create poll question
     poll_data = create_poll_question(question, question_number, total_questions)
     
     # Send poll - handle both cases (with and without update object)
     if update is not None:
-        # Normal case - user answered or it's the first question
-        message = await update.effective_message.reply_poll(
+        # Normal case - user answered or it's the first question; a poll answer
+        # carries no message to reply to, so send to the session's chat
+        message = await context.bot.send_poll(
+            chat_id=session.chat_id,
             question=poll_data["question"],
             options=poll_data["options"],
             type="quiz",  # This makes it a quiz with correct answer
@@ -87,10 +80,10 @@ async def show_question_as_poll(update, context, data):
         )
     else:
         # Timeout case - send poll to specific chat
-        chat_id = data.get("chat_id")
+        chat_id = session.chat_id
         if chat_id:
-            message = await context.bot.send_poll(
-                chat_id=chat_id,
+            message = await send_queue.submit(
+                context.bot, "send_poll", chat_id, lane=EXAM,
                 question=poll_data["question"],
                 options=poll_data["options"],
                 type="quiz",  # This makes it a quiz with correct answer
@@ -102,18 +95,19 @@ async def show_question_as_poll(update, context, data):
             return
     
     # Store current poll ID for answer tracking
-    data["current_poll_id"] = message.poll.id
+    session.poll_id = message.poll.id
     
     # Start timer if enabled
-    if data.get("use_timer", False):
-        timer_task = asyncio.create_task(poll_timer(context, 30))  # 30 second timer
-        data["current_poll_timer"] = timer_task
+    if session.use_timer:
+        timer_wheel.schedule(session.timer_key, session.start_countdown(30), poll_timeout, context, session.index)  # 30 second timer
 
-async def complete_exam_or_practice(update, context, data):
+async def complete_exam_or_practice(update, context, session):
     """Complete exam or practice session"""
-    if "exam_id" in data:
+    if context.user_data.get("session") is session:
+        context.user_data.pop("session")
+    if not session.is_practice:
         # Real exam completed
-        result_data = finalize_exam(data["user_id"], data["exam_id"])
+        result_data = await finalize_exam_async(session.user_id, session.exam_id, session.tally())
         
         status = "✅ PASSED" if result_data["passed"] else "❌ FAILED"
         message = (
@@ -127,74 +121,86 @@ async def complete_exam_or_practice(update, context, data):
         )
         
         # Send completion message with keyboard
-        await update.effective_message.reply_text(
-            message,
-            parse_mode="Markdown",
-            reply_markup=create_result_keyboard(result_data)
-        )
+        await _send(update, context, session, message, parse_mode="Markdown", reply_markup=create_result_keyboard(result_data))
         
     else:
         # Practice session completed
-        await update.effective_message.reply_text(
+        await _send(
+            update, context, session,
             "🎉 Practice session completed!\n\nKeep practicing to improve your skills!",
             reply_markup=create_detailed_result_keyboard()
         )
 
-async def show_next_question(update, context, data):
-    """Show the next question as a poll"""
-    await show_question_as_poll(update, context, data)
+async def _send(update, context, session, text, **kwargs):
+    """Message the session's chat directly, or through the queue when a timeout has no update"""
+    if update is not None:
+        return await context.bot.send_message(session.chat_id, text, **kwargs)
+    return await send_queue.send_message(context.bot, session.chat_id, text, lane=EXAM, **kwargs)
 
-async def start_exam_with_polls(update, context, data):
+async def show_next_question(update, context, session):
+    """Show the next question as a poll"""
+    await show_question_as_poll(update, context, session)
+
+def resume_poll_timers(application):
+    """Restart the countdown of timed poll sessions restored by persistence"""
+    resumed = 0
+    for user_id, data in application.user_data.items():
+        session = data.get("session")
+        if session is not None and session.use_timer and session.poll_id:
+            context = application.context_types.context(application, chat_id=session.chat_id, user_id=user_id)
+            timer_wheel.schedule(session.timer_key, session.remaining(30), poll_timeout, context, session.index)
+            resumed += 1
+    return resumed
+
+async def start_exam_with_polls(update, context, session):
     """Start exam or practice with poll-style questions"""
-    data["index"] = 0
-    data["current_poll_id"] = None
+    # A countdown left over from an abandoned session must not fire into this one
+    previous = context.user_data.get("session")
+    if previous is not None:
+        timer_wheel.cancel(previous.timer_key)
+    session.restart()
+    context.user_data["session"] = session
     
     # Show first question
-    await show_question_as_poll(update, context, data)
+    await show_question_as_poll(update, context, session)
 
-async def poll_timer(context, seconds):
-    """Timer for poll questions"""
-    await asyncio.sleep(seconds)
-    
-    data = context.user_data
-    if "questions" in data and data["index"] < len(data["questions"]) and "current_poll_id" in data:
-        # Time's up - move to next question without answer
-        question = data["questions"][data["index"]]
-        
-        # Save empty answer
-        db = SessionLocal()
-        answer = Answer(
-            user_id=data["user_id"],
-            exam_id=data.get("exam_id"),
-            question_id=question.id,
+async def poll_timeout(context, index):
+    """Countdown expired for poll question `index`"""
+    session = context.user_data.get("session")
+    # Ignore a timeout that lost the race with an answer
+    if session is None or session.index != index or not session.poll_id or session.finished:
+        return
+    try:
+        # Time's up - save an empty answer and move on
+        answer_sink.add(
+            user_id=session.user_id,
+            exam_id=session.exam_id,
+            question_id=session.question_id,
             selected_option=None,
             is_correct=False
         )
-        db.add(answer)
-        db.commit()
-        db.close()
         
-        data["index"] += 1
-        data["current_poll_id"] = None
-        data["current_poll_timer"] = None  # Clear timer state
+        session.record(False)
         
-        if data["index"] >= len(data["questions"]):
+        if session.finished:
             # Session completed due to timeout
-            await complete_exam_or_practice(None, context, data)
+            await complete_exam_or_practice(None, context, session)
         else:
             # Show next question on timeout
             try:
                 # Send timeout message and next question
-                await context.bot.send_message(
-                    chat_id=data.get("chat_id"),
-                    text="⏰ Time's up! Moving to next question..."
+                await send_queue.send_message(
+                    context.bot, session.chat_id, "⏰ Time's up! Moving to next question...", lane=EXAM
                 )
                 
                 # Show the next question
-                await show_question_as_poll(None, context, data)
+                await show_question_as_poll(None, context, session)
             except Exception as e:
                 logger.error(f"Error showing next question after timeout: {e}")
                 logger.info("Poll timeout - unable to show next question")
+    finally:
+        # Timer callbacks run outside update processing, so PTB only persists this user when told
+        context.application.mark_data_for_update_persistence(user_ids=[session.user_id])
 
 async def show_detailed_result(update, context):
     """Show detailed exam result with feedback"""
@@ -204,16 +210,15 @@ async def show_detailed_result(update, context):
         await update.message.reply_text("Invalid result ID format. Use /result_{id}")
         return
 
-    db = SessionLocal()
     from app.models.result import Result
-    result = db.query(Result).filter_by(id=result_id).first()
+    async with AsyncSessionLocal() as db:
+        result = await db.get(Result, result_id)
 
     if not result or result.user_id != update.effective_user.id:
         await update.message.reply_text("Result not found or access denied.")
-        db.close()
         return
 
-    feedback = get_detailed_feedback(result.user_id, result.exam_id)
+    feedback = await get_detailed_feedback_async(result.user_id, result.exam_id)
 
     status = "✅ PASSED" if result.percentage >= 70 else "❌ FAILED"
 
@@ -238,7 +243,6 @@ async def show_detailed_result(update, context):
         parse_mode="Markdown",
         reply_markup=create_detailed_result_keyboard()
     )
-    db.close()
 
 # Additional helper functions for poll management
 def format_poll_question_text(question, question_number, total_questions):
@@ -3,6 +3,7 @@ from telegram.ext import ContextTypes
 from app.database.session import SessionLocal
 from app.models.user import User
 from app.services.user_service import get_or_create_user
+from app.services.user_cache import user_cache
 from app.keyboards.main_menu import main_menu
 from app.keyboards.stream_keyboard import stream_keyboard
 
@@ -66,6 +67,7 @@ async def handle_registration_callback(update: Update, context: ContextTypes.DEF
         level = data.replace("level_", "")
         user.level = level
         db.commit()
+        user_cache.invalidate(user_id)
         
         # Now ask for stream
         await query.edit_message_text(
@@ -81,6 +83,7 @@ async def handle_registration_callback(update: Update, context: ContextTypes.DEF
         user.stream = stream
         # Keep access LOCKED - user must pay first
         db.commit()
+        user_cache.invalidate(user_id)
         
         # Registration complete - redirect to payment
         from app.keyboards.payment_keyboard import payment_keyboard
@@ -5,8 +5,7 @@ Handle course selection for Natural Science and Social Science streams
 
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import CallbackQueryHandler
-from app.database.session import SessionLocal
-from app.models.user import User
+from app.services.user_cache import user_cache
 from app.handlers.course_handler import start_exam_selected
 from app.handlers.exam_handler import start_exam
 from app.config.constants import ADMIN_IDS
@@ -63,9 +62,7 @@ Select a course to start your exam:
         return
 
     # Get user information
-    db = SessionLocal()
-    user = db.query(User).filter_by(telegram_id=user_id).first()
-    db.close()
+    user = await user_cache.get_async(user_id)
 
     if not user:
         await query.edit_message_text("❌ User information not found. Please register again.")
@@ -214,9 +211,7 @@ Select a course to start your exam:
         return
 
     # Get user information
-    db = SessionLocal()
-    user = db.query(User).filter_by(telegram_id=user_id).first()
-    db.close()
+    user = await user_cache.get_async(user_id)
 
     if not user:
         await query.edit_message_text("❌ User information not found. Please register again.")
@@ -326,9 +321,7 @@ async def handle_stream_course_selection(update, context):
     course_code = query.data.replace("start_exam_", "")
 
     # Get user information
-    db = SessionLocal()
-    user = db.query(User).filter_by(telegram_id=user_id).first()
-    db.close()
+    user = await user_cache.get_async(user_id)
 
     if not user:
         await query.edit_message_text("❌ User information not found. Please register again.")
@@ -4,8 +4,7 @@ Separate dashboards for Natural Science and Social Science streams
 """
 
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
-from app.database.session import SessionLocal
-from app.models.user import User
+from app.services.user_cache import user_cache
 from app.handlers.materials_handler import materials_menu
 from app.handlers.practice_handler import start_practice
 from app.handlers.leaderboard_handler import show_leaderboard
@@ -48,9 +47,7 @@ async def natural_science_dashboard(update, context):
         return
 
     # Get user information
-    db = SessionLocal()
-    user = db.query(User).filter_by(telegram_id=user_id).first()
-    db.close()
+    user = await user_cache.get_async(user_id)
 
     if not user:
         await query.edit_message_text("❌ User information not found. Please register again.")
@@ -108,9 +105,7 @@ async def social_science_dashboard(update, context):
         return
 
     # Get user information
-    db = SessionLocal()
-    user = db.query(User).filter_by(telegram_id=user_id).first()
-    db.close()
+    user = await user_cache.get_async(user_id)
 
     if not user:
         await query.edit_message_text("❌ User information not found. Please register again.")
@@ -150,9 +145,7 @@ async def handle_natural_science_action(update, context):
     action = query.data
 
     # Verify user has Natural Science stream access
-    db = SessionLocal()
-    user = db.query(User).filter_by(telegram_id=user_id).first()
-    db.close()
+    user = await user_cache.get_async(user_id)
 
     if not user or user.stream != "natural_science":
         await query.edit_message_text("❌ Access denied.")
@@ -190,9 +183,7 @@ async def handle_social_science_action(update, context):
     action = query.data
 
     # Verify user has Social Science stream access
-    db = SessionLocal()
-    user = db.query(User).filter_by(telegram_id=user_id).first()
-    db.close()
+    user = await user_cache.get_async(user_id)
 
     if not user or user.stream != "social_science":
         await query.edit_message_text("❌ Access denied.")
@@ -229,9 +220,7 @@ async def natural_science_exams(update, context):
     user_id = query.from_user.id
 
     # Verify user has Natural Science stream access
-    db = SessionLocal()
-    user = db.query(User).filter_by(telegram_id=user_id).first()
-    db.close()
+    user = await user_cache.get_async(user_id)
 
     if not user or user.stream != "natural_science":
         await query.edit_message_text("❌ Access denied. This section is for Natural Science stream users only.")
@@ -249,9 +238,7 @@ async def social_science_exams(update, context):
     user_id = query.from_user.id
 
     # Verify user has Social Science stream access
-    db = SessionLocal()
-    user = db.query(User).filter_by(telegram_id=user_id).first()
-    db.close()
+    user = await user_cache.get_async(user_id)
 
     if not user or user.stream != "social_science":
         await query.edit_message_text("❌ Access denied. This section is for Social Science stream users only.")
@@ -1,4 +1,5 @@
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+from app.bot.callback_codec import callback_codec, APPROVE_PAYMENT, REJECT_PAYMENT, CONFIRM_DELETE_QUESTION
 
 def get_admin_main_menu():
     """Main admin panel menu - 2-column layout"""
@@ -41,7 +42,7 @@ def get_admin_export_menu():
 def get_admin_confirm_delete(question_id):
     """Confirmation for question deletion"""
     keyboard = [
-        [InlineKeyboardButton("✅ Yes, Delete", callback_data=f"admin_confirm_delete_{question_id}")],
+        [InlineKeyboardButton("✅ Yes, Delete", callback_data=callback_codec.encode(CONFIRM_DELETE_QUESTION, question_id))],
         [InlineKeyboardButton("❌ Cancel", callback_data="admin_questions")],
     ]
     return InlineKeyboardMarkup(keyboard)
@@ -49,8 +50,8 @@ def get_admin_confirm_delete(question_id):
 def get_payment_approval_keyboard(payment_id):
     """Inline keyboard for approving/rejecting payments"""
     keyboard = [
-        [InlineKeyboardButton("✅ Approve Payment", callback_data=f"approve_payment_{payment_id}")],
-        [InlineKeyboardButton("❌ Reject Payment", callback_data=f"reject_payment_{payment_id}")],
+        [InlineKeyboardButton("✅ Approve Payment", callback_data=callback_codec.encode(APPROVE_PAYMENT, payment_id))],
+        [InlineKeyboardButton("❌ Reject Payment", callback_data=callback_codec.encode(REJECT_PAYMENT, payment_id))],
         [InlineKeyboardButton("⬅️ Back to Payments", callback_data="admin_payments")],
     ]
     return InlineKeyboardMarkup(keyboard)
@@ -1,14 +1,19 @@
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 from app.database.session import SessionLocal
 from app.models.course import Course
+from app.keyboards.keyboard_cache import keyboard_cache
+from app.bot.callback_codec import callback_codec, EXAM_COURSE
 
 def course_keyboard():
+    return keyboard_cache.get(_build_course_keyboard, catalog=True)
+
+def _build_course_keyboard():
     db = SessionLocal()
     courses = db.query(Course).all()
     db.close()
 
     buttons = [
-        [InlineKeyboardButton(c.name, callback_data=f"exam_course_{c.id}")]
+        [InlineKeyboardButton(c.name, callback_data=callback_codec.encode(EXAM_COURSE, c.id))]
         for c in courses
     ]
 
@@ -1,25 +1,27 @@
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 from app.services.question_service import is_true_false_question
+from app.bot.callback_codec import callback_codec, ANSWER, PRACTICE_CHAPTER
+from app.keyboards.keyboard_cache import keyboard_cache
 
 def question_keyboard(question):
     """Create keyboard based on question type"""
     if is_true_false_question(question):
         # True/False question
         return InlineKeyboardMarkup([
-            [InlineKeyboardButton("TRUE", callback_data="ans_TRUE")],
-            [InlineKeyboardButton("FALSE", callback_data="ans_FALSE")],
+            [InlineKeyboardButton("TRUE", callback_data=callback_codec.encode(ANSWER, "TRUE"))],
+            [InlineKeyboardButton("FALSE", callback_data=callback_codec.encode(ANSWER, "FALSE"))],
         ])
     else:
         # Multiple choice question
         buttons = []
         if question.option_a:
-            buttons.append([InlineKeyboardButton("A", callback_data="ans_A")])
+            buttons.append([InlineKeyboardButton("A", callback_data=callback_codec.encode(ANSWER, "A"))])
         if question.option_b:
-            buttons.append([InlineKeyboardButton("B", callback_data="ans_B")])
+            buttons.append([InlineKeyboardButton("B", callback_data=callback_codec.encode(ANSWER, "B"))])
         if question.option_c:
-            buttons.append([InlineKeyboardButton("C", callback_data="ans_C")])
+            buttons.append([InlineKeyboardButton("C", callback_data=callback_codec.encode(ANSWER, "C"))])
         if question.option_d:
-            buttons.append([InlineKeyboardButton("D", callback_data="ans_D")])
+            buttons.append([InlineKeyboardButton("D", callback_data=callback_codec.encode(ANSWER, "D"))])
 
         return InlineKeyboardMarkup(buttons)
 
@@ -43,6 +45,9 @@ def format_question_text(question):
 
 def exam_selection_keyboard(course_id):
     """Create keyboard for selecting exams/chapters for practice"""
+    return keyboard_cache.get(_build_exam_selection_keyboard, course_id, catalog=True)
+
+def _build_exam_selection_keyboard(course_id):
     from app.database.session import SessionLocal
     from app.models.exam import Exam
 
@@ -51,7 +56,7 @@ def exam_selection_keyboard(course_id):
     db.close()
 
     buttons = [
-        [InlineKeyboardButton(exam.name, callback_data=f"practice_chapter_{exam.id}")]
+        [InlineKeyboardButton(exam.name, callback_data=callback_codec.encode(PRACTICE_CHAPTER, exam.id))]
         for exam in exams
     ]
 
@@ -0,0 +1,65 @@
+"""
+Keyboard Cache
+Prebuilt InlineKeyboardMarkups keyed by (builder, stream, level, is_admin,
+catalog version). PTB freezes a markup once it is built, so one instance can
+be sent to every user. Catalog keyboards (courses, exams) are rebuilt after
+invalidate_catalog(), and after KEYBOARD_CATALOG_TTL since courses and exams
+are also edited outside the bot (seed script, SQL).
+"""
+
+import threading
+import time
+from app.config.settings import KEYBOARD_CATALOG_TTL
+
+class KeyboardCache:
+    """Memoizes keyboard builders on their normalized inputs"""
+
+    def __init__(self, catalog_ttl=KEYBOARD_CATALOG_TTL):
+        self.catalog_ttl = catalog_ttl
+        self.catalog_version = 0
+        self._catalog_expires_at = time.monotonic() + catalog_ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, builder, *args, catalog=False):
+        """Get builder(*args), building it once per catalog version when it reads the catalog
+
+        args are the builder's normalized inputs (stream, level, is_admin, ids),
+        never a user id, so users who see the same keyboard share one entry.
+        """
+        if catalog and time.monotonic() >= self._catalog_expires_at:
+            self.invalidate_catalog()
+        key = (builder, args, self.catalog_version if catalog else None)
+        markup = self._entries.get(key)
+        if markup is not None:
+            self.hits += 1
+            return markup
+        self.misses += 1
+        markup = builder(*args)
+        with self._lock:
+            # Another thread may have built it meanwhile; keep whichever landed first
+            return self._entries.setdefault(key, markup)
+
+    def invalidate_catalog(self):
+        """Drop course and exam keyboards; call after courses or exams change"""
+        with self._lock:
+            self.catalog_version += 1
+            self._catalog_expires_at = time.monotonic() + self.catalog_ttl
+            for key in [key for key in self._entries if key[2] is not None]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "catalog_version": self.catalog_version
+        }
+
+keyboard_cache = KeyboardCache()
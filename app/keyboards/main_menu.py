@@ -1,7 +1,12 @@
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 from app.config.constants import ADMIN_IDS
+from app.keyboards.keyboard_cache import keyboard_cache
 
 def main_menu(user_id=None):
+    is_admin = bool(user_id and user_id in ADMIN_IDS)
+    return keyboard_cache.get(_build_main_menu, is_admin)
+
+def _build_main_menu(is_admin):
     buttons = [
         [InlineKeyboardButton("👤 Profile", callback_data="profile"), InlineKeyboardButton("📘 Courses", callback_data="courses")],
         [InlineKeyboardButton("🎯 Practice", callback_data="practice"), InlineKeyboardButton("📝 Exams", callback_data="exams")],
@@ -10,7 +15,7 @@ def main_menu(user_id=None):
         [InlineKeyboardButton("ℹ️ Help", callback_data="help")]
     ]
 
-    if user_id and user_id in ADMIN_IDS:
+    if is_admin:
         buttons.append([InlineKeyboardButton("👑 Admin", callback_data="admin")])
 
     return InlineKeyboardMarkup(buttons)
@@ -1,6 +1,7 @@
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import PollAnswerHandler
 from app.services.question_service import is_true_false_question
+from app.bot.callback_codec import callback_codec, PRACTICE_COURSE, PRACTICE_CHAPTER
 import logging
 
 logger = logging.getLogger(__name__)
@@ -60,8 +61,8 @@ def create_exam_start_keyboard():
 def create_practice_selection_keyboard(course_id):
     """Create keyboard for selecting practice type"""
     return InlineKeyboardMarkup([
-        [InlineKeyboardButton("📖 Practice by Course", callback_data=f"practice_course_{course_id}")],
-        [InlineKeyboardButton("📋 Practice by Chapter", callback_data=f"practice_chapter_{course_id}")],
+        [InlineKeyboardButton("📖 Practice by Course", callback_data=callback_codec.encode(PRACTICE_COURSE, course_id))],
+        [InlineKeyboardButton("📋 Practice by Chapter", callback_data=callback_codec.encode(PRACTICE_CHAPTER, course_id))],
         [InlineKeyboardButton("⬅️ Back to Courses", callback_data="courses")]
     ])
 
@@ -71,7 +72,7 @@ def create_chapter_selection_keyboard(exams, course_id):
     for exam in exams:
         buttons.append([InlineKeyboardButton(exam.name, callback_data=f"practice_exam_{exam.id}")])
     
-    buttons.append([InlineKeyboardButton("⬅️ Back to Course", callback_data=f"practice_course_{course_id}")])
+    buttons.append([InlineKeyboardButton("⬅️ Back to Course", callback_data=callback_codec.encode(PRACTICE_COURSE, course_id))])
     return InlineKeyboardMarkup(buttons)
 
 def create_result_keyboard(result_data):
@@ -4,21 +4,14 @@ Shows different courses based on user's stream AND level during registration
 """
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
-from app.database.session import SessionLocal
-from app.models.user import User
+from app.keyboards.keyboard_cache import keyboard_cache
 
-def get_stream_courses_keyboard(stream, user_id=None):
-    """Get course keyboard based on stream type and user level"""
-    
-    # Get user level if user_id provided
-    user_level = None
-    if user_id:
-        db = SessionLocal()
-        user = db.query(User).filter_by(telegram_id=user_id).first()
-        if user:
-            user_level = user.level
-        db.close()
-    
+def get_stream_courses_keyboard(stream, user=None):
+    """Get course keyboard based on stream type and the level of the user's cached snapshot"""
+    user_level = user.level if user else None
+    return keyboard_cache.get(_build_stream_courses_keyboard, stream, user_level)
+
+def _build_stream_courses_keyboard(stream, user_level):
     # Define courses for each stream - COMMON + STREAM SPECIFIC
     if stream == "natural_science":
         all_courses = [
@@ -83,18 +76,10 @@ def get_stream_courses_keyboard(stream, user_id=None):
     
     return InlineKeyboardMarkup(keyboard)
 
-def get_stream_courses_message(stream, user_id=None):
-    """Get appropriate message based on stream and user level"""
-    
-    # Get user level if user_id provided
-    user_level = None
-    if user_id:
-        db = SessionLocal()
-        user = db.query(User).filter_by(telegram_id=user_id).first()
-        if user:
-            user_level = user.level
-        db.close()
-    
+def get_stream_courses_message(stream, user=None):
+    """Get appropriate message based on stream and the level of the user's cached snapshot"""
+    user_level = user.level if user else None
+
     if stream == "natural_science":
         if user_level and user_level.lower() == "remedial":
             return "🧬 Natural Science Stream - Remedial Level\n\n🔰 Remedial Level Access\nCommon Subjects:\n• Mathematics, English\n\nScience Subjects:\n• Biology, Physics, Chemistry"
@@ -5,10 +5,13 @@ Separate dashboard layouts for Natural Science and Social Science streams
 
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 from app.config.constants import ADMIN_IDS
+from app.keyboards.keyboard_cache import keyboard_cache
 
 def get_natural_science_dashboard_keyboard(user_id=None):
     """Get Natural Science Stream Dashboard Keyboard"""
-    
+    return keyboard_cache.get(_build_natural_science_dashboard_keyboard, bool(user_id and user_id in ADMIN_IDS))
+
+def _build_natural_science_dashboard_keyboard(is_admin):
     keyboard = [
         [InlineKeyboardButton("🧬 Natural Science Exams", callback_data="ns_exams")],
         [InlineKeyboardButton("🎯 Practice", callback_data="ns_practice")],
@@ -19,14 +22,16 @@ def get_natural_science_dashboard_keyboard(user_id=None):
         [InlineKeyboardButton("⬅️ Main Menu", callback_data="ns_back_to_main")]
     ]
 
-    if user_id and user_id in ADMIN_IDS:
+    if is_admin:
         keyboard.insert(-2, [InlineKeyboardButton("👑 Admin", callback_data="admin")])
 
     return InlineKeyboardMarkup(keyboard)
 
 def get_social_science_dashboard_keyboard(user_id=None):
     """Get Social Science Stream Dashboard Keyboard"""
-    
+    return keyboard_cache.get(_build_social_science_dashboard_keyboard, bool(user_id and user_id in ADMIN_IDS))
+
+def _build_social_science_dashboard_keyboard(is_admin):
     keyboard = [
         [InlineKeyboardButton("🌍 Social Science Exams", callback_data="ss_exams")],
         [InlineKeyboardButton("🎯 Practice", callback_data="ss_practice")],
@@ -37,7 +42,7 @@ def get_social_science_dashboard_keyboard(user_id=None):
         [InlineKeyboardButton("⬅️ Main Menu", callback_data="ss_back_to_main")]
     ]
 
-    if user_id and user_id in ADMIN_IDS:
+    if is_admin:
         keyboard.insert(-2, [InlineKeyboardButton("👑 Admin", callback_data="admin")])
 
     return InlineKeyboardMarkup(keyboard)
@@ -51,7 +56,7 @@ def get_natural_science_dashboard_message(user):
     message = f"""
 🧬 NATURAL SCIENCE STREAM DASHBOARD
 
-👤 User: {user.first_name} {user.last_name or ''}
+👤 User: {user.full_name}
 📚 Level: {level.title()}
 🏷️ Stream: Natural Science
 🔑 Access: {access_status}
@@ -81,7 +86,7 @@ def get_social_science_dashboard_message(user):
     message = f"""
 🌍 SOCIAL SCIENCE STREAM DASHBOARD
 
-👤 User: {user.first_name} {user.last_name or ''}
+👤 User: {user.full_name}
 📚 Level: {level.title()}
 🏷️ Stream: Social Science
 🔑 Access: {access_status}
@@ -5,5 +5,12 @@ from .exam import Exam
 from .question import Question
 from .answer import Answer
 from .result import Result
+from .referral import Referral
+from .user_score_stats import UserScoreStats
+from .user_session import UserSession
+from .broadcast import Broadcast
 
-__all__ = ["User", "Payment", "Course", "Exam", "Question", "Answer", "Result"]
\ No newline at end of file
+__all__ = [
+    "User", "Payment", "Course", "Exam", "Question", "Answer", "Result", "Referral", "UserScoreStats", "UserSession",
+    "Broadcast"
+]
@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, func, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database.base import Base
 
 class Answer(Base):
     __tablename__ = "answers"
+    __table_args__ = (
+        # finalize_exam / get_detailed_feedback: user_id + question_id IN (exam's questions)
+        Index("ix_answers_user_question", "user_id", "question_id"),
+        Index("ix_answers_user_exam", "user_id", "exam_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
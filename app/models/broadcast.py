@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, func
+from app.database.base import Base
+
+class Broadcast(Base):
+    """An admin broadcast and its checkpoint, so a restart resumes where it stopped"""
+    __tablename__ = "broadcasts"
+
+    id = Column(Integer, primary_key=True)
+    admin_id = Column(BigInteger, nullable=False)  # Telegram id of the admin who sent it
+    text = Column(Text, nullable=False)
+
+    # Segment; NULL matches every user
+    stream = Column(String, nullable=True)
+    level = Column(String, nullable=True)
+    payment_status = Column(String, nullable=True)
+
+    status = Column(String, nullable=False, default="running")  # running, completed, cancelled
+    last_user_id = Column(Integer, nullable=False, default=0)  # users.id of the last recipient handled
+    delivered = Column(Integer, nullable=False, default=0)
+    blocked = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime, default=func.now())
+    updated_at = Column(DateTime, default=func.now())
+    finished_at = Column(DateTime, nullable=True)
@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime, func, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, func, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database.base import Base
 
 class Payment(Base):
     __tablename__ = "payments"
+    __table_args__ = (
+        # admin_payments lists pending payments
+        Index("ix_payments_status_created", "status", "created_at"),
+        Index("ix_payments_user_id", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -1,10 +1,13 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.database.base import Base
 from datetime import datetime
 
 class Question(Base):
     __tablename__ = "questions"
+    __table_args__ = (
+        Index("ix_questions_exam_id", "exam_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     exam_id = Column(Integer, ForeignKey("exams.id"), nullable=False)
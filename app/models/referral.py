@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database.base import Base
 
 class Referral(Base):
     __tablename__ = "referrals"
+    __table_args__ = (
+        # Profile stats and history filter by referrer, commission processing by referred user
+        Index("ix_referrals_referrer_status", "referrer_id", "status"),
+        Index("ix_referrals_referred_status", "referred_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True)
     
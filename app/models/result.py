@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, Float, DateTime, func, ForeignKey
+from sqlalchemy import Column, Integer, Float, DateTime, func, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database.base import Base
 
 class Result(Base):
     __tablename__ = "results"
+    __table_args__ = (
+        # Leaderboards and exam history filter by user and read the latest result
+        Index("ix_results_user_completed", "user_id", "completed_at"),
+        Index("ix_results_exam_id", "exam_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -24,6 +24,9 @@ class User(Base):
     total_commission = Column(Integer, default=0)  # Total ETB earned from referrals
     is_referral_active = Column(Boolean, default=True)  # Whether user can earn more referrals
 
+    # Set when a message fails because the user blocked the bot; broadcasts skip them
+    is_blocked = Column(Boolean, default=False, nullable=False, server_default="0")
+
     # Relationships
     payments = relationship("Payment", back_populates="user")
     answers = relationship("Answer", back_populates="user")
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, Float, DateTime, Index
+from app.database.base import Base
+
+class UserScoreStats(Base):
+    """Per-user rollup of results, updated whenever a Result is written"""
+    __tablename__ = "user_score_stats"
+    __table_args__ = (
+        # Leaderboard views read the top N by each metric
+        Index("ix_user_score_stats_best", "best_score"),
+        Index("ix_user_score_stats_latest", "latest_score"),
+        Index("ix_user_score_stats_average", "average_score"),
+    )
+
+    # Same identity Result.user_id holds
+    user_id = Column(Integer, primary_key=True)
+    best_score = Column(Integer)
+    latest_score = Column(Integer)
+    score_sum = Column(Integer, default=0, nullable=False)
+    scored_count = Column(Integer, default=0, nullable=False)  # results with a score
+    result_count = Column(Integer, default=0, nullable=False)
+    average_score = Column(Float)  # score_sum / scored_count, kept for the index
+    last_completed_at = Column(DateTime)
+
+    def apply_result(self, score, completed_at):
+        """Fold one new result into the rollup"""
+        self.result_count = (self.result_count or 0) + 1
+        if score is not None:
+            self.score_sum = (self.score_sum or 0) + score
+            self.scored_count = (self.scored_count or 0) + 1
+            self.average_score = self.score_sum / self.scored_count
+            self.best_score = score if self.best_score is None else max(self.best_score, score)
+        if self.last_completed_at is None or completed_at is None or completed_at >= self.last_completed_at:
+            self.latest_score = score
+            self.last_completed_at = completed_at or self.last_completed_at
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, BigInteger, Text, DateTime
+from app.database.base import Base
+
+class UserSession(Base):
+    """Persisted context.user_data, so in-progress exams survive a restart"""
+    __tablename__ = "user_sessions"
+
+    # Telegram user id, the key PTB uses for user_data
+    user_id = Column(BigInteger, primary_key=True)
+    data = Column(Text, nullable=False)  # compact JSON, see app/bot/persistence.py
+    updated_at = Column(DateTime, nullable=False)
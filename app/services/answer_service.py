@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from sqlalchemy import insert
+from app.config.settings import ANSWER_SINK_BATCH_SIZE, ANSWER_SINK_FLUSH_INTERVAL
+from app.database.session import SessionLocal, engine
+from app.models.answer import Answer
+
+logger = logging.getLogger(__name__)
+
+def save_answer(user_id, question_id, selected_option, is_correct, exam_id=None):
+    """Persist a single answer"""
+    db = SessionLocal()
+    answer = Answer(
+        user_id=user_id,
+        exam_id=exam_id,
+        question_id=question_id,
+        selected_option=selected_option,
+        is_correct=is_correct
+    )
+    db.add(answer)
+    db.commit()
+    db.close()
+
+async def save_answer_async(user_id, question_id, selected_option, is_correct, exam_id=None):
+    """Persist a single answer without blocking the event loop"""
+    # Writes from async code go through SessionLocal in a worker thread, see app/database/async_session.py
+    await asyncio.to_thread(save_answer, user_id, question_id, selected_option, is_correct, exam_id)
+
+class AnswerSink:
+    """Write-behind buffer that batches Answer rows into one executemany per flush.
+    Flushes on batch size or flush interval; flush() is forced before scoring and on shutdown."""
+
+    def __init__(self, bind, batch_size=ANSWER_SINK_BATCH_SIZE, flush_interval=ANSWER_SINK_FLUSH_INTERVAL):
+        self.bind = bind
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._buffer_lock = threading.Lock()
+        # Held across swap + write so a forced flush waits for one already in flight
+        self._flush_lock = threading.Lock()
+        self._wakeup = None
+        self._task = None
+        self.flushed_rows = 0
+        self.flush_count = 0
+
+    def add(self, user_id, question_id, selected_option, is_correct, exam_id=None):
+        """Buffer one answer; never touches the database on the caller's path"""
+        row = {
+            "user_id": user_id,
+            "exam_id": exam_id,
+            "question_id": question_id,
+            "selected_option": selected_option,
+            "is_correct": is_correct,
+            "timestamp": datetime.utcnow()
+        }
+        with self._buffer_lock:
+            self._buffer.append(row)
+            pending = len(self._buffer)
+
+        if not self._ensure_started():
+            # No event loop to flush in the background, write through
+            if pending >= self.batch_size:
+                self.flush()
+        elif pending >= self.batch_size:
+            self._wakeup.set()
+
+    def pending(self):
+        """Number of answers buffered but not yet written"""
+        with self._buffer_lock:
+            return len(self._buffer)
+
+    def flush(self):
+        """Write every buffered answer in a single executemany; returns rows written"""
+        with self._flush_lock:
+            with self._buffer_lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+
+            try:
+                with self.bind.begin() as conn:
+                    conn.execute(insert(Answer.__table__), rows)
+            except Exception as e:
+                logger.error(f"Failed to flush {len(rows)} answers, keeping them buffered: {e}")
+                with self._buffer_lock:
+                    self._buffer[:0] = rows
+                raise
+
+            self.flushed_rows += len(rows)
+            self.flush_count += 1
+            return len(rows)
+
+    async def flush_async(self):
+        """Force a flush from async code without blocking the event loop.
+        Always goes through flush(): with the buffer already swapped out by a flush
+        in flight, it still has to wait on _flush_lock for that write to commit."""
+        return await asyncio.to_thread(self.flush)
+
+    def _ensure_started(self):
+        if self._task is not None and not self._task.done():
+            return True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+        return True
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if not self.pending():
+                continue
+            try:
+                await self.flush_async()
+            except Exception:
+                # Rows stay buffered and are retried on the next tick
+                pass
+
+    async def start(self):
+        """Start the background flusher on the running loop"""
+        self._ensure_started()
+
+    async def stop(self):
+        """Stop the background flusher and write everything still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+answer_sink = AnswerSink(engine)
@@ -0,0 +1,212 @@
+"""
+Broadcast Service
+Admin broadcasts to every user or to one stream/level/payment_status segment.
+Recipients are read in users.id order one page at a time (keyset pagination)
+and sent on the send queue's bulk lane, as fast as its flood limits allow.
+The broadcasts row is checkpointed after every page, so a restart resumes
+after the last recipient handled. Users who blocked the bot are marked and
+skipped from then on.
+"""
+
+import asyncio
+import logging
+from sqlalchemy import select, update, func
+from telegram.error import Forbidden
+from app.config.settings import BROADCAST_PAGE_SIZE
+from app.database.session import SessionLocal
+from app.database.async_session import AsyncSessionLocal
+from app.models.broadcast import Broadcast
+from app.models.user import User
+from app.bot.send_queue import send_queue, BULK, NOTIFICATION
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_FIELDS = ("stream", "level", "payment_status")
+
+# broadcast id -> task sending it
+_running = {}
+
+def _recipient_filter(segment):
+    criteria = [User.is_blocked.is_(False)]
+    for field in SEGMENT_FIELDS:
+        if segment.get(field) is not None:
+            criteria.append(getattr(User, field) == segment[field])
+    return criteria
+
+def _segment_of(broadcast):
+    return {field: getattr(broadcast, field) for field in SEGMENT_FIELDS}
+
+async def count_recipients(**segment):
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count(User.id)).where(*_recipient_filter(segment)))
+
+async def stream_recipients(segment, after_id=0, page_size=BROADCAST_PAGE_SIZE):
+    """Yield pages of (users.id, telegram_id) after users.id `after_id`, in id order"""
+    criteria = _recipient_filter(segment)
+    while True:
+        # One short read per page; a cursor held for the whole broadcast would stall WAL checkpoints
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(User.id, User.telegram_id)
+                .where(User.id > after_id, *criteria)
+                .order_by(User.id)
+                .limit(page_size)
+            )).all()
+        if not rows:
+            return
+        yield rows
+        after_id = rows[-1].id
+
+async def get_broadcast(broadcast_id):
+    async with AsyncSessionLocal() as db:
+        return await db.get(Broadcast, broadcast_id)
+
+async def recent_broadcasts(limit=5):
+    async with AsyncSessionLocal() as db:
+        return (await db.scalars(select(Broadcast).order_by(Broadcast.id.desc()).limit(limit))).all()
+
+def _write_checkpoint(broadcast_id, values, blocked_ids):
+    db = SessionLocal()
+    try:
+        db.execute(update(Broadcast).where(Broadcast.id == broadcast_id).values(**values))
+        if blocked_ids:
+            db.execute(update(User).where(User.id.in_(blocked_ids)).values(is_blocked=True))
+        db.commit()
+    finally:
+        db.close()
+
+async def _checkpoint(broadcast_id, last_user_id, delivered, blocked_ids, failed, status=None):
+    values = {
+        "last_user_id": last_user_id,
+        "delivered": Broadcast.delivered + delivered,
+        "blocked": Broadcast.blocked + len(blocked_ids),
+        "failed": Broadcast.failed + failed,
+        "updated_at": func.now()
+    }
+    if status is not None:
+        values["status"] = status
+        values["finished_at"] = func.now()
+    await asyncio.to_thread(_write_checkpoint, broadcast_id, values, blocked_ids)
+
+async def _send_page(bot, broadcast, page):
+    """Send one page and checkpoint the recipients handled; returns False if stopped part way"""
+    futures = [send_queue.send_message(bot, telegram_id, broadcast.text, lane=BULK) for _, telegram_id in page]
+    stopped = False
+    try:
+        await asyncio.wait(futures)
+    except asyncio.CancelledError:
+        stopped = True
+        for future in futures:
+            future.cancel()
+
+    # Only the recipients up to the first unfinished send count as handled
+    last_user_id = broadcast.last_user_id
+    delivered, failed, blocked_ids = 0, 0, []
+    for (user_id, telegram_id), future in zip(page, futures):
+        if future.cancelled():
+            stopped = True
+            break
+        error = future.exception()
+        if error is None:
+            delivered += 1
+        elif isinstance(error, Forbidden):
+            blocked_ids.append(user_id)
+        else:
+            failed += 1
+        last_user_id = user_id
+
+    if last_user_id != broadcast.last_user_id:
+        await _checkpoint(broadcast.id, last_user_id, delivered, blocked_ids, failed)
+        broadcast.last_user_id = last_user_id
+    if stopped and asyncio.current_task().cancelling():
+        raise asyncio.CancelledError()
+    return not stopped
+
+async def run_broadcast(bot, broadcast_id):
+    """Send a broadcast from its checkpoint to the end, then report to the admin"""
+    broadcast = await get_broadcast(broadcast_id)
+    if broadcast is None or broadcast.status != "running":
+        return
+    logger.info(f"Broadcast {broadcast_id} sending after user {broadcast.last_user_id}")
+    async for page in stream_recipients(_segment_of(broadcast), broadcast.last_user_id):
+        if not await _send_page(bot, broadcast, page):
+            # The send queue shut down; resume from the checkpoint on the next start
+            return
+    await _checkpoint(broadcast_id, broadcast.last_user_id, 0, [], 0, status="completed")
+
+    broadcast = await get_broadcast(broadcast_id)
+    logger.info(f"Broadcast {broadcast_id} completed: {broadcast.delivered} delivered, "
+                f"{broadcast.blocked} blocked, {broadcast.failed} failed")
+    send_queue.send_message(bot, broadcast.admin_id, format_report(broadcast), lane=NOTIFICATION)
+
+def format_report(broadcast):
+    segment = ", ".join(f"{field}={value}" for field, value in _segment_of(broadcast).items() if value) or "all users"
+    return (
+        f"📣 Broadcast #{broadcast.id} {broadcast.status}\n\n"
+        f"👥 Segment: {segment}\n"
+        f"✅ Delivered: {broadcast.delivered}\n"
+        f"🚫 Blocked: {broadcast.blocked}\n"
+        f"❌ Failed: {broadcast.failed}"
+    )
+
+def launch(bot, broadcast_id):
+    """Run a broadcast in the background"""
+    task = _running.get(broadcast_id)
+    if task is not None and not task.done():
+        return task
+    task = asyncio.get_running_loop().create_task(run_broadcast(bot, broadcast_id))
+    _running[broadcast_id] = task
+    task.add_done_callback(lambda done: _finished(broadcast_id, done))
+    return task
+
+def _finished(broadcast_id, task):
+    if _running.get(broadcast_id) is task:
+        del _running[broadcast_id]
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Broadcast {broadcast_id} stopped: {task.exception()}")
+
+def _create_broadcast(admin_id, text, segment):
+    db = SessionLocal()
+    try:
+        broadcast = Broadcast(admin_id=admin_id, text=text, status="running", **segment)
+        db.add(broadcast)
+        db.commit()
+        db.refresh(broadcast)
+        return broadcast
+    finally:
+        db.close()
+
+async def start_broadcast(bot, admin_id, text, **segment):
+    """Record a broadcast and start sending it; returns (broadcast, recipient count)"""
+    broadcast = await asyncio.to_thread(_create_broadcast, admin_id, text, segment)
+    recipients = await count_recipients(**segment)
+    launch(bot, broadcast.id)
+    return broadcast, recipients
+
+async def cancel_broadcast(broadcast_id):
+    """Stop a running broadcast; returns False if it was not running"""
+    broadcast = await get_broadcast(broadcast_id)
+    if broadcast is None or broadcast.status != "running":
+        return False
+    task = _running.pop(broadcast_id, None)
+    if task is not None:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    broadcast = await get_broadcast(broadcast_id)
+    await _checkpoint(broadcast_id, broadcast.last_user_id, 0, [], 0, status="cancelled")
+    return True
+
+async def resume_broadcasts(bot):
+    """Restart every broadcast a shutdown interrupted; returns how many"""
+    async with AsyncSessionLocal() as db:
+        ids = (await db.scalars(select(Broadcast.id).where(Broadcast.status == "running"))).all()
+    for broadcast_id in ids:
+        launch(bot, broadcast_id)
+    return len(ids)
+
+async def stop_broadcasts():
+    """Stop sending at shutdown; each broadcast keeps its checkpoint and stays running"""
+    tasks = list(_running.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,4 +1,6 @@
+from sqlalchemy import select
 from app.database.session import SessionLocal
+from app.database.async_session import AsyncSessionLocal
 from app.models.course import Course
 
 def get_all_courses():
@@ -13,4 +15,15 @@ def get_course_by_id(course_id):
     db = SessionLocal()
     course = db.query(Course).filter_by(id=course_id).first()
     db.close()
-    return course
\ No newline at end of file
+    return course
+
+async def get_all_courses_async():
+    """Get all available courses without blocking the event loop"""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(Course))
+        return result.scalars().all()
+
+async def get_course_by_id_async(course_id):
+    """Get a specific course by ID without blocking the event loop"""
+    async with AsyncSessionLocal() as db:
+        return await db.get(Course, course_id)
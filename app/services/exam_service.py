@@ -1,8 +1,15 @@
+from sqlalchemy import select
 from app.database.session import SessionLocal
+from app.database.async_session import AsyncSessionLocal
 from app.models.exam import Exam
 
 def get_exams_by_course(course_id):
     db = SessionLocal()
     exams = db.query(Exam).filter_by(course_id=course_id).all()
     db.close()
-    return exams
\ No newline at end of file
+    return exams
+
+async def get_exams_by_course_async(course_id):
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(Exam).filter_by(course_id=course_id))
+        return result.scalars().all()
@@ -0,0 +1,132 @@
+"""
+Exam Session
+Per-user state of an exam or practice run. Questions are held as an
+array('i') of ids and resolved through the shared question bank, so a session
+costs a few hundred bytes however long the exam is.
+"""
+
+import time
+from array import array
+from datetime import datetime
+from app.services.question_bank import question_bank
+
+class ExamSession:
+    """Cursor, tally, countdown deadline and current poll of one user's run"""
+
+    __slots__ = (
+        "user_id", "chat_id", "exam_id", "question_ids", "index",
+        "answered", "correct", "started_at", "deadline", "poll_id", "use_timer"
+    )
+
+    def __init__(self, user_id, chat_id, questions, exam_id=None, use_timer=False):
+        self.user_id = user_id
+        self.chat_id = chat_id
+        self.exam_id = exam_id  # None for practice
+        self.question_ids = array("i", (question.id for question in questions))
+        self.index = 0
+        self.answered = 0
+        self.correct = 0
+        self.started_at = datetime.utcnow()
+        self.deadline = None  # wall-clock time the current question's countdown ends
+        self.poll_id = None
+        self.use_timer = use_timer
+
+    def __len__(self):
+        return len(self.question_ids)
+
+    @property
+    def is_practice(self):
+        return self.exam_id is None
+
+    @property
+    def finished(self):
+        return self.index >= len(self.question_ids)
+
+    @property
+    def question_id(self):
+        return self.question_ids[self.index]
+
+    @property
+    def question(self):
+        """Snapshot of the question under the cursor; None if it was deleted meanwhile"""
+        return question_bank.get_question(self.question_ids[self.index])
+
+    @property
+    def timer_key(self):
+        return (self.user_id, self.index)
+
+    def current(self):
+        """Question to show next, skipping questions deleted since the session started"""
+        while not self.finished:
+            question = self.question
+            if question is not None:
+                return question
+            self.index += 1
+        return None
+
+    def restart(self):
+        """Back to the first question with an empty tally"""
+        self.index = 0
+        self.answered = 0
+        self.correct = 0
+        self.started_at = datetime.utcnow()
+        self.deadline = None
+        self.poll_id = None
+
+    def record(self, is_correct):
+        """Count the answer (a timeout counts as wrong) and move to the next question"""
+        self.answered += 1
+        if is_correct:
+            self.correct += 1
+        self.index += 1
+        self.deadline = None
+        self.poll_id = None
+
+    def tally(self):
+        """Running score in the form finalize_exam expects"""
+        return {"answered": self.answered, "correct": self.correct, "started_at": self.started_at}
+
+    def start_countdown(self, seconds):
+        self.deadline = time.time() + seconds
+        return seconds
+
+    def remaining(self, default):
+        """Seconds left on the countdown, e.g. after a restart"""
+        if self.deadline is None:
+            return default
+        return max(0.0, self.deadline - time.time())
+
+    def __deepcopy__(self, memo):
+        # Every field but the id array is immutable
+        clone = ExamSession.__new__(ExamSession)
+        for name in self.__slots__:
+            setattr(clone, name, getattr(self, name))
+        clone.question_ids = array("i", self.question_ids)
+        return clone
+
+    def to_record(self):
+        """Plain values for persistence"""
+        return {
+            "user_id": self.user_id,
+            "chat_id": self.chat_id,
+            "exam_id": self.exam_id,
+            "questions": self.question_ids.tolist(),
+            "index": self.index,
+            "answered": self.answered,
+            "correct": self.correct,
+            "started_at": self.started_at,
+            "deadline": self.deadline,
+            "poll_id": self.poll_id,
+            "use_timer": self.use_timer
+        }
+
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild a stored session; None if one of its questions no longer exists"""
+        if any(question_bank.get_question(question_id) is None for question_id in record["questions"]):
+            return None
+        session = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(session, name, record.get(name))
+        session.question_ids = array("i", record["questions"])
+        return session
@@ -0,0 +1,186 @@
+from sqlalchemy import select, func, delete, insert
+from app.config.settings import LEADERBOARD_SOURCE
+from app.database.session import SessionLocal
+from app.database.async_session import AsyncSessionLocal
+from app.models.result import Result
+from app.models.user import User
+from app.models.user_score_stats import UserScoreStats
+
+LEADERBOARD_METRICS = {
+    "best": UserScoreStats.best_score,
+    "latest": UserScoreStats.latest_score,
+    "average": UserScoreStats.average_score,
+}
+
+def record_result(db, user_id, score, completed_at):
+    """Fold a new Result into the user's rollup inside the caller's transaction"""
+    stats = db.get(UserScoreStats, user_id)
+    if stats is None:
+        stats = UserScoreStats(user_id=user_id, score_sum=0, scored_count=0, result_count=0)
+        db.add(stats)
+    stats.apply_result(score, completed_at)
+    return stats
+
+def _leaderboard_queries(metric, limit):
+    column = LEADERBOARD_METRICS[metric]
+    top = (
+        select(UserScoreStats, User)
+        .join(User, User.id == UserScoreStats.user_id)
+        .filter(column.isnot(None))
+        .order_by(column.desc())
+        .limit(limit)
+    )
+    total = (
+        select(func.count())
+        .select_from(UserScoreStats)
+        .join(User, User.id == UserScoreStats.user_id)
+        .filter(column.isnot(None))
+    )
+    return top, total
+
+def _leaderboard_rows(rows):
+    leaderboard_data = []
+    for rank, (stats, user) in enumerate(rows, 1):
+        leaderboard_data.append({
+            'rank': rank,
+            'user_id': user.telegram_id,
+            'user_name': user.full_name or f"User_{user.telegram_id}",
+            'best_score': stats.best_score,
+            'latest_score': stats.latest_score,
+            'average_score': round(stats.average_score or 0, 1),
+            'total_exams': stats.result_count
+        })
+    return leaderboard_data
+
+def get_leaderboard(metric="best", limit=10):
+    """Get the top users by a metric and the total number of ranked users"""
+    if LEADERBOARD_SOURCE == "results":
+        return get_leaderboard_from_results(metric, limit)
+    top, total = _leaderboard_queries(metric, limit)
+    db = SessionLocal()
+    leaderboard_data = _leaderboard_rows(db.execute(top).all())
+    total_users = db.execute(total).scalar()
+    db.close()
+    return leaderboard_data, total_users
+
+async def get_leaderboard_async(metric="best", limit=10):
+    """Get the top users by a metric without blocking the event loop"""
+    if LEADERBOARD_SOURCE == "results":
+        return await get_leaderboard_from_results_async(metric, limit)
+    top, total = _leaderboard_queries(metric, limit)
+    async with AsyncSessionLocal() as db:
+        leaderboard_data = _leaderboard_rows((await db.execute(top)).all())
+        total_users = (await db.execute(total)).scalar()
+    return leaderboard_data, total_users
+
+def _latest_results():
+    """Each user's results numbered from the most recent (rn = 1)"""
+    return select(
+        Result.user_id,
+        Result.score,
+        Result.completed_at,
+        func.row_number().over(
+            partition_by=Result.user_id,
+            order_by=(Result.completed_at.desc(), Result.id.desc())
+        ).label("rn")
+    ).subquery()
+
+def _result_aggregates():
+    """Per-user best, sum, counts and average over every Result"""
+    return select(
+        Result.user_id,
+        func.max(Result.score).label("best_score"),
+        func.coalesce(func.sum(Result.score), 0).label("score_sum"),
+        func.count(Result.score).label("scored_count"),
+        func.count(Result.id).label("result_count"),
+        func.avg(Result.score).label("average_score")
+    ).group_by(Result.user_id).subquery()
+
+def _results_leaderboard_query(metric, limit):
+    """One query computing every user's metrics, RANK() and the ranked total from results"""
+    aggregates = _result_aggregates()
+    latest = _latest_results()
+    metric_column = {
+        "best": aggregates.c.best_score,
+        "latest": latest.c.score,
+        "average": aggregates.c.average_score,
+    }[metric]
+
+    ranked = (
+        select(
+            User.telegram_id,
+            User.full_name,
+            aggregates.c.best_score,
+            latest.c.score.label("latest_score"),
+            aggregates.c.average_score,
+            aggregates.c.result_count,
+            func.rank().over(order_by=metric_column.desc()).label("rank"),
+            func.count().over().label("total_users")
+        )
+        .join(latest, (latest.c.user_id == aggregates.c.user_id) & (latest.c.rn == 1))
+        .join(User, User.id == aggregates.c.user_id)
+        .filter(metric_column.isnot(None))
+        .subquery()
+    )
+    return select(ranked).order_by(ranked.c.rank).limit(limit)
+
+def _results_leaderboard_rows(rows):
+    leaderboard_data = []
+    total_users = 0
+    for row in rows:
+        total_users = row.total_users
+        leaderboard_data.append({
+            'rank': row.rank,
+            'user_id': row.telegram_id,
+            'user_name': row.full_name or f"User_{row.telegram_id}",
+            'best_score': row.best_score,
+            'latest_score': row.latest_score,
+            'average_score': round(row.average_score or 0, 1),
+            'total_exams': row.result_count
+        })
+    return leaderboard_data, total_users
+
+def get_leaderboard_from_results(metric="best", limit=10):
+    """Rank users straight from results, for when the rollup is unavailable"""
+    db = SessionLocal()
+    rows = db.execute(_results_leaderboard_query(metric, limit)).all()
+    db.close()
+    return _results_leaderboard_rows(rows)
+
+async def get_leaderboard_from_results_async(metric="best", limit=10):
+    """Rank users straight from results without blocking the event loop"""
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(_results_leaderboard_query(metric, limit))).all()
+    return _results_leaderboard_rows(rows)
+
+def rebuild_user_score_stats(conn):
+    """Replace user_score_stats with aggregates of every stored Result on a connection"""
+    latest = _latest_results()
+    aggregates = _result_aggregates()
+
+    rows = conn.execute(
+        select(aggregates, latest.c.score, latest.c.completed_at)
+        .join(latest, (latest.c.user_id == aggregates.c.user_id) & (latest.c.rn == 1))
+    ).all()
+
+    conn.execute(delete(UserScoreStats.__table__))
+    if rows:
+        conn.execute(insert(UserScoreStats.__table__), [
+            {
+                "user_id": row.user_id,
+                "best_score": row.best_score,
+                "latest_score": row.score,
+                "score_sum": row.score_sum,
+                "scored_count": row.scored_count,
+                "result_count": row.result_count,
+                "average_score": (row.score_sum / row.scored_count) if row.scored_count else None,
+                "last_completed_at": row.completed_at
+            }
+            for row in rows
+        ])
+    return len(rows)
+
+def backfill_user_score_stats(engine):
+    """Rebuild user_score_stats from every stored Result; returns users written"""
+    with engine.begin() as conn:
+        return rebuild_user_score_stats(conn)
@@ -1,6 +1,8 @@
+import asyncio
 from app.database.session import SessionLocal
 from app.models.payment import Payment
 from app.models.user import User
+from app.services.user_cache import user_cache
 from app.config.constants import (
     PAYMENT_PENDING,
     PAYMENT_APPROVED,
@@ -33,6 +35,7 @@ def approve_payment(payment_id):
             user.payment_status = PAYMENT_APPROVED
             user.access = ACCESS_UNLOCKED
             db.commit()
+            user_cache.invalidate(user.telegram_id)
             return True
         else:
             return False
@@ -52,6 +55,8 @@ def reject_payment(payment_id):
         if payment:
             payment.status = PAYMENT_REJECTED
             db.commit()
+            if payment.user:
+                user_cache.invalidate(payment.user.telegram_id)
             return True
         else:
             return False
@@ -61,6 +66,18 @@ def reject_payment(payment_id):
     finally:
         db.close()
 
+# Writes from async code go through SessionLocal in a worker thread, see app/database/async_session.py
+async def create_payment_async(user_id, proof):
+    await asyncio.to_thread(create_payment, user_id, proof)
+
+async def approve_payment_async(payment_id):
+    """Approve payment and return success status without blocking the event loop"""
+    return await asyncio.to_thread(approve_payment, payment_id)
+
+async def reject_payment_async(payment_id):
+    """Reject payment and return success status without blocking the event loop"""
+    return await asyncio.to_thread(reject_payment, payment_id)
+
 def process_referral_commission(user_id):
     """Process referral commission when user completes payment"""
     from app.handlers.profile_handler import process_referral_commission_sync
@@ -0,0 +1,153 @@
+"""
+Question Bank Cache
+Process-wide, read-only snapshots of every question, indexed by exam and
+course. Questions only change through the admin tools, which invalidate the
+bank; the next read reloads it with a single query.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import NamedTuple, Optional
+from sqlalchemy import select
+from app.database.session import SessionLocal
+from app.models.question import Question
+from app.models.exam import Exam
+
+logger = logging.getLogger(__name__)
+
+class QuestionSnapshot(NamedTuple):
+    """Immutable copy of a question row, safe to share between sessions"""
+    id: int
+    exam_id: int
+    course_id: Optional[int]
+    text: str
+    option_a: Optional[str]
+    option_b: Optional[str]
+    option_c: Optional[str]
+    option_d: Optional[str]
+    correct_option: Optional[str]
+    difficulty: Optional[str]
+
+    @property
+    def correct_answer(self):
+        return self.correct_option
+
+    # Every field is immutable; persistence deepcopies user_data each run
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+class QuestionBank:
+    """Question snapshots indexed by exam_id and course_id with hit/miss counters"""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._by_id = None
+        self._by_exam = None
+        self._by_course = None
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def load(self):
+        """Load every question in one query and swap in the new indexes"""
+        with self._lock:
+            # Misses queue on the lock after an invalidate(); the first one reloads for all of them
+            if self._by_exam is not None:
+                return len(self._by_id)
+            db = self.session_factory()
+            try:
+                rows = db.execute(
+                    select(
+                        Question.id, Question.exam_id, Exam.course_id, Question.text,
+                        Question.option_a, Question.option_b, Question.option_c, Question.option_d,
+                        Question.correct_answer, Question.difficulty
+                    ).outerjoin(Exam, Question.exam_id == Exam.id).order_by(Question.id)
+                ).all()
+            finally:
+                db.close()
+
+            by_id = {}
+            by_exam = {}
+            by_course = {}
+            for row in rows:
+                snapshot = QuestionSnapshot(*row)
+                by_id[snapshot.id] = snapshot
+                by_exam.setdefault(snapshot.exam_id, []).append(snapshot)
+                if snapshot.course_id is not None:
+                    by_course.setdefault(snapshot.course_id, []).append(snapshot)
+
+            self._by_id = by_id
+            self._by_exam = {k: tuple(v) for k, v in by_exam.items()}
+            self._by_course = {k: tuple(v) for k, v in by_course.items()}
+            logger.info(f"Question bank loaded {len(by_id)} questions")
+            return len(by_id)
+
+    async def load_async(self):
+        """Load the bank without blocking the event loop"""
+        return await asyncio.to_thread(self.load)
+
+    def invalidate(self):
+        """Drop every snapshot; call after any question is added, edited or deleted"""
+        with self._lock:
+            self._by_id = None
+            self._by_exam = None
+            self._by_course = None
+            self.version += 1
+            self.invalidations += 1
+
+    def is_loaded(self):
+        return self._by_exam is not None
+
+    def _indexes(self):
+        by_id, by_exam, by_course = self._by_id, self._by_exam, self._by_course
+        if by_exam is not None:
+            self.hits += 1
+            return by_id, by_exam, by_course
+        while by_exam is None:
+            self.misses += 1
+            self.load()
+            by_id, by_exam, by_course = self._by_id, self._by_exam, self._by_course
+        return by_id, by_exam, by_course
+
+    def get_question(self, question_id):
+        return self._indexes()[0].get(question_id)
+
+    def get_exam_questions(self, exam_id):
+        """Get the snapshot tuple for an exam (empty when it has no questions)"""
+        return self._indexes()[1].get(exam_id, ())
+
+    def get_course_questions(self, course_id):
+        """Get the snapshot tuple for every exam in a course"""
+        return self._indexes()[2].get(course_id, ())
+
+    async def _indexes_async(self):
+        if self._by_exam is not None:
+            self.hits += 1
+        while self._by_exam is None:
+            self.misses += 1
+            await self.load_async()
+        return self._by_id, self._by_exam, self._by_course
+
+    async def get_exam_questions_async(self, exam_id):
+        return (await self._indexes_async())[1].get(exam_id, ())
+
+    async def get_course_questions_async(self, course_id):
+        return (await self._indexes_async())[2].get(course_id, ())
+
+    def stats(self):
+        return {
+            "loaded": self.is_loaded(),
+            "questions": len(self._by_id or {}),
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations
+        }
+
+question_bank = QuestionBank()
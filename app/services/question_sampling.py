@@ -0,0 +1,21 @@
+"""
+Question Sampling
+Pick k questions without shuffling the whole bank: cached snapshot tuples are
+sampled by index in O(k).
+"""
+
+import random
+
+def sample_indices(n, k, rng=random):
+    """Get k distinct indices from range(n) in random order, in O(k)"""
+    if k is None or k >= n:
+        indices = list(range(n))
+        rng.shuffle(indices)
+        return indices
+    if k <= 0:
+        return []
+    return rng.sample(range(n), k)
+
+def sample(questions, k=None, rng=random):
+    """Get k random items of an indexable sequence; no k returns all of them shuffled"""
+    return [questions[i] for i in sample_indices(len(questions), k, rng)]
@@ -1,38 +1,32 @@
-import random
 from app.database.session import SessionLocal
 from app.models.question import Question
 from app.models.exam import Exam
+from app.services.question_bank import question_bank
+from app.services.question_sampling import sample
 
 def get_random_questions(exam_id, limit=5):
     """Get random questions for a specific exam"""
-    db = SessionLocal()
-    questions = db.query(Question).filter_by(exam_id=exam_id).all()
-    db.close()
-
-    random.shuffle(questions)
-    return questions[:limit]
+    return sample(question_bank.get_exam_questions(exam_id), limit)
 
 def get_questions_by_course(course_id, limit=None):
     """Get random questions from all exams in a course"""
-    db = SessionLocal()
-    questions = db.query(Question).join(Exam).filter(Exam.course_id == course_id).all()
-    db.close()
-
-    random.shuffle(questions)
-    if limit:
-        return questions[:limit]
-    return questions
+    return sample(question_bank.get_course_questions(course_id), limit or None)
 
 def get_questions_by_exam(exam_id, limit=None):
     """Get random questions from a specific exam (chapter)"""
-    db = SessionLocal()
-    questions = db.query(Question).filter_by(exam_id=exam_id).all()
-    db.close()
+    return sample(question_bank.get_exam_questions(exam_id), limit or None)
+
+async def get_random_questions_async(exam_id, limit=5):
+    """Get random questions for a specific exam without blocking the event loop"""
+    return sample(await question_bank.get_exam_questions_async(exam_id), limit)
+
+async def get_questions_by_course_async(course_id, limit=None):
+    """Get random questions from all exams in a course without blocking the event loop"""
+    return sample(await question_bank.get_course_questions_async(course_id), limit or None)
 
-    random.shuffle(questions)
-    if limit:
-        return questions[:limit]
-    return questions
+async def get_questions_by_exam_async(exam_id, limit=None):
+    """Get random questions from a specific exam (chapter) without blocking the event loop"""
+    return sample(await question_bank.get_exam_questions_async(exam_id), limit or None)
 
 def get_question_types():
     """Get available question types"""
@@ -55,11 +49,12 @@ def add_question(exam_id, question_text, option_a, option_b, option_c=None, opti
             option_b=option_b,
             option_c=option_c,
             option_d=option_d,
-            correct_option=correct_answer
+            correct_answer=correct_answer
         )
         db.add(question)
         db.commit()
         db.refresh(question)
+        question_bank.invalidate()
         return question
     except Exception as e:
         db.rollback()
@@ -81,6 +76,7 @@ def update_question(question_id, **kwargs):
 
         db.commit()
         db.refresh(question)
+        question_bank.invalidate()
         return question
     except Exception as e:
         db.rollback()
@@ -98,6 +94,7 @@ def delete_question(question_id):
 
         db.delete(question)
         db.commit()
+        question_bank.invalidate()
         return True
     except Exception as e:
         db.rollback()
@@ -117,7 +114,7 @@ def get_all_questions():
             "exam_name": q.exam.name if q.exam else "Unknown",
             "question_text": q.text,
             "options": [q.option_a, q.option_b, q.option_c, q.option_d],
-            "correct_answer": q.correct_option
+            "correct_answer": q.correct_answer
         })
     db.close()
     return result
\ No newline at end of file
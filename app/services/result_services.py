@@ -1,13 +1,26 @@
+from sqlalchemy import select
+from app.config.settings import EXPORT_BATCH_SIZE
 from app.database.session import SessionLocal
+from app.database.async_session import AsyncSessionLocal
 from app.models.result import Result
 from app.models.exam import Exam
 from app.models.course import Course
 from app.models.user import User
 import csv
-import io
+import gzip
+import os
+import shutil
 import openpyxl
 from datetime import datetime
 
+EXPORT_COLUMNS = (
+    "user_id", "username", "telegram_id", "course_name", "exam_name",
+    "score", "percentage", "completed_at", "status"
+)
+
+# Data rows per worksheet: Excel's 1,048,576 row limit less the header
+EXCEL_SHEET_ROWS = 1048575
+
 def get_user_exam_history(user_id):
     db = SessionLocal()
     results = db.query(Result).filter_by(user_id=user_id).all()
@@ -25,6 +38,25 @@ def get_user_exam_history(user_id):
     db.close()
     return history
 
+async def get_user_exam_history_async(user_id):
+    async with AsyncSessionLocal() as db:
+        rows = await db.execute(
+            select(Result, Exam, Course)
+            .outerjoin(Exam, Exam.id == Result.exam_id)
+            .outerjoin(Course, Course.id == Exam.course_id)
+            .filter(Result.user_id == user_id)
+        )
+        history = []
+        for r, exam, course in rows.all():
+            history.append({
+                "course": course.name if course else "Unknown",
+                "exam": exam.name if exam else "Unknown",
+                "score": r.score,
+                "percentage": r.percentage,
+                "completed_at": r.completed_at
+            })
+        return history
+
 def get_exam_analytics():
     db = SessionLocal()
     results = db.query(Result).all()
@@ -41,61 +73,76 @@ def get_exam_analytics():
     db.close()
     return analytics
 
+def iter_export_rows(db, batch_size=EXPORT_BATCH_SIZE):
+    """Yield one EXPORT_COLUMNS tuple per result from a single joined query, fetched in batches"""
+    rows = db.execute(
+        select(
+            User.id, User.username, User.telegram_id, Course.name, Exam.name,
+            Result.score, Result.percentage, Result.completed_at
+        )
+        .select_from(Result)
+        .join(User, User.id == Result.user_id)
+        .join(Exam, Exam.id == Result.exam_id)
+        .outerjoin(Course, Course.id == Exam.course_id)
+        .order_by(Result.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for batch in rows.partitions():
+        for user_id, username, telegram_id, course_name, exam_name, score, percentage, completed_at in batch:
+            yield (
+                user_id, username, telegram_id, course_name or "Unknown", exam_name, score, percentage,
+                completed_at.strftime("%Y-%m-%d %H:%M:%S") if completed_at else None,
+                "Passed" if percentage is not None and percentage >= 70 else "Failed"
+            )
+
 def get_all_results():
     """Get all exam results with user and exam details"""
     db = SessionLocal()
-    results = db.query(Result).join(User).join(Exam).all()
-    detailed_results = []
-    for r in results:
-        course = db.query(Course).filter_by(id=r.exam.course_id).first() if r.exam else None
-        detailed_results.append({
-            "user_id": r.user.id,
-            "username": r.user.username,
-            "telegram_id": r.user.telegram_id,
-            "course_name": course.name if course else "Unknown",
-            "exam_name": r.exam.name,
-            "score": r.score,
-            "percentage": r.percentage,
-            "completed_at": r.completed_at.strftime("%Y-%m-%d %H:%M:%S") if r.completed_at else None,
-            "status": "Passed" if r.percentage >= 70 else "Failed"
-        })
-    db.close()
-    return detailed_results
-
-def export_results_csv():
-    """Export all results as CSV string"""
-    results = get_all_results()
-    if not results:
-        return None
-
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=results[0].keys())
-    writer.writeheader()
-    writer.writerows(results)
-    return output.getvalue()
-
-def export_results_excel():
-    """Export all results as Excel bytes"""
-    results = get_all_results()
-    if not results:
-        return None
+    try:
+        return [dict(zip(EXPORT_COLUMNS, row)) for row in iter_export_rows(db)]
+    finally:
+        db.close()
 
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Exam Results"
-
-    # Write headers
-    headers = list(results[0].keys())
-    for col_num, header in enumerate(headers, 1):
-        ws.cell(row=1, column=col_num, value=header)
+def export_results_csv(path):
+    """Stream every result into a CSV file at path; returns the number of rows written"""
+    db = SessionLocal()
+    try:
+        with open(path, "w", newline="", encoding="utf-8") as output:
+            writer = csv.writer(output)
+            writer.writerow(EXPORT_COLUMNS)
+            count = 0
+            for row in iter_export_rows(db):
+                writer.writerow(row)
+                count += 1
+    finally:
+        db.close()
+    return count
 
-    # Write data
-    for row_num, result in enumerate(results, 2):
-        for col_num, key in enumerate(headers, 1):
-            ws.cell(row=row_num, column=col_num, value=result[key])
+def gzip_file(path):
+    """Compress path to path + '.gz' in chunks; returns the new path"""
+    with open(path, "rb") as source, gzip.open(path + ".gz", "wb") as target:
+        shutil.copyfileobj(source, target)
+    os.remove(path)
+    return path + ".gz"
 
-    # Save to bytes
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
-    return output
\ No newline at end of file
+def export_results_excel(path, rows_per_sheet=EXCEL_SHEET_ROWS):
+    """Stream every result into a write-only workbook at path; returns the number of rows written"""
+    wb = openpyxl.Workbook(write_only=True)
+    sheet, sheet_rows, count = None, rows_per_sheet, 0
+    db = SessionLocal()
+    try:
+        for row in iter_export_rows(db):
+            if sheet_rows == rows_per_sheet:
+                # Start the next sheet once this one is full
+                sheet = wb.create_sheet("Exam Results" if sheet is None else f"Exam Results {len(wb.worksheets) + 1}")
+                sheet.append(EXPORT_COLUMNS)
+                sheet_rows = 0
+            sheet.append(row)
+            sheet_rows += 1
+            count += 1
+    finally:
+        db.close()
+    if sheet is None:
+        wb.create_sheet("Exam Results").append(EXPORT_COLUMNS)
+    wb.save(path)
+    return count
\ No newline at end of file
@@ -1,44 +1,156 @@
+import asyncio
+import logging
+from datetime import datetime
+from sqlalchemy import select, func, case
+from app.config.settings import SCORING_VERIFY_TALLY
 from app.database.session import SessionLocal
+from app.database.async_session import AsyncSessionLocal
 from app.models.answer import Answer
 from app.models.result import Result
 from app.models.question import Question
+from app.services.answer_service import answer_sink
+from app.services.leaderboard_service import record_result
 
-PASS_PERCENTAGE = 70  # >=70% is pass
-
-def finalize_exam(user_id, exam_id):
-    db = SessionLocal()
+logger = logging.getLogger(__name__)
 
-    answers = db.query(Answer).filter_by(user_id=user_id).filter(Answer.question_id.in_(
-        db.query(Question.id).filter_by(exam_id=exam_id)
-    )).all()
+PASS_PERCENTAGE = 70  # >=70% is pass
 
-    correct_answers = sum(1 for a in answers if a.is_correct)
-    total_questions = len(answers)
-    wrong_answers = total_questions - correct_answers
+def _summarize(correct_answers, total_questions, result_id):
     percentage = (correct_answers / total_questions * 100) if total_questions > 0 else 0
+    return {
+        "total_questions": total_questions,
+        "correct_answers": correct_answers,
+        "wrong_answers": total_questions - correct_answers,
+        "percentage": percentage,
+        "passed": percentage >= PASS_PERCENTAGE,
+        "result_id": result_id
+    }
 
-    result = Result(
+def _new_result(user_id, exam_id, correct_answers, total_questions):
+    return Result(
         user_id=user_id,
         exam_id=exam_id,
         score=correct_answers,
-        percentage=percentage
+        percentage=(correct_answers / total_questions * 100) if total_questions > 0 else 0,
+        completed_at=datetime.utcnow()
     )
+
+def _store_result(db, user_id, exam_id, correct_answers, total_questions):
+    """Write the Result and fold it into the leaderboard rollup in one transaction"""
+    result = _new_result(user_id, exam_id, correct_answers, total_questions)
     db.add(result)
+    record_result(db, user_id, result.score, result.completed_at)
     db.commit()
-    db.refresh(result)
+    return result.id
+
+async def _store_result_async(user_id, exam_id, correct_answers, total_questions):
+    """Run _store_result in a worker thread, which can commit without the event loop"""
+    def store():
+        db = SessionLocal()
+        try:
+            return _store_result(db, user_id, exam_id, correct_answers, total_questions)
+        finally:
+            db.close()
+
+    return await asyncio.to_thread(store)
+
+def _tally_query(user_id, exam_id, tally):
+    """Answers stored for this attempt only: same exam, given since the tally started"""
+    return select(
+        func.count(Answer.id),
+        func.coalesce(func.sum(case((Answer.is_correct, 1), else_=0)), 0)
+    ).filter(
+        Answer.user_id == user_id,
+        Answer.exam_id == exam_id,
+        Answer.timestamp >= tally["started_at"]
+    )
+
+def _check_tally(user_id, exam_id, tally, stored):
+    answered, correct = stored
+    if (answered, correct) != (tally["answered"], tally["correct"]):
+        logger.warning(
+            f"Score tally mismatch for user {user_id} exam {exam_id}: "
+            f"session {tally['correct']}/{tally['answered']}, stored {correct}/{answered}"
+        )
+        return False
+    return True
+
+def verify_tally(user_id, exam_id, tally):
+    """Cross-check a session tally against the answers stored for the attempt"""
+    answer_sink.flush()
+    db = SessionLocal()
+    stored = tuple(db.execute(_tally_query(user_id, exam_id, tally)).one())
     db.close()
+    return _check_tally(user_id, exam_id, tally, stored)
 
-    return {
-        "total_questions": total_questions,
-        "correct_answers": correct_answers,
-        "wrong_answers": wrong_answers,
-        "percentage": percentage,
-        "passed": percentage >= PASS_PERCENTAGE,
-        "result_id": result.id
-    }
+async def verify_tally_async(user_id, exam_id, tally):
+    """Cross-check a session tally without blocking the event loop"""
+    await answer_sink.flush_async()
+    async with AsyncSessionLocal() as db:
+        stored = tuple((await db.execute(_tally_query(user_id, exam_id, tally))).one())
+    return _check_tally(user_id, exam_id, tally, stored)
+
+def finalize_exam(user_id, exam_id, tally=None):
+    """Store the Result for an exam; O(1) when the session tally is given"""
+    if tally is None:
+        return _finalize_from_answers(user_id, exam_id)
+    if SCORING_VERIFY_TALLY:
+        verify_tally(user_id, exam_id, tally)
+
+    db = SessionLocal()
+    result_id = _store_result(db, user_id, exam_id, tally["correct"], tally["answered"])
+    db.close()
+
+    return _summarize(tally["correct"], tally["answered"], result_id)
+
+async def finalize_exam_async(user_id, exam_id, tally=None):
+    """Store the Result for an exam without blocking the event loop"""
+    if tally is None:
+        return await _finalize_from_answers_async(user_id, exam_id)
+    if SCORING_VERIFY_TALLY:
+        await verify_tally_async(user_id, exam_id, tally)
+
+    result_id = await _store_result_async(user_id, exam_id, tally["correct"], tally["answered"])
+
+    return _summarize(tally["correct"], tally["answered"], result_id)
+
+def _finalize_from_answers(user_id, exam_id):
+    """Score by re-reading stored answers, for sessions started without a tally"""
+    # Buffered answers must be on disk before they are counted
+    answer_sink.flush()
+    db = SessionLocal()
+
+    answers = db.query(Answer).filter_by(user_id=user_id).filter(Answer.question_id.in_(
+        db.query(Question.id).filter_by(exam_id=exam_id)
+    )).all()
+
+    correct_answers = sum(1 for a in answers if a.is_correct)
+    total_questions = len(answers)
+    result_id = _store_result(db, user_id, exam_id, correct_answers, total_questions)
+    db.close()
+
+    return _summarize(correct_answers, total_questions, result_id)
+
+async def _finalize_from_answers_async(user_id, exam_id):
+    await answer_sink.flush_async()
+    async with AsyncSessionLocal() as db:
+        rows = await db.execute(
+            select(Answer.is_correct).filter(
+                Answer.user_id == user_id,
+                Answer.question_id.in_(select(Question.id).filter_by(exam_id=exam_id))
+            )
+        )
+        answers = rows.scalars().all()
+
+    correct_answers = sum(1 for is_correct in answers if is_correct)
+    total_questions = len(answers)
+    result_id = await _store_result_async(user_id, exam_id, correct_answers, total_questions)
+
+    return _summarize(correct_answers, total_questions, result_id)
 
 def get_detailed_feedback(user_id, exam_id):
     """Get detailed feedback showing each question and user's answer"""
+    answer_sink.flush()
     db = SessionLocal()
 
     answers = db.query(Answer).join(Question).filter(
@@ -52,9 +164,31 @@ def get_detailed_feedback(user_id, exam_id):
         feedback.append({
             "question_text": question.text[:100] + "..." if len(question.text) > 100 else question.text,
             "user_answer": answer.selected_option,
-            "correct_answer": question.correct_option,
+            "correct_answer": question.correct_answer,
             "is_correct": answer.is_correct
         })
 
     db.close()
-    return feedback
\ No newline at end of file
+    return feedback
+
+async def get_detailed_feedback_async(user_id, exam_id):
+    """Get detailed feedback without blocking the event loop"""
+    await answer_sink.flush_async()
+    async with AsyncSessionLocal() as db:
+        rows = await db.execute(
+            select(Answer, Question).join(Question, Answer.question_id == Question.id).filter(
+                Answer.user_id == user_id,
+                Question.exam_id == exam_id
+            )
+        )
+
+        feedback = []
+        for answer, question in rows.all():
+            feedback.append({
+                "question_text": question.text[:100] + "..." if len(question.text) > 100 else question.text,
+                "user_answer": answer.selected_option,
+                "correct_answer": question.correct_answer,
+                "is_correct": answer.is_correct
+            })
+
+        return feedback
@@ -0,0 +1,107 @@
+"""
+User Snapshot Cache
+Bounded LRU/TTL cache of the few user fields access checks and dashboards
+read, keyed by telegram_id. Registration and payment review invalidate the
+entry, so a tap costs at most one user lookup.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+from sqlalchemy import select
+from app.config.settings import USER_CACHE_SIZE, USER_CACHE_TTL
+from app.database.session import SessionLocal
+from app.models.user import User
+
+class UserSnapshot(NamedTuple):
+    """Read-only copy of the user fields used on the hot paths"""
+    id: int
+    telegram_id: int
+    full_name: Optional[str]
+    level: Optional[str]
+    stream: Optional[str]
+    access: Optional[str]
+    payment_status: Optional[str]
+
+_SNAPSHOT_COLUMNS = (
+    User.id, User.telegram_id, User.full_name, User.level,
+    User.stream, User.access, User.payment_status
+)
+
+class UserSnapshotCache:
+    """LRU cache of UserSnapshot (or None for unknown users) with a TTL per entry"""
+
+    def __init__(self, maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL, session_factory=SessionLocal):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.session_factory = session_factory
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _lookup(self, telegram_id):
+        with self._lock:
+            entry = self._entries.get(telegram_id)
+            if entry is not None:
+                expires_at, snapshot = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(telegram_id)
+                    self.hits += 1
+                    return True, snapshot
+                del self._entries[telegram_id]
+            self.misses += 1
+            return False, None
+
+    def _store(self, telegram_id, snapshot):
+        with self._lock:
+            self._entries[telegram_id] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(telegram_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return snapshot
+
+    def _load(self, telegram_id):
+        db = self.session_factory()
+        try:
+            row = db.execute(select(*_SNAPSHOT_COLUMNS).filter(User.telegram_id == telegram_id)).first()
+        finally:
+            db.close()
+        return UserSnapshot(*row) if row else None
+
+    def get(self, telegram_id):
+        """Get the snapshot for a telegram user, loading it on a miss"""
+        found, snapshot = self._lookup(telegram_id)
+        if found:
+            return snapshot
+        return self._store(telegram_id, self._load(telegram_id))
+
+    async def get_async(self, telegram_id):
+        """Get the snapshot without blocking the event loop on a miss"""
+        found, snapshot = self._lookup(telegram_id)
+        if found:
+            return snapshot
+        return self._store(telegram_id, await asyncio.to_thread(self._load, telegram_id))
+
+    def invalidate(self, telegram_id):
+        """Forget one user; call after their level, stream, access or payment changes"""
+        with self._lock:
+            self._entries.pop(telegram_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+user_cache = UserSnapshotCache()
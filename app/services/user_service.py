@@ -1,5 +1,9 @@
+import asyncio
+from sqlalchemy import select
 from app.database.session import SessionLocal
+from app.database.async_session import AsyncSessionLocal
 from app.models.user import User
+from app.services.user_cache import user_cache
 
 def get_or_create_user(tg_user):
     db = SessionLocal()
@@ -15,6 +19,31 @@ def get_or_create_user(tg_user):
         db.add(user)
         db.commit()
         db.refresh(user)
+        user_cache.invalidate(tg_user.id)
+    elif user.is_blocked:
+        # They talk to the bot again, so broadcasts can reach them
+        user.is_blocked = False
+        db.commit()
+        db.refresh(user)
+
+    db.close()
+    return user
 
+async def get_user_by_telegram_id_async(telegram_id):
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User).filter_by(telegram_id=telegram_id))
+        return result.scalars().first()
+
+async def get_or_create_user_async(tg_user):
+    user = await get_user_by_telegram_id_async(tg_user.id)
+    if user is None or user.is_blocked:
+        # Needs a write, which async code makes through SessionLocal in a worker thread
+        return await asyncio.to_thread(get_or_create_user, tg_user)
+    return user
+
+def set_referral_code(user_id, referral_code):
+    """Store a newly generated referral code"""
+    db = SessionLocal()
+    db.query(User).filter_by(id=user_id).update({"referral_code": referral_code})
+    db.commit()
     db.close()
-    return user
\ No newline at end of file
@@ -1,5 +1,4 @@
-from app.database.session import SessionLocal
-from app.models.user import User
+from app.services.user_cache import user_cache
 from app.keyboards.payment_keyboard import payment_keyboard
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 
@@ -26,9 +25,7 @@ async def enforce_payment_access(update, context):
     query = update.callback_query
     user_id = query.from_user.id
     
-    db = SessionLocal()
-    user = db.query(User).filter_by(telegram_id=user_id).first()
-    db.close()
+    user = await user_cache.get_async(user_id)
     
     has_access, status = check_user_payment_access(user)
     
@@ -1,7 +1,160 @@
 import time
 import asyncio
+import logging
+from collections import deque
+from typing import NamedTuple, Callable
+from app.config.settings import TIMER_WHEEL_TICK, TIMER_WHEEL_SLOTS
+
+logger = logging.getLogger(__name__)
 
 async def exam_timer(duration_sec, callback, *args):
     """Run a countdown timer asynchronously. Calls callback after time is up."""
     await asyncio.sleep(duration_sec)
-    await callback(*args)
\ No newline at end of file
+    await callback(*args)
+
+class _Timer(NamedTuple):
+    deadline: float
+    target_tick: int
+    callback: Callable
+    args: tuple
+
+class TimerWheel:
+    """Hashed timer wheel: O(1) schedule and cancel, expired timers fired in one batch per tick
+
+    One background task drives every countdown instead of one sleeping task
+    per question per user. Timers are keyed (e.g. by (user_id, question
+    index)); scheduling under a key replaces the timer already there.
+    """
+
+    def __init__(self, tick=TIMER_WHEEL_TICK, slots=TIMER_WHEEL_SLOTS):
+        self.tick = tick
+        self._slots = [{} for _ in range(slots)]
+        self._slot_of = {}  # key -> slot index
+        self._origin = time.monotonic()
+        self._tick_count = 0  # ticks already processed
+        self._task = None
+        self.scheduled = 0
+        self.cancelled = 0
+        self.fired = 0
+        self.batches = 0
+        self.max_batch = 0
+        self.max_lag = 0.0
+        self._lags = deque(maxlen=1024)
+
+    def _current_tick(self):
+        return int((time.monotonic() - self._origin) / self.tick)
+
+    def schedule(self, key, delay, callback, *args):
+        """Fire callback(*args) in about delay seconds, replacing any timer under key"""
+        self._ensure_started()
+        self._remove(key)
+        deadline = time.monotonic() + delay
+        # Round up so a timer never fires early; at least one tick out
+        target = max(self._tick_count + 1, -int(-(deadline - self._origin) // self.tick))
+        slot = target % len(self._slots)
+        self._slots[slot][key] = _Timer(deadline, target, callback, args)
+        self._slot_of[key] = slot
+        self.scheduled += 1
+
+    def cancel(self, key):
+        """Cancel the timer under key; returns False if none was pending"""
+        if self._remove(key):
+            self.cancelled += 1
+            return True
+        return False
+
+    def _remove(self, key):
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return False
+        del self._slots[slot][key]
+        return True
+
+    def pending(self):
+        return len(self._slot_of)
+
+    def advance(self, until_tick=None):
+        """Collect the timers due up to until_tick (now by default) and record their lag"""
+        until_tick = self._current_tick() if until_tick is None else until_tick
+        # A full revolution visits every slot; more ticks than that add nothing
+        first = max(self._tick_count + 1, until_tick - len(self._slots) + 1)
+        due = []
+        for tick in range(first, until_tick + 1):
+            slot = self._slots[tick % len(self._slots)]
+            if not slot:
+                continue
+            for key, timer in list(slot.items()):
+                if timer.target_tick <= until_tick:
+                    del slot[key]
+                    del self._slot_of[key]
+                    due.append(timer)
+        self._tick_count = max(self._tick_count, until_tick)
+
+        now = time.monotonic()
+        for timer in due:
+            lag = now - timer.deadline
+            self._lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+        return due
+
+    async def _fire(self, timer):
+        try:
+            await timer.callback(*timer.args)
+        except Exception as e:
+            logger.error(f"Timer callback {getattr(timer.callback, '__name__', timer.callback)} failed: {e}")
+
+    async def _deliver(self, due):
+        self.fired += len(due)
+        self.batches += 1
+        self.max_batch = max(self.max_batch, len(due))
+        await asyncio.gather(*(self._fire(timer) for timer in due))
+
+    def _ensure_started(self):
+        if self._task is not None and not self._task.done():
+            return True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        self._task = loop.create_task(self._run())
+        return True
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            next_tick_at = self._origin + (self._tick_count + 1) * self.tick
+            await asyncio.sleep(max(0.0, next_tick_at - time.monotonic()))
+            due = self.advance()
+            if due:
+                # Deliver in the background so slow sends never delay the next tick
+                loop.create_task(self._deliver(due))
+
+    async def start(self):
+        """Start driving the wheel on the running loop"""
+        self._ensure_started()
+
+    async def stop(self):
+        """Stop the wheel; pending timers are dropped"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self):
+        lags = sorted(self._lags)
+        return {
+            "pending": len(self._slot_of),
+            "scheduled": self.scheduled,
+            "cancelled": self.cancelled,
+            "fired": self.fired,
+            "batches": self.batches,
+            "max_batch": self.max_batch,
+            "lag_p50_ms": round(lags[len(lags) // 2] * 1000, 1) if lags else 0.0,
+            "lag_p99_ms": round(lags[int(len(lags) * 0.99)] * 1000, 1) if lags else 0.0,
+            "lag_max_ms": round(self.max_lag * 1000, 1)
+        }
+
+timer_wheel = TimerWheel()
@@ -0,0 +1,11 @@
+"""
+Benchmarks for the Smart Test Exam bot
+Run individual benchmarks from the project root, e.g.:
+
+    python -m benchmarks.bench_answer_inserts
+
+or the service-layer suite, checked against benchmarks/baseline.json:
+
+    python -m benchmarks.suite run --output bench.json
+    python -m benchmarks.suite compare bench.json
+"""
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent Answer insert throughput per engine profile
+
+Every writer thread mimics the poll-answer handlers (open a session, insert
+one Answer, commit, close) while reader threads run the leaderboard-style
+result lookups. The same workload is run against the legacy bare engine and
+the tuned WAL profile on a fresh temporary database.
+
+    python -m benchmarks.bench_answer_inserts --writers 8 --readers 4 --inserts 250
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from app.database.base import Base
+from app.database.engine import build_engine, PROFILE_LEGACY, PROFILE_WAL
+from app.models import Answer, Result
+
+def run_profile(profile, writers, readers, inserts_per_writer):
+    """Run the mixed workload against a fresh database and return stats"""
+    tmp_dir = tempfile.mkdtemp(prefix="bench_answers_")
+    db_path = os.path.join(tmp_dir, "bench.db")
+    engine = build_engine(f"sqlite:///{db_path}", profile)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    stop_readers = threading.Event()
+    lock_errors = [0]
+    reads = [0]
+    counter_lock = threading.Lock()
+
+    def writer(worker_id):
+        latencies = []
+        for i in range(inserts_per_writer):
+            started = time.perf_counter()
+            db = Session()
+            try:
+                db.add(Answer(
+                    user_id=worker_id,
+                    exam_id=1,
+                    question_id=i,
+                    selected_option="A",
+                    is_correct=(i % 2 == 0)
+                ))
+                db.commit()
+            except OperationalError:
+                db.rollback()
+                with counter_lock:
+                    lock_errors[0] += 1
+            finally:
+                db.close()
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    def reader(worker_id):
+        while not stop_readers.is_set():
+            db = Session()
+            try:
+                db.query(Result).filter_by(user_id=worker_id).all()
+                db.query(Answer).filter_by(user_id=worker_id).count()
+                with counter_lock:
+                    reads[0] += 1
+            except OperationalError:
+                with counter_lock:
+                    lock_errors[0] += 1
+            finally:
+                db.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=writers + readers) as pool:
+        reader_futures = [pool.submit(reader, r) for r in range(readers)]
+        writer_futures = [pool.submit(writer, w) for w in range(writers)]
+        latencies = []
+        for future in writer_futures:
+            latencies.extend(future.result())
+        elapsed = time.perf_counter() - started
+        stop_readers.set()
+        for future in reader_futures:
+            future.result()
+
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    os.rmdir(tmp_dir)
+
+    latencies.sort()
+    total = writers * inserts_per_writer
+    return {
+        "profile": profile,
+        "inserts": total,
+        "seconds": elapsed,
+        "inserts_per_sec": total / elapsed if elapsed else 0,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "reads": reads[0],
+        "lock_errors": lock_errors[0]
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent Answer insert benchmark")
+    parser.add_argument("--writers", type=int, default=8, help="Concurrent writer threads")
+    parser.add_argument("--readers", type=int, default=4, help="Concurrent reader threads")
+    parser.add_argument("--inserts", type=int, default=250, help="Inserts per writer thread")
+    args = parser.parse_args()
+
+    print(f"📊 Answer insert benchmark: {args.writers} writers x {args.inserts} inserts, {args.readers} readers\n")
+    print(f"{'profile':<8} {'inserts/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'reads':>8} {'locked':>7}")
+
+    for profile in (PROFILE_LEGACY, PROFILE_WAL):
+        stats = run_profile(profile, args.writers, args.readers, args.inserts)
+        print(
+            f"{stats['profile']:<8} {stats['inserts_per_sec']:>10.1f} {stats['p50_ms']:>8.2f} "
+            f"{stats['p99_ms']:>8.2f} {stats['reads']:>8} {stats['lock_errors']:>7}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark: callback query routing cost per update
+
+Builds PTB's old first-match chain (one CallbackQueryHandler per route, in
+registration order, with the menu catch-all last) and the CallbackRouter from
+the same route table, checks both pick the same callback for every legacy
+callback_data the keyboards can send, and times the routing of each. The
+codec rows time the router on compact data, decode included, against the
+chain plus the replace()/int() parse the handlers used to do.
+
+    python -m benchmarks.bench_callback_router --updates 20000
+"""
+
+import argparse
+import glob
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telegram import Update, CallbackQuery, User
+from telegram.ext import CallbackQueryHandler
+from app.bot.callback_router import collect_callback_data
+from app.bot.callback_codec import callback_codec, MARKER
+from app.bot.dispatcher_fixed import build_callback_router
+
+def build_chain(router):
+    """The handler list register_handlers used to add, one regex per route"""
+    chain, seen = [], set()
+    for route in router.routes:
+        if route.key.startswith(MARKER):
+            continue
+        # Alternation patterns expand to several routes but were one handler
+        if (route.pattern, route.callback) in seen:
+            continue
+        seen.add((route.pattern, route.callback))
+        chain.append(CallbackQueryHandler(route.callback, pattern=route.pattern))
+    chain.append(CallbackQueryHandler(router.default))
+    return chain
+
+def chain_resolve(chain, update):
+    for handler in chain:
+        if handler.check_update(update):
+            return handler.callback
+    return None
+
+def router_resolve(router, update):
+    route = router.resolve(update.callback_query.data)
+    return route.callback if route is not None else router.default
+
+def chain_parse(chain, update):
+    """Old path: first-match chain, then the handler strips the prefix and parses"""
+    callback = chain_resolve(chain, update)
+    data = update.callback_query.data
+    return callback, int(data.split("_")[-1])
+
+def router_match(router, update):
+    """New path: one lookup that also decodes the typed args"""
+    return router.match(update.callback_query.data)
+
+def legacy_data(spec, value):
+    return f"{spec.legacy_prefix}{value}"
+
+def make_update(update_id, data):
+    user = User(1, "Student", False)
+    return Update(update_id, callback_query=CallbackQuery(str(update_id), user, "bench", data=data))
+
+def time_per_update(func, updates):
+    started = time.perf_counter()
+    for update in updates:
+        func(update)
+    return (time.perf_counter() - started) / len(updates) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Callback query routing benchmark")
+    parser.add_argument("--updates", type=int, default=20000, help="Updates routed per strategy")
+    args = parser.parse_args()
+
+    root = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app")
+    sources = glob.glob(os.path.join(root, "handlers", "*.py")) + glob.glob(os.path.join(root, "keyboards", "*.py"))
+    samples = sorted(collect_callback_data(sources))
+
+    router = build_callback_router()
+    chain = build_chain(router)
+
+    mismatches = []
+    for i, data in enumerate(samples):
+        update = make_update(i, data)
+        if chain_resolve(chain, update) is not router_resolve(router, update):
+            mismatches.append(data)
+
+    rng = random.Random(42)
+    updates = [make_update(i, rng.choice(samples)) for i in range(args.updates)]
+
+    print(f"🔀 Callback routing: {len(router.routes)} routes, {len(chain)} handlers, "
+          f"{len(samples)} distinct callback_data, {args.updates} updates")
+    print(f"   same callback for every sample: {'yes' if not mismatches else 'NO ' + ', '.join(mismatches)}\n")
+
+    chain_us = time_per_update(lambda update: chain_resolve(chain, update), updates)
+    router_us = time_per_update(lambda update: router_resolve(router, update), updates)
+    print(f"{'strategy':<22} {'µs/update':>10}")
+    print(f"{'first-match chain':<22} {chain_us:>10.2f}")
+    print(f"{'dict + prefix trie':<22} {router_us:>10.2f}")
+    print(f"\nspeedup: {chain_us / router_us:.1f}x")
+
+    # Large ids on the int routes, as legacy strings and as codec data
+    int_specs = [spec for spec in callback_codec.specs.values() if spec.types == (int,)]
+    ids = [rng.randrange(10 ** 12) for _ in range(args.updates)]
+    legacy = [make_update(i, legacy_data(int_specs[i % len(int_specs)], ids[i])) for i in range(args.updates)]
+    compact = [make_update(i, callback_codec.encode(int_specs[i % len(int_specs)], ids[i])) for i in range(args.updates)]
+    for old, new in zip(legacy[:len(int_specs)], compact):
+        old_match, new_match = router_match(router, old), router_match(router, new)
+        assert (old_match.route.callback, old_match.args) == (new_match.route.callback, new_match.args)
+
+    legacy_bytes = sum(len(u.callback_query.data) for u in legacy) / len(legacy)
+    compact_bytes = sum(len(u.callback_query.data) for u in compact) / len(compact)
+    parse_us = time_per_update(lambda update: chain_parse(chain, update), legacy)
+    decode_us = time_per_update(lambda update: router_match(router, update), compact)
+    print(f"\n{'id routes + args':<22} {'µs/update':>10} {'avg bytes':>10}")
+    print(f"{'chain + string parse':<22} {parse_us:>10.2f} {legacy_bytes:>10.1f}")
+    print(f"{'router + codec decode':<22} {decode_us:>10.2f} {compact_bytes:>10.1f}")
+
+if __name__ == "__main__":
+    main()
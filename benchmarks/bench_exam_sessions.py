@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory held by concurrent exam sessions
+
+Builds the user_data of many users in the middle of an exam three ways and
+reports what tracemalloc sees them hold:
+
+- orm: detached Question instances per user, as start_exam_selected used to
+  store them
+- snapshots: lists of shared QuestionSnapshot tuples from the question bank
+- session: one ExamSession with an array('i') of question ids
+
+    python -m benchmarks.bench_exam_sessions --sessions 10000 --length 50
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TMP_DIR = tempfile.mkdtemp(prefix="bench_exam_sessions_")
+DB_PATH = os.path.join(TMP_DIR, "bench.db")
+# The question bank binds its session to DATABASE_URL at import time
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from sqlalchemy import insert, select
+from app.database.session import engine, SessionLocal
+from app.database.migrations import run_migrations
+from app.models import Course, Exam, Question
+from app.services.question_bank import question_bank
+from app.services.exam_session import ExamSession
+
+def seed(questions):
+    run_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Course.__table__), [{"id": 1, "name": "Biology"}])
+        conn.execute(insert(Exam.__table__), [{"id": 1, "name": "Biology Final", "course_id": 1}])
+        conn.execute(insert(Question.__table__), [
+            {
+                "exam_id": 1, "text": f"Question {i}: which organelle produces most of the cell's ATP?",
+                "option_a": "Mitochondria", "option_b": "Ribosome", "option_c": "Nucleus", "option_d": "Golgi body",
+                "correct_answer": "ABCD"[i % 4]
+            }
+            for i in range(questions)
+        ])
+    question_bank.load()
+
+def orm_sessions(count, length, rng, pool):
+    db = SessionLocal()
+    sessions = {}
+    for user_id in range(count):
+        ids = rng.sample(pool, length)
+        # A session per user, closed afterwards: the instances end up detached
+        questions = db.scalars(select(Question).where(Question.id.in_(ids))).all()
+        db.close()
+        sessions[user_id] = {
+            "user_id": user_id, "chat_id": user_id, "exam_id": 1, "questions": questions, "index": 0,
+            "use_timer": True, "current_poll_id": str(rng.randrange(10 ** 18)),
+            "tally": {"answered": 0, "correct": 0, "started_at": datetime.utcnow()}
+        }
+    return sessions
+
+def snapshot_sessions(count, length, rng, pool):
+    bank = question_bank.get_exam_questions(1)
+    return {
+        user_id: {
+            "user_id": user_id, "chat_id": user_id, "exam_id": 1, "questions": rng.sample(bank, length), "index": 0,
+            "use_timer": True, "current_poll_id": str(rng.randrange(10 ** 18)),
+            "tally": {"answered": 0, "correct": 0, "started_at": datetime.utcnow()}
+        }
+        for user_id in range(count)
+    }
+
+def exam_sessions(count, length, rng, pool):
+    bank = question_bank.get_exam_questions(1)
+    sessions = {}
+    for user_id in range(count):
+        session = ExamSession(user_id, user_id, rng.sample(bank, length), exam_id=1, use_timer=True)
+        session.poll_id = str(rng.randrange(10 ** 18))
+        sessions[user_id] = {"session": session}
+    return sessions
+
+def held_bytes(build, *args):
+    """Bytes still allocated once build() returns, i.e. what the sessions keep alive"""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    sessions = build(*args)
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del sessions
+    return held
+
+def main():
+    parser = argparse.ArgumentParser(description="Exam session memory benchmark")
+    parser.add_argument("--sessions", type=int, default=10000, help="Users with an exam in progress")
+    parser.add_argument("--length", type=int, default=50, help="Questions per exam")
+    parser.add_argument("--questions", type=int, default=1000, help="Questions in the bank")
+    args = parser.parse_args()
+
+    seed(max(args.questions, args.length))
+    pool = list(range(1, max(args.questions, args.length) + 1))
+    print(f"🧠 Exam session memory: {args.sessions} sessions x {args.length} questions\n")
+    print(f"{'layout':<12} {'MiB held':>10} {'bytes/session':>14}")
+    for name, build in (("orm", orm_sessions), ("snapshots", snapshot_sessions), ("session", exam_sessions)):
+        held = held_bytes(build, args.sessions, args.length, random.Random(1), pool)
+        print(f"{name:<12} {held / 2 ** 20:>10.1f} {held / args.sessions:>14.0f}")
+
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+    os.rmdir(TMP_DIR)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Benchmark: exporting exam results
+
+Seeds a throwaway database with users, exams and results, then runs each
+export strategy and reports its wall time and rows/s, the peak memory
+tracemalloc sees during a second run, the SQL statements it issues and the
+size of what it writes:
+
+- legacy csv: every Result loaded with its relationships, one Course query
+  per row, a list of dicts and one StringIO string (the old export)
+- stream csv: one joined query read in yield_per batches, rows written
+  straight to a file
+- legacy xlsx: the same materialized list written cell by cell into a
+  regular openpyxl Workbook
+- stream xlsx: the streaming query appended to a write_only Workbook,
+  split across sheets every --rows-per-sheet rows
+
+    python -m benchmarks.bench_export --results 20000
+"""
+
+import argparse
+import csv
+import gc
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import openpyxl
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TMP_DIR = tempfile.mkdtemp(prefix="bench_export_")
+DB_PATH = os.path.join(TMP_DIR, "bench.db")
+OUT_PATH = os.path.join(TMP_DIR, "export")
+# SessionLocal binds to DATABASE_URL at import time
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from sqlalchemy import event, insert
+from app.database.session import engine, SessionLocal
+from app.database.migrations import run_migrations
+from app.models import Course, Exam, Result, User
+from app.services.result_services import export_results_csv, export_results_excel, EXCEL_SHEET_ROWS
+
+def seed(results, users, exams):
+    run_migrations(engine)
+    rng = random.Random(1)
+    started = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Course.__table__), [{"id": i, "name": f"Course {i}"} for i in range(1, 11)])
+        conn.execute(insert(Exam.__table__), [
+            {"id": i, "name": f"Exam {i}", "course_id": 1 + i % 10, "total_questions": 50} for i in range(1, exams + 1)
+        ])
+        conn.execute(insert(User.__table__), [
+            {"id": i, "telegram_id": 100000 + i, "full_name": f"User {i}", "username": f"user{i}"}
+            for i in range(1, users + 1)
+        ])
+        for start in range(0, results, 10000):
+            conn.execute(insert(Result.__table__), [
+                {
+                    "user_id": rng.randint(1, users), "exam_id": rng.randint(1, exams), "score": score,
+                    "percentage": score * 2.0, "completed_at": started + timedelta(minutes=i)
+                }
+                for i in range(start, min(results, start + 10000))
+                for score in (rng.randint(0, 50),)
+            ])
+
+def legacy_results():
+    """get_all_results as it was: ORM rows and a Course query each"""
+    db = SessionLocal()
+    results = db.query(Result).join(User).join(Exam).all()
+    detailed_results = []
+    for r in results:
+        course = db.query(Course).filter_by(id=r.exam.course_id).first() if r.exam else None
+        detailed_results.append({
+            "user_id": r.user.id,
+            "username": r.user.username,
+            "telegram_id": r.user.telegram_id,
+            "course_name": course.name if course else "Unknown",
+            "exam_name": r.exam.name,
+            "score": r.score,
+            "percentage": r.percentage,
+            "completed_at": r.completed_at.strftime("%Y-%m-%d %H:%M:%S") if r.completed_at else None,
+            "status": "Passed" if r.percentage >= 70 else "Failed"
+        })
+    db.close()
+    return detailed_results
+
+def legacy_csv(path):
+    """The CSV export as it was: one big string"""
+    detailed_results = legacy_results()
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=detailed_results[0].keys())
+    writer.writeheader()
+    writer.writerows(detailed_results)
+    data = output.getvalue()
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        f.write(data)
+    return len(detailed_results)
+
+def legacy_excel(path):
+    """The Excel export as it was: a regular Workbook filled cell by cell"""
+    results = legacy_results()
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Exam Results"
+    headers = list(results[0].keys())
+    for col_num, header in enumerate(headers, 1):
+        ws.cell(row=1, column=col_num, value=header)
+    for row_num, result in enumerate(results, 2):
+        for col_num, key in enumerate(headers, 1):
+            ws.cell(row=row_num, column=col_num, value=result[key])
+    output = io.BytesIO()
+    wb.save(output)
+    with open(path, "wb") as f:
+        f.write(output.getvalue())
+    return len(results)
+
+STRATEGIES = [
+    ("legacy csv", legacy_csv),
+    ("stream csv", export_results_csv),
+    ("legacy xlsx", legacy_excel),
+    ("stream xlsx", export_results_excel),
+]
+
+def measure(export):
+    """(rows, seconds, peak MiB, SQL statements, output MiB); tracemalloc slows code down, so time is a separate run"""
+    gc.collect()
+    started = time.perf_counter()
+    rows = export(OUT_PATH)
+    elapsed = time.perf_counter() - started
+    size = os.path.getsize(OUT_PATH)
+    os.remove(OUT_PATH)
+
+    queries = []
+    listener = lambda *args: queries.append(1)
+    event.listen(engine, "before_cursor_execute", listener)
+    gc.collect()
+    tracemalloc.start()
+    export(OUT_PATH)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    event.remove(engine, "before_cursor_execute", listener)
+    os.remove(OUT_PATH)
+    return rows, elapsed, peak / 2 ** 20, len(queries), size / 2 ** 20
+
+def main():
+    parser = argparse.ArgumentParser(description="Results export benchmark")
+    parser.add_argument("--results", type=int, default=20000, help="Results in the database")
+    parser.add_argument("--users", type=int, default=5000, help="Users the results belong to")
+    parser.add_argument("--exams", type=int, default=100, help="Exams the results belong to")
+    parser.add_argument("--rows-per-sheet", type=int, default=EXCEL_SHEET_ROWS, help="Rows per worksheet in stream xlsx")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only run the streaming strategies")
+    args = parser.parse_args()
+    strategies = dict(STRATEGIES)
+    strategies["stream xlsx"] = lambda path: export_results_excel(path, rows_per_sheet=args.rows_per_sheet)
+
+    seed(args.results, args.users, args.exams)
+    print(f"📤 Export benchmark: {args.results} results, {args.users} users, {args.exams} exams\n")
+    print(f"{'strategy':<14} {'rows':>9} {'seconds':>8} {'rows/s':>9} {'peak MiB':>9} {'queries':>8} {'file MiB':>9}")
+    for name, export in strategies.items():
+        if args.skip_legacy and name.startswith("legacy"):
+            continue
+        rows, elapsed, peak, queries, size = measure(export)
+        print(f"{name:<14} {rows:>9} {elapsed:>8.2f} {rows / elapsed:>9.0f} {peak:>9.1f} {queries:>8} {size:>9.1f}")
+
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+    os.rmdir(TMP_DIR)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: keyboard render time and allocations, built vs cached
+
+Seeds a temporary catalog, then renders every menu keyboard both through its
+builder (what each tap used to cost) and through keyboard_cache. Memory is
+the tracemalloc peak above the baseline during one render, i.e. what a render
+allocates before it can be freed.
+
+    python -m benchmarks.bench_keyboards --courses 20 --exams 10
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TMP_DIR = tempfile.mkdtemp(prefix="bench_keyboards_")
+DB_PATH = os.path.join(TMP_DIR, "bench.db")
+# The keyboards bind their sessions to DATABASE_URL at import time
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from sqlalchemy import insert
+from app.database.session import engine
+from app.database.migrations import run_migrations
+from app.models import Course, Exam
+from app.keyboards.keyboard_cache import keyboard_cache
+from app.keyboards.main_menu import main_menu, _build_main_menu
+from app.keyboards.course_keyboard import course_keyboard, _build_course_keyboard
+from app.keyboards.exam_keyboard import exam_selection_keyboard, _build_exam_selection_keyboard
+from app.keyboards.stream_course_keyboard import get_stream_courses_keyboard, _build_stream_courses_keyboard
+from app.keyboards.stream_menu_keyboard import (
+    get_natural_science_dashboard_keyboard,
+    _build_natural_science_dashboard_keyboard,
+)
+
+def seed(courses, exams):
+    run_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Course.__table__), [
+            {"id": i, "name": f"Course {i}"} for i in range(1, courses + 1)
+        ])
+        conn.execute(insert(Exam.__table__), [
+            {"course_id": c, "name": f"Course {c} Chapter {e}", "total_questions": 10}
+            for c in range(1, courses + 1) for e in range(1, exams + 1)
+        ])
+
+def time_us(func, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - started) / repeats * 1e6
+
+def peak_bytes(func):
+    func()  # warm caches and imports
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak - baseline
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyboard cache benchmark")
+    parser.add_argument("--courses", type=int, default=20, help="Courses to seed")
+    parser.add_argument("--exams", type=int, default=10, help="Exams per course")
+    parser.add_argument("--repeats", type=int, default=2000, help="Renders timed per keyboard")
+    args = parser.parse_args()
+    seed(args.courses, args.exams)
+
+    cases = [
+        ("main_menu", lambda: _build_main_menu(False), lambda: main_menu(1)),
+        ("ns dashboard", lambda: _build_natural_science_dashboard_keyboard(False),
+         lambda: get_natural_science_dashboard_keyboard(1)),
+        ("stream courses", lambda: _build_stream_courses_keyboard("natural_science", None),
+         lambda: get_stream_courses_keyboard("natural_science")),
+        ("course_keyboard", _build_course_keyboard, course_keyboard),
+        ("exam selection", lambda: _build_exam_selection_keyboard(1), lambda: exam_selection_keyboard(1)),
+    ]
+
+    print(f"⌨️ Keyboard benchmark: {args.courses} courses x {args.exams} exams, {args.repeats} renders\n")
+    print(f"{'keyboard':<16} {'built µs':>10} {'cached µs':>10} {'built KiB':>10} {'cached KiB':>11}")
+    for name, build, cached in cases:
+        built_us = time_us(build, max(1, args.repeats // 10))
+        cached_us = time_us(cached, args.repeats)
+        print(f"{name:<16} {built_us:>10.1f} {cached_us:>10.2f} "
+              f"{peak_bytes(build) / 1024:>10.1f} {peak_bytes(cached) / 1024:>11.2f}")
+    print(f"\n   cache: {keyboard_cache.stats()}")
+
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+    os.rmdir(TMP_DIR)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: leaderboard view latency on a large results table
+
+Seeds a temporary database with many users and results, backfills the
+user_score_stats rollup and times every leaderboard view through the rollup
+and through the single window-function query over results. --legacy also
+times the old per-user loop (one Result query per user).
+
+    python -m benchmarks.bench_leaderboard --users 50000 --results 500000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TMP_DIR = tempfile.mkdtemp(prefix="bench_leaderboard_")
+DB_PATH = os.path.join(TMP_DIR, "bench.db")
+# The services bind their sessions to DATABASE_URL at import time
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from sqlalchemy import insert
+from app.database.session import SessionLocal, engine
+from app.database.migrations import run_migrations
+from app.models import User, Result
+from app.services.leaderboard_service import (
+    get_leaderboard,
+    get_leaderboard_from_results,
+    backfill_user_score_stats,
+)
+
+VIEWS = [
+    ("show_leaderboard", "best"),
+    ("show_leaderboard_best", "best"),
+    ("show_leaderboard_latest", "latest"),
+    ("show_leaderboard_average", "average"),
+]
+
+def seed(users, results, chunk=50000):
+    """Insert users and results with executemany in chunks"""
+    run_migrations(engine)
+    started = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__), [
+            {"id": i, "telegram_id": 1000000 + i, "full_name": f"Student {i}"}
+            for i in range(1, users + 1)
+        ])
+    rng = random.Random(42)
+    for offset in range(0, results, chunk):
+        rows = []
+        for i in range(offset, min(results, offset + chunk)):
+            score = rng.randint(0, 20)
+            rows.append({
+                "user_id": rng.randint(1, users),
+                "exam_id": rng.randint(1, 50),
+                "score": score,
+                "percentage": score * 5.0,
+                "completed_at": started + timedelta(seconds=i * 7)
+            })
+        with engine.begin() as conn:
+            conn.execute(insert(Result.__table__), rows)
+
+def legacy_best(limit=10):
+    """The pre-rollup view: every user, one Result query each"""
+    db = SessionLocal()
+    data = []
+    for user in db.query(User).all():
+        scores = [r.score for r in db.query(Result).filter_by(user_id=user.id).all() if r.score is not None]
+        if scores:
+            data.append((max(scores), user.full_name))
+    db.close()
+    data.sort(reverse=True)
+    return data[:limit]
+
+def time_ms(func, repeats):
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description="Leaderboard view latency benchmark")
+    parser.add_argument("--users", type=int, default=50000, help="Users to seed")
+    parser.add_argument("--results", type=int, default=500000, help="Results to seed")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed calls per view (median reported)")
+    parser.add_argument("--legacy", action="store_true", help="Also time the old per-user loop once")
+    args = parser.parse_args()
+
+    print(f"📊 Leaderboard benchmark: {args.users} users, {args.results} results")
+    started = time.perf_counter()
+    seed(args.users, args.results)
+    print(f"   seeded in {time.perf_counter() - started:.1f}s")
+    started = time.perf_counter()
+    backfill_user_score_stats(engine)
+    print(f"   rollup backfilled in {time.perf_counter() - started:.1f}s\n")
+
+    print(f"{'view':<26} {'rollup ms':>10} {'results ms':>11}")
+    for view, metric in VIEWS:
+        rollup = time_ms(lambda: get_leaderboard(metric), args.repeats)
+        results = time_ms(lambda: get_leaderboard_from_results(metric), args.repeats)
+        print(f"{view:<26} {rollup:>10.2f} {results:>11.1f}")
+
+    if args.legacy:
+        print(f"\n{'legacy per-user loop':<26} {time_ms(legacy_best, 1):>10.0f} ms")
+
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+    os.rmdir(TMP_DIR)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark: picking k practice questions from banks of growing size
+
+Compares the old approach (load every row through the ORM, shuffle, slice)
+with the in-memory strategies: shuffling a copy of the cached bank and O(k)
+index sampling over the cached tuple.
+
+    python -m benchmarks.bench_question_sampling --sizes 100 1000 10000 100000 --k 10
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+from app.database.base import Base
+from app.database.engine import build_engine
+from app.models import Course, Exam, Question
+from app.services.question_bank import QuestionBank
+from app.services.question_sampling import sample
+
+def time_per_call(func, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - started) / repeats * 1e6
+
+def build_bank(size):
+    """Create a temporary database with one exam holding `size` questions"""
+    tmp_dir = tempfile.mkdtemp(prefix="bench_sampling_")
+    db_path = os.path.join(tmp_dir, "bench.db")
+    engine = build_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Course.__table__), [{"id": 1, "name": "Biology"}])
+        conn.execute(insert(Exam.__table__), [{"id": 1, "name": "Biology Bank", "course_id": 1}])
+        conn.execute(insert(Question.__table__), [
+            {
+                "exam_id": 1,
+                "text": f"Question {i}?",
+                "option_a": "A", "option_b": "B", "option_c": "C", "option_d": "D",
+                "correct_answer": "ABCD"[i % 4]
+            }
+            for i in range(size)
+        ])
+    return engine, db_path, tmp_dir
+
+def drop_bank(engine, db_path, tmp_dir):
+    engine.dispose()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    os.rmdir(tmp_dir)
+
+def run_size(size, k, repeats, with_db):
+    engine, db_path, tmp_dir = build_bank(size)
+    Session = sessionmaker(bind=engine)
+    bank = QuestionBank(Session)
+    questions = bank.get_exam_questions(1)
+
+    def orm_shuffle():
+        db = Session()
+        rows = db.query(Question).filter_by(exam_id=1).all()
+        db.close()
+        random.shuffle(rows)
+        return rows[:k]
+
+    def cached_shuffle():
+        rows = list(questions)
+        random.shuffle(rows)
+        return rows[:k]
+
+    stats = {
+        "size": size,
+        "orm_us": time_per_call(orm_shuffle, max(1, repeats // 100)) if with_db else None,
+        "shuffle_us": time_per_call(cached_shuffle, repeats),
+        "sample_us": time_per_call(lambda: sample(questions, k), repeats),
+    }
+    drop_bank(engine, db_path, tmp_dir)
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Question sampling benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000], help="Bank sizes")
+    parser.add_argument("--k", type=int, default=10, help="Questions picked per practice session")
+    parser.add_argument("--repeats", type=int, default=200, help="Calls timed per strategy")
+    parser.add_argument("--no-db", action="store_true", help="Skip the ORM load + shuffle baseline")
+    args = parser.parse_args()
+
+    print(f"📊 Question sampling benchmark: k={args.k}, µs per call\n")
+    print(f"{'bank':>8} {'orm+shuffle':>12} {'shuffle':>10} {'sample':>10}")
+
+    for size in args.sizes:
+        stats = run_size(size, args.k, args.repeats, not args.no_db)
+        orm = f"{stats['orm_us']:>12.1f}" if stats["orm_us"] is not None else f"{'-':>12}"
+        print(
+            f"{stats['size']:>8} {orm} {stats['shuffle_us']:>10.1f} "
+            f"{stats['sample_us']:>10.1f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark: outbound sends under Telegram's flood limits
+
+A fake bot enforces the Bot API limits (30 msg/s overall, a small burst per
+chat) and raises RetryAfter like Telegram does. A burst of notifications is
+sent, then exam messages (timeouts, next questions) arrive behind it. The
+old way, every send awaited directly, is compared with the send queue on
+messages lost to flood control and on how long exam messages wait.
+
+--scale multiplies every limit and rate so a run takes seconds.
+
+    python -m benchmarks.bench_send_queue --notifications 600 --chats 300 --exam 60 --scale 5
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from collections import defaultdict, deque
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from telegram.error import RetryAfter
+from app.bot.send_queue import SendQueue, EXAM, NOTIFICATION
+
+class FloodLimitedBot:
+    """Sliding one-second windows per bot and per chat, like the Bot API"""
+
+    def __init__(self, scale, latency=0.02):
+        self.global_limit = int(30 * scale)
+        self.chat_limit = int(3 * scale)  # short bursts to one chat are tolerated
+        self.retry_after = 1 / scale
+        self.latency = latency
+        self._global = deque()
+        self._chats = defaultdict(deque)
+        self.delivered = 0
+        self.flood_errors = 0
+
+    def _admit(self, window, limit, now):
+        while window and now - window[0] >= 1.0:
+            window.popleft()
+        return len(window) < limit
+
+    async def send_message(self, chat_id, text, **kwargs):
+        await asyncio.sleep(self.latency)
+        now = time.monotonic()
+        chat = self._chats[chat_id]
+        if not self._admit(self._global, self.global_limit, now) or not self._admit(chat, self.chat_limit, now):
+            self.flood_errors += 1
+            raise RetryAfter(self.retry_after)
+        self._global.append(now)
+        chat.append(now)
+        self.delivered += 1
+        return text
+
+def workload(notifications, chats, exam):
+    jobs = [(NOTIFICATION, 1000 + i % chats) for i in range(notifications)]
+    jobs += [(EXAM, 1 + i % max(1, exam // 2)) for i in range(exam)]
+    return jobs
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))] * 1000 if values else 0.0
+
+async def run_direct(jobs, scale):
+    bot = FloodLimitedBot(scale)
+    exam_latency = []
+
+    async def send(lane, chat_id):
+        started = time.monotonic()
+        try:
+            await bot.send_message(chat_id, "text")
+        except RetryAfter:
+            return
+        if lane == EXAM:
+            exam_latency.append(time.monotonic() - started)
+
+    started = time.monotonic()
+    await asyncio.gather(*(send(lane, chat_id) for lane, chat_id in jobs))
+    return bot, exam_latency, time.monotonic() - started, None
+
+async def run_queue(jobs, scale):
+    bot = FloodLimitedBot(scale)
+    queue = SendQueue(global_rate=25 * scale, global_burst=5 * scale, chat_rate=1 * scale, chat_burst=3, max_retries=10)
+    exam_latency = []
+
+    async def timed(future):
+        started = time.monotonic()
+        await future
+        exam_latency.append(time.monotonic() - started)
+
+    started = time.monotonic()
+    waits = []
+    for lane, chat_id in jobs:
+        future = queue.send_message(bot, chat_id, "text", lane=lane)
+        waits.append(timed(future) if lane == EXAM else future)
+    await asyncio.gather(*waits, return_exceptions=True)
+    elapsed = time.monotonic() - started
+    stats = queue.stats()
+    await queue.stop()
+    return bot, exam_latency, elapsed, stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Outbound send queue benchmark")
+    parser.add_argument("--notifications", type=int, default=600, help="Notifications queued first")
+    parser.add_argument("--chats", type=int, default=300, help="Chats the notifications go to")
+    parser.add_argument("--exam", type=int, default=60, help="Exam messages queued behind them")
+    parser.add_argument("--scale", type=float, default=5.0, help="Multiplier for every limit and rate")
+    args = parser.parse_args()
+    logging.getLogger("app.bot.send_queue").setLevel(logging.ERROR)  # one warning per retry
+
+    jobs = workload(args.notifications, args.chats, args.exam)
+    print(f"📨 Send queue benchmark: {args.notifications} notifications to {args.chats} chats, "
+          f"then {args.exam} exam messages, limits x{args.scale:g}\n")
+    print(f"{'strategy':<14} {'delivered':>9} {'lost':>6} {'429s':>6} {'seconds':>8} {'exam ok':>8} {'exam p50 ms':>12} {'exam p99 ms':>12}")
+    for name, run in (("direct", run_direct), ("send queue", run_queue)):
+        bot, exam_latency, elapsed, stats = asyncio.run(run(jobs, args.scale))
+        print(f"{name:<14} {bot.delivered:>9} {len(jobs) - bot.delivered:>6} {bot.flood_errors:>6} {elapsed:>8.2f} "
+              f"{len(exam_latency):>8} {percentile(exam_latency, 0.5):>12.1f} {percentile(exam_latency, 0.99):>12.1f}")
+    print(f"\n   queue: {stats}")
+
+if __name__ == "__main__":
+    main()
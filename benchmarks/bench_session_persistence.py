@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark: persistence overhead per answer
+
+Simulates many users in the middle of an exam. Each persistence run some of
+them answer a question (their session changes) and some only tap a menu
+(PTB still hands their user_data over). Every run does what PTB's
+update_persistence does: deepcopy each touched user_data, call
+update_user_data, then flush. SessionPersistence is compared with PTB's own
+PicklePersistence, which rewrites the whole file whenever a user changes.
+
+    python -m benchmarks.bench_session_persistence --sessions 2000 --runs 20
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from copy import deepcopy
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TMP_DIR = tempfile.mkdtemp(prefix="bench_sessions_")
+DB_PATH = os.path.join(TMP_DIR, "bench.db")
+PICKLE_PATH = os.path.join(TMP_DIR, "sessions.pickle")
+# The question bank binds its session to DATABASE_URL at import time
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from sqlalchemy import insert
+from telegram.ext import PicklePersistence, PersistenceInput
+from app.database.session import engine
+from app.database.migrations import run_migrations
+from app.models import Course, Exam, Question
+from app.services.question_bank import question_bank
+from app.services.exam_session import ExamSession
+from app.bot.persistence import SessionPersistence, encode_session
+
+def seed(questions):
+    run_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Course.__table__), [{"id": 1, "name": "Biology"}])
+        conn.execute(insert(Exam.__table__), [{"id": 1, "name": "Biology Final", "course_id": 1}])
+        conn.execute(insert(Question.__table__), [
+            {
+                "exam_id": 1, "text": f"Question {i} about cells and organisms?",
+                "option_a": "Mitochondria", "option_b": "Ribosome", "option_c": "Nucleus", "option_d": "Golgi body",
+                "correct_answer": "ABCD"[i % 4]
+            }
+            for i in range(questions)
+        ])
+    question_bank.load()
+
+def make_sessions(count, length, rng):
+    bank = question_bank.get_exam_questions(1)
+    sessions = {}
+    for i in range(count):
+        session = ExamSession(1000000 + i, 1000000 + i, rng.sample(bank, length), exam_id=1, use_timer=True)
+        session.poll_id = str(rng.randrange(10 ** 18))
+        session.start_countdown(30)
+        sessions[1000000 + i] = {"session": session}
+    return sessions
+
+async def run(persistence, sessions, runs, active, touched, rng):
+    """Drive persistence like Application.update_persistence; returns (seconds, answers)"""
+    user_ids = list(sessions)
+    answers = 0
+    elapsed = 0.0
+    for _ in range(runs):
+        answering = rng.sample(user_ids, int(len(user_ids) * active))
+        for user_id in answering:
+            session = sessions[user_id]["session"]
+            session.record(rng.random() < 0.5)
+            if session.finished:
+                session.restart()
+            session.poll_id = str(rng.randrange(10 ** 18))
+            session.start_countdown(30)
+        answers += len(answering)
+        dirty = set(answering) | set(rng.sample(user_ids, int(len(user_ids) * touched)))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            persistence.update_user_data(user_id, deepcopy(sessions[user_id])) for user_id in dirty
+        ))
+        await persistence.flush()
+        elapsed += time.perf_counter() - started
+    return elapsed, answers
+
+def main():
+    parser = argparse.ArgumentParser(description="Session persistence overhead benchmark")
+    parser.add_argument("--sessions", type=int, default=2000, help="Users with an exam in progress")
+    parser.add_argument("--length", type=int, default=50, help="Questions per exam")
+    parser.add_argument("--runs", type=int, default=20, help="Persistence runs")
+    parser.add_argument("--active", type=float, default=0.2, help="Share answering per run")
+    parser.add_argument("--touched", type=float, default=0.05, help="Share with an update but no change per run")
+    args = parser.parse_args()
+
+    seed(max(args.length * 4, 1000))
+    rng = random.Random(42)
+    print(f"💾 Session persistence: {args.sessions} sessions x {args.length} questions, {args.runs} runs, "
+          f"{args.active:.0%} answering + {args.touched:.0%} touched per run\n")
+    record = encode_session(make_sessions(1, args.length, rng)[1000000])
+    print(f"   compact record: {len(record)} bytes\n")
+
+    print(f"{'persistence':<22} {'µs/answer':>10} {'run ms':>8}")
+    sqlite_persistence = SessionPersistence(bind=engine)
+    elapsed, answers = asyncio.run(run(sqlite_persistence, make_sessions(args.sessions, args.length, random.Random(1)),
+                                       args.runs, args.active, args.touched, random.Random(2)))
+    print(f"{'SessionPersistence':<22} {elapsed / answers * 1e6:>10.1f} {elapsed / args.runs * 1000:>8.1f}")
+    print(f"   {sqlite_persistence.stats()}")
+
+    pickle_persistence = PicklePersistence(
+        PICKLE_PATH,
+        store_data=PersistenceInput(bot_data=False, chat_data=False, user_data=True, callback_data=False)
+    )
+    elapsed, answers = asyncio.run(run(pickle_persistence, make_sessions(args.sessions, args.length, random.Random(1)),
+                                       args.runs, args.active, args.touched, random.Random(2)))
+    print(f"{'PicklePersistence':<22} {elapsed / answers * 1e6:>10.1f} {elapsed / args.runs * 1000:>8.1f}")
+
+    engine.dispose()
+    for path in (DB_PATH, DB_PATH + "-wal", DB_PATH + "-shm", PICKLE_PATH):
+        if os.path.exists(path):
+            os.remove(path)
+    os.rmdir(TMP_DIR)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: thousands of concurrent question countdowns
+
+Starts one countdown per simulated session, answers a share of them before
+they expire (cancel), and lets the rest fire. Compares one sleeping task per
+countdown (the old create_task(poll_timer(...))) with the timer wheel on
+memory held while pending, schedule/cancel cost and firing lag.
+
+    python -m benchmarks.bench_timers --sessions 10000 --delay 2 --answered 0.5
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.utils.timer import TimerWheel
+
+def percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))] * 1000 if values else 0.0
+
+async def run_tasks(sessions, delay, answered):
+    lags = []
+
+    async def countdown(deadline):
+        await asyncio.sleep(deadline - time.monotonic())
+        lags.append(time.monotonic() - deadline)
+
+    def setup():
+        tasks = {}
+        for session in range(sessions):
+            tasks[(session, 0)] = asyncio.create_task(countdown(time.monotonic() + delay))
+        for session in range(int(sessions * answered)):
+            tasks.pop((session, 0)).cancel()
+        return tasks
+
+    # Timed untraced, then memory measured on a second, traced round
+    started = time.perf_counter()
+    for task in setup().values():
+        task.cancel()
+    setup_us = (time.perf_counter() - started) / sessions * 1e6
+    await asyncio.sleep(0)
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    tasks = setup()
+    pending_kib = (tracemalloc.get_traced_memory()[0] - baseline) / 1024
+    tracemalloc.stop()
+
+    await asyncio.gather(*tasks.values())
+    return setup_us, pending_kib, lags
+
+async def run_wheel(sessions, delay, answered, tick):
+    wheel = TimerWheel(tick=tick)
+    lags = []
+    done = asyncio.Event()
+    expected = sessions - int(sessions * answered)
+
+    async def timeout(deadline):
+        lags.append(time.monotonic() - deadline)
+        if len(lags) == expected:
+            done.set()
+
+    def setup():
+        for session in range(sessions):
+            wheel.schedule((session, 0), delay, timeout, time.monotonic() + delay)
+        for session in range(int(sessions * answered)):
+            wheel.cancel((session, 0))
+
+    # Timed untraced, then memory measured on a second, traced round
+    started = time.perf_counter()
+    setup()
+    setup_us = (time.perf_counter() - started) / sessions * 1e6
+    for session in range(sessions):
+        wheel.cancel((session, 0))
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    setup()
+    pending_kib = (tracemalloc.get_traced_memory()[0] - baseline) / 1024
+    tracemalloc.stop()
+
+    if expected:
+        await done.wait()
+    stats = wheel.stats()
+    await wheel.stop()
+    return setup_us, pending_kib, lags, stats
+
+def main():
+    parser = argparse.ArgumentParser(description="Question countdown benchmark")
+    parser.add_argument("--sessions", type=int, default=10000, help="Concurrent countdowns")
+    parser.add_argument("--delay", type=float, default=2.0, help="Countdown length in seconds")
+    parser.add_argument("--answered", type=float, default=0.5, help="Share cancelled by an answer")
+    parser.add_argument("--tick", type=float, default=0.1, help="Wheel tick in seconds")
+    args = parser.parse_args()
+
+    print(f"⏱️ Countdown benchmark: {args.sessions} sessions, {args.delay}s, "
+          f"{args.answered:.0%} answered, wheel tick {args.tick}s\n")
+    print(f"{'strategy':<18} {'setup µs':>9} {'pending KiB':>12} {'lag p50 ms':>11} {'lag p99 ms':>11}")
+
+    setup_us, pending_kib, lags = asyncio.run(run_tasks(args.sessions, args.delay, args.answered))
+    print(f"{'task per timer':<18} {setup_us:>9.2f} {pending_kib:>12.0f} "
+          f"{percentile(lags, 0.5):>11.1f} {percentile(lags, 0.99):>11.1f}")
+
+    setup_us, pending_kib, lags, stats = asyncio.run(run_wheel(args.sessions, args.delay, args.answered, args.tick))
+    print(f"{'timer wheel':<18} {setup_us:>9.2f} {pending_kib:>12.0f} "
+          f"{percentile(lags, 0.5):>11.1f} {percentile(lags, 0.99):>11.1f}")
+    print(f"\n   wheel: {stats}")
+
+if __name__ == "__main__":
+    main()
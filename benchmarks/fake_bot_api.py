@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Fake Telegram Bot API server for load tests
+
+Serves the Bot API methods the bot uses at /bot<token>/<method>, answering
+after a configurable latency: getMe, getUpdates (long polling with offset),
+sendMessage, editMessageText, sendPoll, answerCallbackQuery, sendPhoto,
+sendDocument and the webhook calls made at startup. Any other method
+succeeds with True. Simulated users put updates on the server with inject();
+every call the bot makes to a watched chat is handed back to them as an
+ApiCall, so they can read keyboards and poll ids and answer like a client.
+
+Point the bot at it with BOT_API_BASE_URL=http://127.0.0.1:<port>/bot.
+
+    python -m benchmarks.fake_bot_api --port 8081 --latency 20
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict, deque
+from email.parser import BytesParser
+from typing import NamedTuple, Optional
+from urllib.parse import parse_qsl
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+BOT_USER = {"id": 999000, "is_bot": True, "first_name": "Smart Test Bot", "username": "smart_test_bot",
+            "can_join_groups": True, "can_read_all_group_messages": False, "supports_inline_queries": False}
+
+# Parameters PTB sends JSON-encoded inside form fields
+JSON_PARAMS = frozenset(["reply_markup", "options", "allowed_updates", "entities", "caption_entities",
+                         "link_preview_options", "reply_parameters"])
+MESSAGE_METHODS = frozenset(["sendMessage", "sendPoll", "sendPhoto", "sendDocument", "editMessageText",
+                             "editMessageReplyMarkup", "editMessageCaption"])
+MAX_UPDATES = 100
+
+class ApiCall(NamedTuple):
+    method: str
+    chat_id: Optional[int]
+    params: dict
+    result: object
+    at: float  # time.monotonic() when the call was answered
+
+    @property
+    def buttons(self):
+        """{button text: callback_data} of the inline keyboard sent with the call"""
+        markup = self.params.get("reply_markup") or {}
+        return {
+            button["text"]: button.get("callback_data")
+            for row in markup.get("inline_keyboard", ())
+            for button in row
+        }
+
+def _decode_params(raw):
+    params = {}
+    for key, value in raw.items():
+        if key in JSON_PARAMS and isinstance(value, str):
+            value = json.loads(value)
+        params[key] = value
+    for key in ("chat_id", "message_id", "offset", "limit"):
+        if isinstance(params.get(key), str) and params[key].lstrip("-").isdigit():
+            params[key] = int(params[key])
+    return params
+
+async def _read_params(request):
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+    if not body:
+        return dict(request.query_params)
+    if content_type.startswith("application/json"):
+        return json.loads(body)
+    if content_type.startswith("multipart/form-data"):
+        message = BytesParser().parsebytes(b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body)
+        params = {}
+        for part in message.get_payload():
+            name = part.get_param("name", header="content-disposition")
+            if part.get_filename():
+                params[name] = {"filename": part.get_filename(), "size": len(part.get_payload(decode=True))}
+            else:
+                params[name] = part.get_payload(decode=True).decode()
+        return params
+    return dict(parse_qsl(body.decode(), keep_blank_values=True))
+
+class FakeBotAPI:
+    """In-memory Bot API: updates waiting for getUpdates and the calls the bot made"""
+
+    def __init__(self, latency=0.0, jitter=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self._updates = deque()
+        self._update_ids = itertools.count(1)
+        self._message_ids = defaultdict(lambda: itertools.count(1))
+        self._poll_ids = itertools.count(1)
+        self._query_ids = itertools.count(1)
+        self._file_ids = itertools.count(1)
+        self._arrived = asyncio.Condition()
+        self._watchers = {}  # chat_id -> asyncio.Queue of ApiCall
+        self.calls = Counter()
+        self.delivered = 0  # updates handed out by getUpdates
+        self.max_backlog = 0
+
+    # --- what simulated users do -------------------------------------------------
+
+    def watch(self, chat_id):
+        """Queue of the calls the bot makes to chat_id from now on"""
+        queue = self._watchers[chat_id] = asyncio.Queue()
+        return queue
+
+    async def inject(self, update):
+        """Queue an update for getUpdates; returns it with its update_id"""
+        update["update_id"] = next(self._update_ids)
+        async with self._arrived:
+            self._updates.append(update)
+            self.max_backlog = max(self.max_backlog, len(self._updates))
+            self._arrived.notify_all()
+        return update
+
+    def new_message(self, user, **content):
+        chat = {"id": user["id"], "type": "private", "first_name": user["first_name"]}
+        return {"message_id": next(self._message_ids[user["id"]]), "date": int(time.time()),
+                "chat": chat, "from": user, **content}
+
+    async def send_text(self, user, text):
+        message = self.new_message(user, text=text)
+        if text.startswith("/"):
+            message["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+        return await self.inject({"message": message})
+
+    async def send_photo(self, user):
+        file_id = f"photo-{next(self._file_ids)}"
+        photo = [{"file_id": file_id, "file_unique_id": file_id, "width": 640, "height": 480}]
+        return await self.inject({"message": self.new_message(user, photo=photo)})
+
+    async def press(self, user, message, data):
+        """Tap the inline button with callback_data `data` under `message`"""
+        query = {"id": str(next(self._query_ids)), "from": user, "chat_instance": str(user["id"]),
+                 "message": message, "data": data}
+        return await self.inject({"callback_query": query})
+
+    async def answer_poll(self, user, poll_id, option):
+        return await self.inject({"poll_answer": {"poll_id": poll_id, "user": user, "option_ids": [option]}})
+
+    # --- what the bot calls ------------------------------------------------------
+
+    async def _get_updates(self, params):
+        offset = params.get("offset") or 0
+        limit = min(params.get("limit") or MAX_UPDATES, MAX_UPDATES)
+        timeout = float(params.get("timeout") or 0)
+        async with self._arrived:
+            while self._updates and self._updates[0]["update_id"] < offset:
+                self._updates.popleft()
+            if not self._updates and timeout > 0:
+                try:
+                    await asyncio.wait_for(self._arrived.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            updates = list(itertools.islice(self._updates, limit))
+        self.delivered += len(updates)
+        return updates
+
+    def _message_result(self, method, params):
+        chat_id = params.get("chat_id")
+        if method.startswith("edit"):
+            message_id = params.get("message_id")
+        else:
+            message_id = next(self._message_ids[chat_id])
+        message = {"message_id": message_id, "date": int(time.time()), "from": BOT_USER,
+                   "chat": {"id": chat_id, "type": "private"}}
+        if "reply_markup" in params:
+            message["reply_markup"] = params["reply_markup"]
+        if method == "sendPoll":
+            options = params.get("options") or []
+            message["poll"] = {
+                "id": str(next(self._poll_ids)), "question": params.get("question", ""),
+                "options": [{"text": option if isinstance(option, str) else option.get("text", ""), "voter_count": 0}
+                            for option in options],
+                "total_voter_count": 0, "is_closed": False, "is_anonymous": False,
+                "type": params.get("type", "regular"), "allows_multiple_answers": False
+            }
+            if params.get("correct_option_id") is not None:
+                message["poll"]["correct_option_id"] = int(params["correct_option_id"])
+        elif method == "sendPhoto":
+            file_id = params["photo"] if isinstance(params.get("photo"), str) else f"photo-{next(self._file_ids)}"
+            message["photo"] = [{"file_id": file_id, "file_unique_id": file_id, "width": 640, "height": 480}]
+            message["caption"] = params.get("caption", "")
+        elif method == "sendDocument":
+            file_id = f"document-{next(self._file_ids)}"
+            document = params.get("document")
+            name = document.get("filename") if isinstance(document, dict) else None
+            message["document"] = {"file_id": file_id, "file_unique_id": file_id, "file_name": name or "file"}
+            message["caption"] = params.get("caption", "")
+        else:
+            message["text"] = params.get("text", "")
+        return message
+
+    async def call(self, method, params):
+        """Answer one Bot API call the way Telegram would"""
+        self.calls[method] += 1
+        if method == "getUpdates":
+            return await self._get_updates(params)
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + random.uniform(0, self.jitter))
+        if method == "getMe":
+            return BOT_USER
+        if method == "getWebhookInfo":
+            return {"url": "", "has_custom_certificate": False, "pending_update_count": 0}
+        result = self._message_result(method, params) if method in MESSAGE_METHODS else True
+        chat_id = params.get("chat_id")
+        watcher = self._watchers.get(chat_id)
+        if watcher is not None:
+            watcher.put_nowait(ApiCall(method, chat_id, params, result, time.monotonic()))
+        return result
+
+    def app(self):
+        """ASGI app serving /bot<token>/<method>"""
+        app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+
+        @app.api_route("/bot{token}/{method}", methods=["GET", "POST"])
+        async def bot_api(token: str, method: str, request: Request):
+            params = _decode_params(await _read_params(request))
+            return JSONResponse({"ok": True, "result": await self.call(method, params)})
+
+        return app
+
+    def stats(self):
+        return {"delivered": self.delivered, "backlog": len(self._updates), "max_backlog": self.max_backlog,
+                "calls": dict(self.calls)}
+
+async def serve(api, host, port):
+    """Run the fake API until cancelled; returns once it is accepting connections"""
+    server = uvicorn.Server(uvicorn.Config(api.app(), host=host, port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+    return server, task
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Telegram Bot API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=20, help="Milliseconds added to every call")
+    parser.add_argument("--jitter", type=float, default=0, help="Up to this many more milliseconds, at random")
+    args = parser.parse_args()
+    api = FakeBotAPI(args.latency / 1000, args.jitter / 1000)
+    print(f"🤖 Fake Bot API on http://{args.host}:{args.port}/bot<token>/<method>")
+    uvicorn.run(api.app(), host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
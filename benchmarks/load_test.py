@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test against the fake Bot API
+
+Starts the fake Bot API server (benchmarks/fake_bot_api.py), seeds a
+throwaway database with one exam, and runs the real bot against both in a
+subprocess: build_application() with BOT_API_BASE_URL pointing at the fake,
+polling with getUpdates. Then N simulated students arrive over --ramp
+seconds and each goes through the whole funnel like a Telegram client would:
+
+    /start -> level -> stream -> submit payment -> photo proof
+    -> (admin approves) -> Exams -> start exam -> one poll answer per question
+
+A simulated admin keeps opening /payments, views each pending payment and
+approves it. Every step's latency is the time from the update being put on
+the server to the bot's visible reply (the message, edit or poll it sends).
+The report gives updates/sec handled and p50/p99 latency per step.
+
+Notification sends go through the send queue, whose limits are raised to
+--send-rate so Telegram's flood limits do not hide the bot's own speed.
+
+    python -m benchmarks.load_test --students 50 --questions 10 --latency 20
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TMP_DIR = os.environ.get("LOAD_TEST_DIR") or tempfile.mkdtemp(prefix="load_test_")
+DB_PATH = os.path.join(TMP_DIR, "bot.db")
+# The bot subprocess inherits these
+os.environ["LOAD_TEST_DIR"] = TMP_DIR
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.setdefault("BOT_TOKEN", "123456:LOAD-TEST")
+
+STEP_TIMEOUT = 30.0  # seconds to wait for the bot's reply to one update
+STUDENT_ID_BASE = 7000000000
+
+def seed(questions):
+    from sqlalchemy import insert
+    from app.database.session import engine
+    from app.database.migrations import run_migrations
+    from app.models import Course, Exam, Question
+
+    run_migrations(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Course.__table__), [{"id": 1, "name": "Biology"}])
+        conn.execute(insert(Exam.__table__), [{"id": 1, "name": "Biology Final", "course_id": 1,
+                                               "total_questions": questions}])
+        conn.execute(insert(Question.__table__), [
+            {
+                "exam_id": 1, "text": f"Question {i}: which organelle produces most of the cell's ATP?",
+                "option_a": "Mitochondria", "option_b": "Ribosome", "option_c": "Nucleus", "option_d": "Golgi body",
+                "correct_answer": "ABCD"[i % 4]
+            }
+            for i in range(questions)
+        ])
+    engine.dispose()
+
+def run_bot():
+    """The bot as deployed, polling the fake API (runs in the subprocess)"""
+    from telegram import Update
+    from app.bot.main import build_application
+    from app.bot.dispatcher_fixed import register_handlers
+
+    logging.getLogger().setLevel(os.environ.get("LOAD_TEST_BOT_LOG_LEVEL", "WARNING"))
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    app = build_application()
+    register_handlers(app)
+    app.run_polling(allowed_updates=Update.ALL_TYPES, poll_interval=0, timeout=10, drop_pending_updates=False)
+
+class Recorder:
+    """Latency per step, plus the students who got stuck"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.finished = 0
+
+    def percentile(self, values, share):
+        values = sorted(values)
+        return values[min(len(values) - 1, int(len(values) * share))] * 1000 if values else 0.0
+
+    def report(self):
+        everything = [value for values in self.latencies.values() for value in values]
+        rows = [(name, values) for name, values in self.latencies.items()] + [("all", everything)]
+        print(f"{'step':<15} {'count':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for name, values in rows:
+            print(f"{name:<15} {len(values):>7} {self.percentile(values, 0.5):>9.1f} "
+                  f"{self.percentile(values, 0.99):>9.1f} {max(values, default=0) * 1000:>9.1f}")
+        if self.errors:
+            print(f"\n⚠️  stuck: {dict(self.errors)}")
+
+async def expect(inbox, methods, match=None, timeout=STEP_TIMEOUT):
+    """The next call to this chat with one of `methods` (and passing `match`)"""
+    deadline = time.monotonic() + timeout
+    while True:
+        call = await asyncio.wait_for(inbox.get(), max(0.0, deadline - time.monotonic()))
+        if call.method in methods and (match is None or match(call)):
+            return call
+
+async def step(recorder, name, inject, inbox, methods, match=None):
+    """Put an update on the server and time the bot's reply"""
+    # Anything still unread (notifications, late edits) came before this update
+    while not inbox.empty():
+        inbox.get_nowait()
+    sent = time.monotonic()
+    await inject
+    call = await expect(inbox, methods, match)
+    recorder.latencies[name].append(call.at - sent)
+    return call
+
+def user_for(user_id, name):
+    return {"id": user_id, "is_bot": False, "first_name": name, "username": name.lower()}
+
+async def student(api, recorder, number, exam_callback):
+    user = user_for(STUDENT_ID_BASE + number, f"Student{number}")
+    inbox = api.watch(user["id"])
+    reply = ("sendMessage",)
+    edit = ("editMessageText",)
+    phase = "start"
+    try:
+        call = await step(recorder, "start", api.send_text(user, "/start"), inbox, reply)
+        phase = "level"
+        call = await step(recorder, "level", api.press(user, call.result, "level_freshman"), inbox, edit)
+        phase = "stream"
+        call = await step(recorder, "stream", api.press(user, call.result, "stream_natural"), inbox, edit)
+        phase = "submit_payment"
+        await step(recorder, "submit_payment", api.press(user, call.result, "submit_payment"), inbox, edit)
+        phase = "proof"
+        await step(recorder, "proof", api.send_photo(user), inbox, reply)
+
+        phase = "approval"
+        menu = await expect(inbox, reply, lambda call: "exams" in call.buttons.values(), timeout=STEP_TIMEOUT * 10)
+        phase = "exams"
+        call = await step(recorder, "exams", api.press(user, menu.result, "exams"), inbox, edit)
+        phase = "start_exam"
+        call = await step(recorder, "start_exam", api.press(user, call.result, exam_callback), inbox, ("sendPoll",))
+        phase = "answer"
+        answer = 0
+        while call.method == "sendPoll":
+            call = await step(recorder, "answer", api.answer_poll(user, call.result["poll"]["id"], answer % 4),
+                              inbox, ("sendPoll", "sendMessage"))
+            answer += 1
+        recorder.finished += 1
+    except asyncio.TimeoutError:
+        recorder.errors[phase] += 1
+
+async def admin(api, recorder, admin_id, students, done):
+    """Approve every payment: /payments, view each, approve it"""
+    user = user_for(admin_id, "Admin")
+    inbox = api.watch(admin_id)
+    approved = set()
+    while len(approved) < students and not done.is_set():
+        listing = await step(recorder, "admin_payments", api.send_text(user, "/payments"), inbox, ("sendMessage",),
+                             lambda call: "Payment Management" in call.params.get("text", "")
+                             or "Pending Payments" in call.params.get("text", ""))
+        views = [data for text, data in listing.buttons.items() if text.startswith("📋 View Payment")]
+        for data in views:
+            details = await step(recorder, "admin_view", api.press(user, listing.result, data), inbox,
+                                 ("sendPhoto", "editMessageText"), lambda call: any("Approve" in text for text in call.buttons))
+            approve = next(data for text, data in details.buttons.items() if "Approve" in text)
+            await step(recorder, "admin_approve", api.press(user, details.result, approve), inbox, ("editMessageText",),
+                       lambda call: "APPROVED" in call.params.get("text", ""))
+            approved.add(data)
+        if not views:
+            await asyncio.sleep(0.2)
+
+async def load(args):
+    from app.config.constants import ADMIN_IDS
+    from app.bot.callback_codec import callback_codec, START_EXAM
+    from benchmarks.fake_bot_api import FakeBotAPI, serve
+
+    api = FakeBotAPI(args.latency / 1000, args.jitter / 1000)
+    server, serving = await serve(api, "127.0.0.1", args.port)
+
+    env = dict(os.environ, BOT_API_BASE_URL=f"http://127.0.0.1:{args.port}/bot",
+               SEND_QUEUE_GLOBAL_RATE=str(args.send_rate), SEND_QUEUE_GLOBAL_BURST=str(args.send_rate),
+               SEND_QUEUE_CHAT_RATE=str(args.send_rate), SEND_QUEUE_CHAT_BURST="5",
+               ENABLE_PROCESS_CLEANUP="false")
+    log = open(os.path.join(TMP_DIR, "bot.log"), "w")
+    bot = subprocess.Popen([sys.executable, "-m", "benchmarks.load_test", "--run-bot"], env=env,
+                           cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), stdout=log, stderr=log)
+    recorder = Recorder()
+    try:
+        while not api.calls["getUpdates"]:
+            if bot.poll() is not None:
+                raise RuntimeError(f"Bot exited with {bot.returncode}; see {log.name}")
+            await asyncio.sleep(0.05)
+
+        print(f"🚦 Load test: {args.students} students, {args.questions} questions each, "
+              f"{args.latency:g}+{args.jitter:g} ms API latency, ramp {args.ramp:g}s\n")
+        exam_callback = callback_codec.encode(START_EXAM, 1)
+        delivered_before = api.delivered
+        started = time.monotonic()
+        done = asyncio.Event()
+        approving = asyncio.create_task(admin(api, recorder, ADMIN_IDS[0], args.students, done))
+        students = []
+        for number in range(args.students):
+            students.append(asyncio.create_task(student(api, recorder, number, exam_callback)))
+            if args.ramp:
+                await asyncio.sleep(args.ramp / args.students)
+        await asyncio.gather(*students)
+        elapsed = time.monotonic() - started
+        done.set()
+        approving.cancel()
+        await asyncio.gather(approving, return_exceptions=True)
+
+        updates = api.delivered - delivered_before
+        recorder.report()
+        print(f"\n✅ {recorder.finished}/{args.students} students finished in {elapsed:.1f}s")
+        print(f"📈 {updates} updates handled, {updates / elapsed:.1f} updates/sec")
+        print(f"   api: {api.stats()}")
+    finally:
+        bot.send_signal(2)  # SIGINT: run_polling shuts down cleanly
+        try:
+            bot.wait(30)
+        except subprocess.TimeoutExpired:
+            bot.kill()
+        log.close()
+        server.should_exit = True
+        await serving
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end load test against a fake Bot API")
+    parser.add_argument("--students", type=int, default=50, help="Simulated students")
+    parser.add_argument("--questions", type=int, default=10, help="Questions in the exam")
+    parser.add_argument("--ramp", type=float, default=2.0, help="Seconds over which students arrive")
+    parser.add_argument("--latency", type=float, default=20, help="Milliseconds the fake API takes per call")
+    parser.add_argument("--jitter", type=float, default=10, help="Up to this many more milliseconds, at random")
+    parser.add_argument("--send-rate", type=float, default=1000, help="Send queue msg/s, globally and per chat")
+    parser.add_argument("--port", type=int, default=8081, help="Port for the fake API")
+    parser.add_argument("--keep", action="store_true", help=f"Keep the database and bot log")
+    parser.add_argument("--run-bot", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_bot:
+        run_bot()
+        return
+
+    seed(args.questions)
+    try:
+        asyncio.run(load(args))
+    finally:
+        if args.keep:
+            print(f"   kept {TMP_DIR}")
+        else:
+            for name in os.listdir(TMP_DIR):
+                os.remove(os.path.join(TMP_DIR, name))
+            os.rmdir(TMP_DIR)
+
+if __name__ == "__main__":
+    main()
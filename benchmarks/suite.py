@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Service-layer benchmark suite with regression baselines
+
+Seeds a database per dataset size with app/database/seed.py and times the
+service calls handlers make: question sampling, finalize_exam,
+get_detailed_feedback, the leaderboards, get_user_exam_history, the CSV and
+Excel exports, check_course_access and the keyboard builders. Each size runs
+in its own processes, since the services bind their sessions to DATABASE_URL
+at import time. Cases are sampled round-robin, one sample of each per round,
+so a slow spell on a shared host hits every case alike rather than whichever
+one was running. The rounds are split between --processes workers and their
+samples pooled, since a process's hash seed and memory layout skew all of its
+samples the same way. Results go to JSON; `compare` flags every case whose
+fastest sample (--metric min_ms) got slower than the baseline by more than
+--threshold.
+
+    python -m benchmarks.suite run --sizes small,medium --output bench.json
+    python -m benchmarks.suite compare benchmarks/baseline.json bench.json
+
+benchmarks/baseline.json was recorded with `run --sizes small,medium`. Timings
+depend on the machine, so record a fresh baseline (`run --output
+benchmarks/baseline.json`) before comparing on different hardware.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from types import SimpleNamespace
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+DEFAULT_SIZES = "small,medium"
+DEFAULT_REPEAT = 20
+DEFAULT_PROCESSES = 4  # like pyperf's worker processes: hash seed and memory layout skew every sample of a process
+DEFAULT_THRESHOLD = 0.5  # 50% slower than the baseline is a regression; identical runs stay within ~1.4x
+DEFAULT_METRIC = "min_ms"  # the least disturbed sample; medians drift with host load
+MIN_DELTA_MS = 0.1  # ignore differences below this, timer noise on sub-millisecond cases
+MIN_SAMPLE_MS = 20  # fast cases are called in loops at least this long, like timeit's autorange
+
+# Every case a size runs: name -> (function, timed samples (None = --repeat), rolled back)
+CASES = {}
+
+def case(name, repeat=None, rollback=False):
+    def register(function):
+        CASES[name] = (function, repeat, rollback)
+        return function
+    return register
+
+@contextmanager
+def rolled_back(engine):
+    """Everything committed through SessionLocal meanwhile is rolled back afterwards"""
+    from app.database.session import SessionLocal
+
+    conn = engine.connect()
+    transaction = conn.begin()
+    # pysqlite only opens a transaction before DML; without this BEGIN the first
+    # savepoint's RELEASE would commit for good
+    conn.exec_driver_sql("BEGIN")
+    previous = {"bind": SessionLocal.kw["bind"],
+                "join_transaction_mode": SessionLocal.kw.get("join_transaction_mode", "conditional_savepoint")}
+    SessionLocal.configure(bind=conn, join_transaction_mode="create_savepoint")
+    try:
+        yield
+    finally:
+        SessionLocal.configure(**previous)
+        transaction.rollback()
+        conn.close()
+
+def _time_calls(function, number):
+    # Like timeit: a collection triggered by earlier cases' garbage would land on whichever case runs next
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        return (time.perf_counter() - started) * 1000
+    finally:
+        gc.enable()
+
+def calls_per_sample(function):
+    """Calls per timed sample, enough to rise above timer noise"""
+    number = 1
+    while _time_calls(function, number) < MIN_SAMPLE_MS and number < 100000:
+        number *= 10
+    return number
+
+def share(total, processes, index):
+    """How many of `total` samples worker process `index` takes"""
+    return total * (index + 1) // processes - total * index // processes
+
+def sampled_in(round_number, case_repeat, repeat):
+    """Whether a case with `case_repeat` samples takes one in this round; spread evenly over the rounds"""
+    return round_number * case_repeat // repeat != (round_number + 1) * case_repeat // repeat
+
+def summarize(timings, number):
+    """Milliseconds per call from samples of `number` calls each"""
+    timings = sorted(timings)
+    return {
+        "runs": len(timings),
+        "calls_per_run": number,
+        "median_ms": round(statistics.median(timings), 4),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 4),
+        "min_ms": round(timings[0], 4),
+        "max_ms": round(timings[-1], 4)
+    }
+
+def register_cases(fixtures):
+    """Cases for the seeded database; imports here so DATABASE_URL is already set"""
+    from app.keyboards.keyboard_cache import keyboard_cache
+    from app.keyboards.course_keyboard import course_keyboard, _build_course_keyboard
+    from app.keyboards.exam_keyboard import (
+        exam_selection_keyboard,
+        _build_exam_selection_keyboard,
+        question_keyboard,
+        format_question_text,
+    )
+    from app.keyboards.main_menu import _build_main_menu
+    from app.keyboards.stream_course_keyboard import _build_stream_courses_keyboard
+    from app.services.leaderboard_service import get_leaderboard, get_leaderboard_from_results
+    from app.services.question_bank import question_bank
+    from app.services.question_service import get_random_questions, get_questions_by_course
+    from app.services.result_services import get_user_exam_history, export_results_csv, export_results_excel
+    from app.services.scoring_service import finalize_exam, get_detailed_feedback
+    from app.utils.access_control import check_course_access
+
+    user_id, exam_id, course_id = fixtures["user_id"], fixtures["exam_id"], fixtures["course_id"]
+    export_path = os.path.join(fixtures["tmp_dir"], "export")
+
+    @case("question_bank.load")
+    def _():
+        question_bank.invalidate()
+        question_bank.load()
+
+    @case("get_random_questions")
+    def _():
+        get_random_questions(exam_id, 20)
+
+    @case("get_questions_by_course")
+    def _():
+        get_questions_by_course(course_id, 50)
+
+    @case("get_detailed_feedback")
+    def _():
+        get_detailed_feedback(user_id, exam_id)
+
+    for metric in ("best", "latest", "average"):
+        case(f"get_leaderboard.{metric}")(lambda metric=metric: get_leaderboard(metric, 10))
+    case("get_leaderboard_from_results.best")(lambda: get_leaderboard_from_results("best", 10))
+
+    @case("get_user_exam_history")
+    def _():
+        get_user_exam_history(user_id)
+
+    case("export_results_csv")(lambda: export_results_csv(export_path))
+    # Seconds per call at medium, so fewer samples than the rest
+    case("export_results_excel", repeat=5)(lambda: export_results_excel(export_path))
+
+    users = [
+        SimpleNamespace(stream=stream, level=level)
+        for stream in ("natural_science", "social_science")
+        for level in ("freshman", "remedial")
+    ]
+    courses = ["Biology", "Physics", "Chemistry", "Mathematics", "English", "History", "Geography", "Economics"]
+
+    @case("check_course_access.x1000")
+    def _():
+        for _ in range(1000 // (len(users) * len(courses)) + 1):
+            for user in users:
+                for course_name in courses:
+                    check_course_access(user, course_name)
+
+    @case("keyboard.course.build")
+    def _():
+        _build_course_keyboard()
+
+    @case("keyboard.course.cached")
+    def _():
+        course_keyboard()
+
+    @case("keyboard.exam_selection.build")
+    def _():
+        _build_exam_selection_keyboard(course_id)
+
+    @case("keyboard.exam_selection.cached")
+    def _():
+        exam_selection_keyboard(course_id)
+
+    @case("keyboard.main_menu.build")
+    def _():
+        _build_main_menu(False)
+
+    @case("keyboard.stream_courses.build")
+    def _():
+        _build_stream_courses_keyboard("natural_science", "freshman")
+
+    question = question_bank.get_exam_questions(exam_id)[0]
+
+    @case("keyboard.question")
+    def _():
+        question_keyboard(question)
+        format_question_text(question)
+
+    # These store a Result per call; what they store is rolled back after every sample
+    @case("finalize_exam.tally", rollback=True)
+    def _():
+        finalize_exam(user_id, exam_id, {"answered": 40, "correct": 31, "started_at": datetime.utcnow()})
+
+    @case("finalize_exam.from_answers", rollback=True)
+    def _():
+        finalize_exam(user_id, exam_id)
+
+    keyboard_cache.clear()
+
+def fixtures_for(engine, tmp_dir):
+    """A heavy user, one exam they sat and its course"""
+    from sqlalchemy import select, func
+    from app.models import Exam, Result
+
+    with engine.connect() as conn:
+        user_id = conn.execute(
+            select(Result.user_id).group_by(Result.user_id).order_by(func.count().desc(), Result.user_id).limit(1)
+        ).scalar()
+        exam_id = conn.execute(
+            select(Result.exam_id).filter_by(user_id=user_id).order_by(Result.completed_at.desc()).limit(1)
+        ).scalar()
+        course_id = conn.execute(select(Exam.course_id).filter_by(id=exam_id)).scalar()
+    return {"user_id": user_id, "exam_id": exam_id, "course_id": course_id, "tmp_dir": tmp_dir}
+
+def run_size(size, repeat, output, only=None, processes=1, index=0):
+    """Time this worker's share of every case's samples (runs in a child process; the first one seeds)"""
+    from app.database.session import engine
+    from app.database.seed import SCALES, generate_dataset
+
+    counts, seed_seconds = None, None
+    if index == 0:
+        started = time.perf_counter()
+        counts, _ = generate_dataset(engine, **SCALES[size])
+        seed_seconds = round(time.perf_counter() - started, 1)
+
+    register_cases(fixtures_for(engine, os.path.dirname(output)))
+    rounds = share(repeat, processes, index)
+    selected = {}
+    for name, (function, case_repeat, rollback) in CASES.items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        samples = share(min(case_repeat or repeat, repeat), processes, index)
+        if samples:
+            selected[name] = (function, samples, rollback)
+
+    numbers = {}
+    for name, (function, _, rollback) in selected.items():
+        with rolled_back(engine) if rollback else nullcontext():
+            numbers[name] = calls_per_sample(function)
+
+    timings = {name: [] for name in selected}
+    for round_number in range(rounds):
+        for name, (function, samples, rollback) in selected.items():
+            if not sampled_in(round_number, samples, rounds):
+                continue
+            with rolled_back(engine) if rollback else nullcontext():
+                timings[name].append(_time_calls(function, numbers[name]) / numbers[name])
+
+    samples = {name: {"number": numbers[name], "timings": timings[name]} for name in selected}
+    with open(output, "w") as f:
+        json.dump({"dataset": counts, "seed_seconds": seed_seconds, "samples": samples}, f)
+
+def pool_samples(size, parts):
+    """One size's report from the samples every worker process took"""
+    cases = {}
+    for part in parts:
+        for name, taken in part["samples"].items():
+            if name not in cases:
+                cases[name] = {"number": taken["number"], "timings": []}
+            cases[name]["timings"] += taken["timings"]
+    for name, taken in cases.items():
+        cases[name] = summarize(taken["timings"], taken["number"])
+        print(f"   {size:<10} {name:<36} {cases[name]['min_ms']:>10.3f} ms", file=sys.stderr)
+    return {"dataset": parts[0]["dataset"], "seed_seconds": parts[0]["seed_seconds"], "cases": cases}
+
+def run(args):
+    report = {
+        "created_at": datetime.utcnow().replace(microsecond=0).isoformat() + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "processes": args.processes,
+        "sizes": {}
+    }
+    for size in args.sizes.split(","):
+        with tempfile.TemporaryDirectory(prefix="bench_suite_") as tmp_dir:
+            env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}",
+                       ENABLE_PROCESS_CLEANUP="false")
+            print(f"🌱 Seeding and timing '{size}'...", file=sys.stderr)
+            parts = []
+            for index in range(args.processes):
+                output = os.path.join(tmp_dir, f"samples_{index}.json")
+                command = [
+                    sys.executable, "-m", "benchmarks.suite", "measure", size, output, "--repeat", str(args.repeat),
+                    "--processes", str(args.processes), "--index", str(index)
+                ]
+                if args.only:
+                    command += ["--only", args.only]
+                subprocess.run(command, env=env, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+                with open(output) as f:
+                    parts.append(json.load(f))
+            report["sizes"][size] = pool_samples(size, parts)
+
+    text = json.dumps(report, indent=2, sort_keys=True) + "\n"
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+        print(f"✅ Wrote {args.output}", file=sys.stderr)
+    else:
+        sys.stdout.write(text)
+
+def compare_reports(baseline, current, threshold=DEFAULT_THRESHOLD, min_delta_ms=MIN_DELTA_MS, metric=DEFAULT_METRIC):
+    """Rows of (size, case, baseline ms, current ms, ratio, verdict) for every case in `current`"""
+    rows = []
+    for size, measured in current["sizes"].items():
+        base_cases = baseline["sizes"].get(size, {}).get("cases", {})
+        for name, timing in measured["cases"].items():
+            base = base_cases.get(name)
+            if base is None:
+                rows.append((size, name, None, timing[metric], None, "new"))
+                continue
+            before, after = base[metric], timing[metric]
+            ratio = after / before if before else float("inf")
+            if abs(after - before) < min_delta_ms:
+                verdict = "ok"
+            elif ratio > 1 + threshold:
+                verdict = "REGRESSION"
+            elif ratio < 1 / (1 + threshold):
+                verdict = "faster"
+            else:
+                verdict = "ok"
+            rows.append((size, name, before, after, ratio, verdict))
+    return rows
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows = compare_reports(baseline, current, args.threshold, args.min_delta_ms, args.metric)
+    print(f"{'size':<10} {'case':<36} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for size, name, before, after, ratio, verdict in rows:
+        before_text = f"{before:>12.3f}" if before is not None else f"{'-':>12}"
+        ratio_text = f"{ratio:>6.2f}x" if ratio is not None else f"{'-':>7}"
+        flag = "" if verdict == "ok" else f"  {verdict}"
+        print(f"{size:<10} {name:<36} {before_text} {after:>12.3f} {ratio_text}{flag}")
+
+    regressions = [row for row in rows if row[5] == "REGRESSION"]
+    if regressions:
+        print(f"\n❌ {len(regressions)} case(s) more than {args.threshold:.0%} slower than the baseline")
+        sys.exit(1)
+    print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Service-layer benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Seed each size and time every case")
+    run_parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated seed.py scales")
+    run_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Rounds, one timed sample of each case per round")
+    run_parser.add_argument("--processes", type=int, default=DEFAULT_PROCESSES,
+                            help="Worker processes per size; the rounds are split between them")
+    run_parser.add_argument("--only", help="Comma-separated case name prefixes to run")
+    run_parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+
+    compare_parser = commands.add_parser("compare", help="Flag regressions against a baseline report")
+    compare_parser.add_argument("baseline", nargs="?", default=BASELINE_PATH)
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="Allowed slowdown, as a fraction")
+    compare_parser.add_argument("--min-delta-ms", type=float, default=MIN_DELTA_MS,
+                                help="Differences smaller than this are never flagged")
+    compare_parser.add_argument("--metric", choices=["median_ms", "min_ms", "p95_ms"], default=DEFAULT_METRIC,
+                                help="Timing to compare; min_ms is steadiest on a busy machine")
+
+    measure_parser = commands.add_parser("measure")  # one size, in the child process
+    measure_parser.add_argument("size")
+    measure_parser.add_argument("output")
+    measure_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    measure_parser.add_argument("--only")
+    measure_parser.add_argument("--processes", type=int, default=1)
+    measure_parser.add_argument("--index", type=int, default=0)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    elif args.command == "compare":
+        compare(args)
+    else:
+        run_size(args.size, args.repeat, args.output, args.only.split(",") if args.only else None,
+                 args.processes, args.index)
+
+if __name__ == "__main__":
+    main()
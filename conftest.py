@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Shared fixtures: a migrated throwaway database and the app globals bound to it
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy.orm import sessionmaker
+from app.database.engine import build_engine
+from app.database.migrations import run_migrations
+from app.database.session import SessionLocal
+from app.models.course import Course
+from app.models.exam import Exam
+from app.models.question import Question
+from app.services.answer_service import answer_sink
+from app.services.question_bank import question_bank
+
+@pytest.fixture
+def engine(tmp_path):
+    """A migrated SQLite database in the test's temp directory"""
+    engine = build_engine(f"sqlite:///{tmp_path / 'bot.db'}")
+    run_migrations(engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def exam_engine(engine):
+    """engine holding course 1 "Biology" with exam 1 "Cells" of questions 1-3, each answered by A"""
+    with sessionmaker(bind=engine)() as db:
+        db.add(Course(id=1, name="Biology"))
+        db.add(Exam(id=1, course_id=1, name="Cells"))
+        db.add_all([
+            Question(id=i, exam_id=1, text=f"Q{i}", option_a="x", option_b="y", correct_answer="A")
+            for i in (1, 2, 3)
+        ])
+        db.commit()
+    return engine
+
+@pytest.fixture
+def bank(exam_engine, monkeypatch):
+    """The global question bank, reading exam_engine"""
+    monkeypatch.setattr(question_bank, "session_factory", sessionmaker(bind=exam_engine))
+    question_bank.invalidate()
+    yield question_bank
+    question_bank.invalidate()
+
+@pytest.fixture
+def sink(exam_engine, monkeypatch):
+    """The global answer sink, writing to exam_engine; drained before it is unbound"""
+    monkeypatch.setattr(answer_sink, "bind", exam_engine)
+    yield answer_sink
+    answer_sink.flush()
+
+@pytest.fixture
+def session_local(exam_engine, monkeypatch):
+    """SessionLocal bound to exam_engine"""
+    monkeypatch.setitem(SessionLocal.kw, "bind", exam_engine)
+    return SessionLocal
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Database Migration Runner
+Applies the versioned migrations in app/database/migrations.py.
+
+Usage:
+    python migrate.py              # apply all pending migrations
+    python migrate.py status       # show applied/pending migrations
+    python migrate.py explain      # check hot queries use an index
+    python migrate.py backfill-stats  # rebuild leaderboard rollups from results
+    python migrate.py --database-url sqlite:///./data/bot.db upgrade
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.config.settings import DATABASE_URL
+from app.database.engine import build_engine
+from app.database.migrations import MIGRATIONS, get_applied_versions, get_pending_migrations, run_migrations
+from app.database.query_plans import check_hot_query_plans
+from app.services.leaderboard_service import backfill_user_score_stats
+
+def cmd_upgrade(engine, target=None):
+    ran = run_migrations(engine, target=target)
+    if ran:
+        for version, name in ran:
+            print(f"✅ Applied {version:04d}_{name}")
+    else:
+        print("ℹ️ Database is up to date - no migrations pending")
+    return True
+
+def cmd_status(engine):
+    applied = get_applied_versions(engine)
+    for version, name, _ in MIGRATIONS:
+        mark = "✅" if version in applied else "⏳"
+        print(f"{mark} {version:04d}_{name}")
+    return True
+
+def cmd_explain(engine):
+    pending = get_pending_migrations(engine)
+    if pending:
+        print(f"❌ {len(pending)} migration(s) pending - run 'python migrate.py upgrade' first")
+        return False
+
+    all_indexed = True
+    for name, uses_index, plan in check_hot_query_plans(engine):
+        mark = "✅" if uses_index else "❌"
+        all_indexed = all_indexed and uses_index
+        print(f"{mark} {name}")
+        for detail in plan:
+            print(f"     {detail}")
+    return all_indexed
+
+def cmd_backfill_stats(engine):
+    pending = get_pending_migrations(engine)
+    if pending:
+        print(f"❌ {len(pending)} migration(s) pending - run 'python migrate.py upgrade' first")
+        return False
+
+    users = backfill_user_score_stats(engine)
+    print(f"✅ Rebuilt leaderboard stats for {users} user(s)")
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Smart Test Exam database migrations")
+    parser.add_argument("command", nargs="?", default="upgrade", choices=["upgrade", "status", "explain", "backfill-stats"])
+    parser.add_argument("--database-url", default=DATABASE_URL, help="Database URL (defaults to DATABASE_URL)")
+    parser.add_argument("--target", type=int, default=None, help="Only upgrade up to this version")
+    args = parser.parse_args()
+
+    engine = build_engine(args.database_url)
+    print(f"📂 Database: {args.database_url}")
+
+    if args.command == "upgrade":
+        ok = cmd_upgrade(engine, args.target)
+    elif args.command == "status":
+        ok = cmd_status(engine)
+    elif args.command == "explain":
+        ok = cmd_explain(engine)
+    else:
+        ok = cmd_backfill_stats(engine)
+
+    engine.dispose()
+    if not ok:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -61,7 +61,7 @@ from app.services.practice_service import PracticeService
 
 # Import utilities
 from app.utils.process_manager import ProcessManager
-from app.config.settings import BOT_TOKEN
+from app.config.settings import BOT_TOKEN, SESSION_PERSISTENCE
 
 # Configure logging
 logging.basicConfig(
@@ -129,9 +129,14 @@ async def create_application():
     global app
     try:
         from telegram.ext import ApplicationBuilder
+        from app.bot.persistence import SessionPersistence
         
         logging.info("Building application...")
-        app = ApplicationBuilder().token(BOT_TOKEN).build()
+        builder = ApplicationBuilder().token(BOT_TOKEN)
+        if SESSION_PERSISTENCE:
+            # In-progress exams survive restarts
+            builder = builder.persistence(SessionPersistence())
+        app = builder.build()
         logging.info("Application built successfully")
         
         logging.info("Initializing application...")
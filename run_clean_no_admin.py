@@ -7,6 +7,8 @@ from telegram import Update, Bot
 from telegram.ext import ApplicationBuilder, CommandHandler, CallbackQueryHandler, MessageHandler, ContextTypes, filters, PollAnswerHandler
 from telegram.error import Conflict, InvalidToken, TelegramError
 from app.config.settings import BOT_TOKEN, WEBHOOK_URL
+from app.database.migrations import run_migrations
+from app.database.session import engine
 from app.handlers.start_handler import start
 from app.handlers.register_handler import register, handle_registration_callback
 from app.handlers.onboarding_handler import onboarding
@@ -301,6 +303,7 @@ def start_bot():
     """Main bot startup function - CLEAN VERSION (NO ADMIN)"""
     try:
         logger.info("🚀 Starting CLEAN BOT (NO ADMIN DUPLICATE MESSAGES)")
+        run_migrations(engine)
         start_bot_with_polling()
     except KeyboardInterrupt:
         logger.info("Bot stopped by user")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Write-behind answer sink checks
+"""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.services.answer_service import AnswerSink
+
+class FlakyBind:
+    """An engine whose next `failures` transactions fail, like a locked database"""
+
+    def __init__(self, engine, failures=1):
+        self.engine = engine
+        self.failures = failures
+
+    def begin(self):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database is locked")
+        return self.engine.begin()
+
+class SlowBind:
+    """An engine whose transactions wait for `release`, like a write stuck behind a checkpoint"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def begin(self):
+        self.entered.set()
+        self.release.wait(5)
+        return self.engine.begin()
+
+def stored_questions(engine):
+    with engine.connect() as conn:
+        return [row[0] for row in conn.exec_driver_sql("SELECT question_id FROM answers ORDER BY id")]
+
+def add(sink, question_id):
+    sink.add(user_id=1, exam_id=1, question_id=question_id, selected_option="A", is_correct=True)
+
+def test_batches_are_written_in_one_flush(engine):
+    """Answers stay buffered until the batch fills (no loop: written through) or flush() is forced"""
+    sink = AnswerSink(engine, batch_size=3)
+    add(sink, 1)
+    add(sink, 2)
+    assert (sink.pending(), stored_questions(engine)) == (2, [])
+    add(sink, 3)
+    assert (sink.pending(), stored_questions(engine)) == (0, [1, 2, 3])
+    add(sink, 4)
+    assert sink.flush() == 1
+    assert sink.flush() == 0
+    assert (sink.flushed_rows, sink.flush_count) == (4, 2)
+
+def test_failed_write_keeps_the_rows_in_order(engine):
+    """A failed flush puts its rows back ahead of newer ones; the next flush writes them all"""
+    sink = AnswerSink(FlakyBind(engine), batch_size=100)
+    add(sink, 1)
+    add(sink, 2)
+    try:
+        sink.flush()
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("flush should surface the write error")
+    add(sink, 3)
+    assert sink.pending() == 3
+    assert sink.flush() == 3
+    assert stored_questions(engine) == [1, 2, 3]
+
+def test_background_flusher_retries_and_drains_on_stop(engine):
+    """On a loop the flusher writes full batches, retries after a failure and drains on stop()"""
+    sink = AnswerSink(FlakyBind(engine), batch_size=2, flush_interval=0.02)
+
+    async def scenario():
+        await sink.start()
+        add(sink, 1)
+        add(sink, 2)  # fills the batch; the first write fails and is retried next tick
+        await asyncio.sleep(0.1)
+        assert stored_questions(engine) == [1, 2]
+        add(sink, 3)
+        await sink.stop()
+
+    asyncio.run(scenario())
+    assert stored_questions(engine) == [1, 2, 3]
+    assert sink.pending() == 0
+
+def test_forced_flush_waits_for_the_write_in_flight(engine):
+    """A batch the background flusher already took out of the buffer is committed before flush_async() returns"""
+    bind = SlowBind(engine)
+    sink = AnswerSink(bind, batch_size=2, flush_interval=60)
+
+    async def scenario():
+        await sink.start()
+        add(sink, 1)
+        add(sink, 2)  # wakes the flusher, which blocks inside its write
+        assert await asyncio.to_thread(bind.entered.wait, 5)
+        assert sink.pending() == 0
+
+        forced = asyncio.create_task(sink.flush_async())
+        await asyncio.sleep(0.05)
+        assert not forced.done()
+        bind.release.set()
+        await forced
+        assert stored_questions(engine) == [1, 2]
+        await sink.stop()
+
+    asyncio.run(scenario())
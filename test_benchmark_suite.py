@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite baseline comparison checks
+"""
+
+import sys
+from pathlib import Path
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent))
+
+from benchmarks.suite import compare_reports
+
+def report(**cases):
+    return {"sizes": {"small": {"cases": {name: {"median_ms": ms, "min_ms": ms} for name, ms in cases.items()}}}}
+
+def test_slowdowns_beyond_the_threshold_are_regressions():
+    baseline = report(feedback=10.0, leaderboard=5.0, history=100.0, keyboard=0.05)
+    current = report(feedback=16.0, leaderboard=5.5, history=40.0, keyboard=0.12, export=300.0)
+
+    verdicts = {name: verdict for _, name, _, _, _, verdict in compare_reports(baseline, current, threshold=0.5)}
+    assert verdicts == {
+        "feedback": "REGRESSION",
+        "leaderboard": "ok",
+        "history": "faster",
+        # 2.4x, but 0.07 ms is timer noise
+        "keyboard": "ok",
+        "export": "new"
+    }
+
+def test_baseline_compares_clean_against_itself():
+    baseline = report(feedback=10.0, export=300.0)
+    assert {row[5] for row in compare_reports(baseline, baseline)} == {"ok"}
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Callback data codec checks
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.bot.callback_codec import CallbackCodec, MAX_CALLBACK_DATA
+from app.bot.callback_router import CallbackRouter
+
+def test_inline_round_trip():
+    """Short payloads are packed inline and decode to the same typed args"""
+    codec = CallbackCodec()
+    start_exam = codec.register(2, "start_exam", int)
+    answer = codec.register(12, "answer", str)
+
+    assert codec.encode(start_exam, 71) == "~2:1z"
+    assert codec.decode("~2:1z") == (start_exam, (71,), False)
+    assert codec.decode(codec.encode(answer, "B")) == (answer, ("B",), False)
+    # Not codec data, or for a spec that does not exist
+    assert codec.decode("start_exam_71") is None
+    assert codec.decode("~zz:1") is None
+
+def test_long_payloads_round_trip_through_a_token():
+    """Payloads over 64 bytes, or with the separator, go through one reused token"""
+    codec = CallbackCodec()
+    link = codec.register(10, "copy_invitation_link", str)
+    url = "https://t.me/exam_bot?start=" + "r" * 60
+
+    data = codec.encode(link, url)
+    assert data.startswith("~*") and len(data.encode("utf-8")) <= MAX_CALLBACK_DATA
+    assert codec.decode(data) == (link, (url,), False)
+    assert codec.encode(link, url) == data
+    assert codec.decode(codec.encode(link, "a:b")) == (link, ("a:b",), False)
+    assert codec.stats()["tokens_issued"] == 2
+
+def test_expired_token_is_reported_to_the_user():
+    """An expired token decodes as expired and the router answers with an alert"""
+    codec = CallbackCodec(token_ttl=0)
+    link = codec.register(10, "copy_invitation_link", str)
+    handled = []
+    alerts = []
+
+    async def handler(update, context):
+        handled.append(context.args)
+
+    async def answer(text, show_alert=False):
+        alerts.append(show_alert)
+
+    router = CallbackRouter(codec=codec)
+    router.add_spec(link, handler)
+
+    assert codec.decode(codec.encode(link, "x" * 80)) == (None, None, True)
+    update = SimpleNamespace(callback_query=SimpleNamespace(data=codec.encode(link, "y" * 80), answer=answer))
+    asyncio.run(router.dispatch(update, SimpleNamespace(args=None)))
+
+    assert handled == [] and alerts == [True]
+    assert codec.stats()["tokens_expired"] == 2
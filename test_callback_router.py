@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Callback query routing checks
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.bot.callback_codec import CallbackCodec
+from app.bot.callback_router import CallbackRouter
+
+def named(name):
+    async def callback(update, context):
+        return name
+    callback.__name__ = name
+    return callback
+
+def build_router():
+    codec = CallbackCodec()
+    start_exam = codec.register(2, "start_exam", int, legacy_prefix="start_exam_")
+    router = CallbackRouter(default=named("menu"), codec=codec)
+    router.add("^admin$", named("admin"))
+    router.add("^admin_", named("admin_prefix"))
+    router.add("^(level_|stream_)", named("onboarding"))
+    router.add_spec(start_exam, named("start_exam"))
+    router.add("^start_exam_", named("never_reached"))
+    return router
+
+def route_name(router, data):
+    route = router.resolve(data)
+    return route.callback.__name__ if route is not None else None
+
+def test_exact_prefix_and_first_match():
+    """Exact data, prefixes and alternatives resolve like PTB's first-match handler chain"""
+    router = build_router()
+    assert route_name(router, "admin") == "admin"
+    assert route_name(router, "admin_users") == "admin_prefix"
+    assert route_name(router, "level_freshman") == "onboarding"
+    assert route_name(router, "stream_natural") == "onboarding"
+    assert route_name(router, "start_exam_71") == "start_exam"
+    assert route_name(router, "unknown") is None
+    assert [(route.pattern, earlier.pattern) for route, earlier in router.shadowed_routes()] == [
+        ("^start_exam_", "^start_exam_")
+    ]
+
+def test_legacy_callback_data_gets_typed_args():
+    """Buttons sent before the codec still reach the handler, with parsed context.args"""
+    router = build_router()
+    match = router.match("start_exam_71")
+    assert match.route.callback.__name__ == "start_exam"
+    assert match.args == (71,)
+    # A legacy payload that does not parse is unmatched, not handed a bad id
+    assert router.match("start_exam_maths").route is None
+
+def test_dispatch_sets_args_and_falls_back():
+    """Typed routes get context.args; unknown data goes to the default and is counted"""
+    router = build_router()
+
+    def dispatch(data):
+        context = SimpleNamespace(args=None)
+        update = SimpleNamespace(callback_query=SimpleNamespace(data=data))
+        return asyncio.run(router.dispatch(update, context)), context.args
+
+    assert dispatch("start_exam_5") == ("start_exam", [5])
+    assert dispatch("admin") == ("admin", None)
+    assert dispatch("gone_button") == ("menu", None)
+    assert router.unmatched["gone_button"] == 1
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Exam session state and record checks
+"""
+
+import copy
+import sys
+from pathlib import Path
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import delete
+from sqlalchemy.orm import sessionmaker
+from app.bot.persistence import encode_session, decode_session
+from app.models.question import Question
+from app.services.exam_session import ExamSession
+
+def test_record_round_trip(bank):
+    """A session mid-exam comes back from its persisted record field for field"""
+    session = ExamSession(7, 70, bank.get_exam_questions(1), exam_id=1, use_timer=True)
+    session.record(True)
+    session.start_countdown(30)
+    session.poll_id = "poll-2"
+
+    restored = decode_session(encode_session({"session": session, "menu": "exams"}))
+    assert restored["menu"] == "exams"
+    restored = restored["session"]
+    for name in ExamSession.__slots__:
+        assert getattr(restored, name) == getattr(session, name), name
+    assert restored.question.id == 2
+    assert restored.tally() == {"answered": 1, "correct": 1, "started_at": session.started_at}
+
+def test_session_with_a_deleted_question_is_dropped(exam_engine, bank):
+    """A record whose questions no longer all exist cannot resume"""
+    session = ExamSession(7, 70, bank.get_exam_questions(1), exam_id=1)
+    stored = encode_session({"session": session})
+
+    with sessionmaker(bind=exam_engine)() as db:
+        db.execute(delete(Question).where(Question.id == 3))
+        db.commit()
+    bank.invalidate()
+
+    assert ExamSession.from_record(session.to_record()) is None
+    assert decode_session(stored) == {}
+
+def test_copies_do_not_share_the_cursor(bank):
+    """Persistence deepcopies user_data; the copy must not move with the live session"""
+    session = ExamSession(7, 70, bank.get_exam_questions(1))
+    clone = copy.deepcopy(session)
+    session.record(False)
+    session.question_ids[0] = 99
+
+    assert (clone.index, clone.answered, clone.question_ids.tolist()) == (0, 0, [1, 2, 3])
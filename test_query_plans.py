@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Migration runner and hot query plan checks
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.database.engine import build_engine
+from app.database.migrations import MIGRATIONS, get_pending_migrations, run_migrations
+from app.database.query_plans import check_hot_query_plans
+
+LEGACY_SCHEMA = """
+CREATE TABLE users (id INTEGER PRIMARY KEY, telegram_id INTEGER NOT NULL UNIQUE, full_name VARCHAR NOT NULL,
+    username VARCHAR, join_time DATETIME, level VARCHAR, stream VARCHAR, payment_status VARCHAR, access VARCHAR);
+CREATE TABLE courses (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, description TEXT);
+CREATE TABLE payments (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, proof VARCHAR, status VARCHAR, created_at DATETIME);
+CREATE TABLE exams (id INTEGER PRIMARY KEY, course_id INTEGER NOT NULL, name VARCHAR NOT NULL, total_questions INTEGER);
+CREATE TABLE questions (id INTEGER PRIMARY KEY, exam_id INTEGER NOT NULL, text TEXT NOT NULL, option_a VARCHAR,
+    option_b VARCHAR, option_c VARCHAR, option_d VARCHAR, correct_option VARCHAR);
+CREATE TABLE results (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, exam_id INTEGER NOT NULL, score INTEGER,
+    percentage FLOAT, completed_at DATETIME);
+CREATE TABLE answers (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, question_id INTEGER NOT NULL,
+    selected_option VARCHAR, is_correct BOOLEAN, timestamp DATETIME);
+"""
+
+def _temp_db_path():
+    return os.path.join(tempfile.mkdtemp(prefix="test_migrations_"), "bot.db")
+
+def test_fresh_database_hot_queries_use_indexes():
+    """Every hot query is answered through an index after migrating"""
+    engine = build_engine(f"sqlite:///{_temp_db_path()}")
+    run_migrations(engine)
+
+    assert get_pending_migrations(engine) == []
+    for name, uses_index, plan in check_hot_query_plans(engine):
+        assert uses_index, f"{name} does not use an index: {plan}"
+    engine.dispose()
+
+def test_legacy_database_upgrade_is_idempotent():
+    """A pre-migration live database upgrades in place and re-running is a no-op"""
+    db_path = _temp_db_path()
+    conn = sqlite3.connect(db_path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.execute("INSERT INTO users (telegram_id, full_name) VALUES (1, 'Existing User')")
+    conn.executemany(
+        "INSERT INTO results (user_id, exam_id, score, percentage, completed_at) VALUES (1, 1, ?, ?, ?)",
+        [(7, 70.0, "2024-01-01 10:00:00"), (9, 90.0, "2024-01-02 10:00:00"), (5, 50.0, "2024-01-03 10:00:00")]
+    )
+    conn.commit()
+    conn.close()
+
+    engine = build_engine(f"sqlite:///{db_path}")
+    ran = run_migrations(engine)
+    assert [version for version, _ in ran] == [version for version, _, _ in MIGRATIONS]
+    assert run_migrations(engine) == []
+
+    for name, uses_index, plan in check_hot_query_plans(engine):
+        assert uses_index, f"{name} does not use an index: {plan}"
+    engine.dispose()
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT full_name, is_blocked FROM users").fetchone() == ("Existing User", 0)
+    answer_columns = {row[1] for row in conn.execute("PRAGMA table_info(answers)")}
+    assert "exam_id" in answer_columns
+    # Leaderboard rollup is backfilled from the existing results
+    assert conn.execute(
+        "SELECT best_score, latest_score, score_sum, result_count FROM user_score_stats WHERE user_id = 1"
+    ).fetchone() == (9, 5, 21, 3)
+    conn.close()
+
+if __name__ == "__main__":
+    test_fresh_database_hot_queries_use_indexes()
+    test_legacy_database_upgrade_is_idempotent()
+    print("✅ Migration and query plan checks passed")
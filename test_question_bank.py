@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Question bank reload checks
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy.orm import sessionmaker
+from app.services.question_bank import QuestionBank
+
+def test_concurrent_misses_after_invalidate_reload_once(exam_engine):
+    """Every reader that misses while a reload is running shares that reload"""
+    factory = sessionmaker(bind=exam_engine)
+    loads = []
+
+    def counting_factory():
+        loads.append(1)
+        # Hold the load open long enough for every reader to miss
+        time.sleep(0.05)
+        return factory()
+
+    bank = QuestionBank(session_factory=counting_factory)
+    bank.load()
+    bank.invalidate()
+    loads.clear()
+
+    results = []
+    start = threading.Barrier(8)
+
+    def reader():
+        start.wait()
+        results.append(len(bank.get_exam_questions(1)))
+
+    threads = [threading.Thread(target=reader) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [3] * 8
+    assert len(loads) == 1
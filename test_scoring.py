@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Exam scoring checks: session tally against stored answers
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent))
+
+from sqlalchemy import select
+from app.models.answer import Answer
+from app.models.result import Result
+from app.models.user_score_stats import UserScoreStats
+from app.services.answer_service import answer_sink
+from app.services.scoring_service import finalize_exam, verify_tally
+
+USER = 9
+
+@pytest.fixture(autouse=True)
+def previous_attempt(session_local, sink):
+    """A wrong answer to every question of exam 1 from yesterday's attempt"""
+    with session_local() as db:
+        db.add_all([
+            Answer(user_id=USER, exam_id=1, question_id=i, selected_option="B", is_correct=False,
+                   timestamp=datetime.utcnow() - timedelta(days=1))
+            for i in (1, 2, 3)
+        ])
+        db.commit()
+
+def answer_exam(correct):
+    """Buffer one attempt's answers and return the session tally for it"""
+    tally = {"answered": 0, "correct": 0, "started_at": datetime.utcnow()}
+    for question_id in (1, 2, 3):
+        is_correct = question_id <= correct
+        answer_sink.add(user_id=USER, exam_id=1, question_id=question_id,
+                        selected_option="A" if is_correct else "C", is_correct=is_correct)
+        tally["answered"] += 1
+        tally["correct"] += int(is_correct)
+    return tally
+
+def test_tally_matches_the_answers_of_this_attempt():
+    """verify_tally counts only this attempt's answers, including ones still buffered"""
+    tally = answer_exam(correct=2)
+    assert answer_sink.pending() == 3
+    assert verify_tally(USER, 1, tally) is True
+    assert answer_sink.pending() == 0
+    assert verify_tally(USER, 1, dict(tally, correct=3)) is False
+
+def test_finalize_from_tally_stores_the_session_score(session_local):
+    """The Result and the leaderboard rollup come from the tally"""
+    summary = finalize_exam(USER, 1, answer_exam(correct=2))
+    assert (summary["correct_answers"], summary["total_questions"], summary["passed"]) == (2, 3, False)
+
+    with session_local() as db:
+        result = db.get(Result, summary["result_id"])
+        assert (result.user_id, result.exam_id, result.score) == (USER, 1, 2)
+        assert db.get(UserScoreStats, USER).result_count == 1
+
+def test_finalize_without_tally_rereads_stored_answers(session_local):
+    """Sessions started before tallies are scored from every stored answer to the exam"""
+    answer_exam(correct=3)
+    summary = finalize_exam(USER, 1)
+    assert (summary["correct_answers"], summary["total_questions"]) == (3, 6)
+    with session_local() as db:
+        assert db.scalar(select(Result.score).filter_by(id=summary["result_id"])) == 3
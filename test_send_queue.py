@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Outbound send queue ordering checks
+"""
+
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+from telegram.error import RetryAfter
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.bot.send_queue import SendQueue, EXAM
+
+class FakeBot:
+    """Delivers after a random delay, tracking the sends in flight per chat"""
+
+    def __init__(self, flood=()):
+        self.flood = set(flood)  # texts answered with one RetryAfter
+        self.delivered = {}
+        self.inflight = {}
+        self.max_inflight = 0
+
+    async def send_message(self, chat_id, text):
+        self.inflight[chat_id] = self.inflight.get(chat_id, 0) + 1
+        self.max_inflight = max(self.max_inflight, self.inflight[chat_id])
+        try:
+            await asyncio.sleep(random.uniform(0, 0.01))
+            if text in self.flood:
+                self.flood.discard(text)
+                raise RetryAfter(0.05)
+            self.delivered.setdefault(chat_id, []).append(text)
+            return text
+        finally:
+            self.inflight[chat_id] -= 1
+
+def fast_queue():
+    return SendQueue(global_rate=1000, global_burst=100, chat_rate=1000, chat_burst=3)
+
+def test_each_chats_messages_arrive_in_order():
+    """Sends to one chat never overlap, so they land in the order they were queued"""
+    async def scenario():
+        bot = FakeBot()
+        queue = fast_queue()
+        futures = [
+            queue.send_message(bot, chat_id, f"{chat_id}-{n}")
+            for n in range(10)
+            for chat_id in (1, 2, 3)
+        ]
+        await asyncio.gather(*futures)
+        await queue.stop()
+        return bot
+
+    bot = asyncio.run(scenario())
+    assert bot.max_inflight == 1
+    for chat_id in (1, 2, 3):
+        assert bot.delivered[chat_id] == [f"{chat_id}-{n}" for n in range(10)]
+
+def test_retry_after_keeps_the_chat_in_order():
+    """A message Telegram pushed back is retried before the chat's later messages"""
+    async def scenario():
+        bot = FakeBot(flood={"first"})
+        queue = fast_queue()
+        futures = [queue.send_message(bot, 7, text, lane=EXAM) for text in ("first", "second", "third")]
+        results = await asyncio.gather(*futures)
+        await queue.stop()
+        return bot, queue, results
+
+    bot, queue, results = asyncio.run(scenario())
+    assert results == ["first", "second", "third"]
+    assert bot.delivered[7] == ["first", "second", "third"]
+    assert queue.retried == 1
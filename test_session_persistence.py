@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Session persistence round-trip checks
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+from telegram.ext import ApplicationBuilder, CallbackContext, ExtBot
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.bot.persistence import SessionPersistence
+from app.bot.send_queue import send_queue
+from app.handlers.question_handler import question_timeout
+from app.services.exam_session import ExamSession
+from app.utils.timer import timer_wheel
+
+USER = 4242
+CHAT = 4242
+
+class FakeBot(ExtBot):
+    """Accepts every send without talking to Telegram"""
+
+    async def send_message(self, chat_id, text, **kwargs):
+        return None
+
+async def _persist_and_restore(application, engine):
+    """What PTB's next persistence run stores, read back the way a restarted bot does"""
+    await application.update_persistence()
+    await application.persistence.flush()
+    return await SessionPersistence(bind=engine).get_user_data()
+
+def test_timeouts_are_persisted(exam_engine, bank, sink):
+    """Advancing and finishing a session from the timer wheel reaches the database"""
+
+    async def scenario():
+        application = (
+            ApplicationBuilder().bot(FakeBot("123:fake")).persistence(SessionPersistence(bind=exam_engine)).build()
+        )
+        session = ExamSession(USER, CHAT, bank.get_exam_questions(1)[:2], use_timer=True)
+        application.user_data[USER]["session"] = session
+        context = CallbackContext(application, chat_id=CHAT, user_id=USER)
+
+        # A timeout moves on to the second question
+        await question_timeout(context, 0)
+        timer_wheel.cancel(session.timer_key)
+        restored = await _persist_and_restore(application, exam_engine)
+        assert restored[USER]["session"].index == 1
+        assert restored[USER]["session"].answered == 1
+
+        # The last timeout ends the session; a restart must not resume it
+        await question_timeout(context, 1)
+        restored = await _persist_and_restore(application, exam_engine)
+        assert "session" not in restored[USER]
+
+        await send_queue.stop()
+
+    asyncio.run(scenario())
+    assert sink.flush() == 2
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Question countdown timer wheel checks
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.utils.timer import TimerWheel
+
+async def noop(*args):
+    pass
+
+def test_due_timers_fire_and_cancelled_ones_do_not():
+    """advance() returns what is due, never early, and skips cancelled keys"""
+    wheel = TimerWheel(tick=0.1, slots=4)
+    wheel.schedule("a", 0.25, noop, "a")
+    wheel.schedule("b", 0.25, noop, "b")
+    wheel.schedule("c", 1.0, noop, "c")  # due at tick 11, more than one revolution out
+
+    assert wheel.cancel("b") is True
+    assert wheel.cancel("b") is False
+    assert wheel.advance(until_tick=2) == []
+    assert [timer.args for timer in wheel.advance(until_tick=6)] == [("a",)]
+    # Slot of "c" was visited on the way, but its tick has not come yet
+    assert wheel.pending() == 1
+    assert [timer.args for timer in wheel.advance(until_tick=11)] == [("c",)]
+    assert wheel.stats()["cancelled"] == 1
+
+def test_rescheduling_a_key_replaces_its_timer():
+    """The next question's countdown replaces the previous one under the same key"""
+    wheel = TimerWheel(tick=0.1, slots=8)
+    wheel.schedule((1, 0), 0.2, noop, 0)
+    wheel.schedule((1, 0), 0.5, noop, 1)
+    assert wheel.pending() == 1
+    assert [timer.args for timer in wheel.advance(until_tick=10)] == [(1,)]
+
+def test_running_wheel_calls_back_on_time():
+    """On a loop the wheel fires callbacks in batches and keeps going after a failing one"""
+    fired = []
+
+    async def record(name):
+        fired.append(name)
+
+    async def explode():
+        raise RuntimeError("boom")
+
+    async def scenario():
+        wheel = TimerWheel(tick=0.01, slots=16)
+        wheel.schedule("late", 0.05, record, "late")
+        wheel.schedule("early", 0.02, record, "early")
+        wheel.schedule("broken", 0.02, explode)
+        wheel.schedule("cancelled", 0.02, record, "cancelled")
+        wheel.cancel("cancelled")
+        await asyncio.sleep(0.15)
+        await wheel.stop()
+        return wheel
+
+    wheel = asyncio.run(scenario())
+    assert fired == ["early", "late"]
+    assert wheel.stats()["fired"] == 3
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Per-user ordered update processing checks
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+from telegram import Update
+from telegram.ext import SimpleUpdateProcessor
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.bot.update_processor import UserOrderedUpdateProcessor
+
+USERS = 10
+ANSWERS = 20
+
+def poll_answer(update_id, user_id, option):
+    return Update.de_json({
+        "update_id": update_id,
+        "poll_answer": {
+            "poll_id": f"{user_id}-{option}", "option_ids": [option],
+            "user": {"id": user_id, "is_bot": False, "first_name": "Student"}
+        }
+    }, None)
+
+def answer_stream():
+    """Every user's answers, interleaved the way they arrive from Telegram"""
+    return [
+        poll_answer(answer * USERS + user, 1000 + user, answer % 4)
+        for answer in range(ANSWERS)
+        for user in range(USERS)
+    ]
+
+async def run(processor):
+    """Feed the stream like PTB's update fetcher; the handler mimics handle_poll_answer"""
+    user_data = {}
+    recorded = {}
+
+    async def handle_poll_answer(update):
+        data = user_data.setdefault(update.effective_user.id, {"index": 0})
+        index = data["index"]
+        # Recording the answer and sending the next question await between reading and advancing the index
+        await asyncio.sleep(0.001 * (3 - update.poll_answer.option_ids[0] % 3))
+        recorded.setdefault(update.effective_user.id, []).append((index, update.update_id))
+        data["index"] = index + 1
+
+    await processor.initialize()
+    tasks = [
+        asyncio.create_task(processor.process_update(update, handle_poll_answer(update)))
+        for update in answer_stream()
+    ]
+    await asyncio.gather(*tasks)
+    await processor.shutdown()
+    return user_data, recorded
+
+def test_each_users_answers_run_in_order():
+    """Every answer sees the index its predecessor left, in arrival order"""
+    processor = UserOrderedUpdateProcessor(max_running=4, max_admitted=64)
+    user_data, recorded = asyncio.run(run(processor))
+
+    for user in range(USERS):
+        user_id = 1000 + user
+        assert user_data[user_id]["index"] == ANSWERS
+        indexes = [index for index, _ in recorded[user_id]]
+        update_ids = [update_id for _, update_id in recorded[user_id]]
+        assert indexes == list(range(ANSWERS))
+        assert update_ids == sorted(update_ids)
+
+    stats = processor.stats()
+    assert stats["processed"] == USERS * ANSWERS
+    # Different users did run side by side, never beyond the cap
+    assert 1 < stats["peak_running"] <= 4
+    assert stats["users_pending"] == 0
+
+def test_unordered_concurrency_loses_answers():
+    """Control: plain concurrent processing races on the index"""
+    user_data, recorded = asyncio.run(run(SimpleUpdateProcessor(64)))
+    assert any(user_data[1000 + user]["index"] < ANSWERS for user in range(USERS))
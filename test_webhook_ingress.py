@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Webhook ingress checks, POSTing updates through a local ASGI client
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+from telegram.ext import SimpleUpdateProcessor
+
+# Add app to path
+sys.path.append(str(Path(__file__).parent))
+
+from app.bot.update_processor import UserOrderedUpdateProcessor
+from app.bot.webhook import WebhookIngress, create_app, SECRET_HEADER
+
+class FakeApplication:
+    """Records the updates handed to it; each one waits for `release` when given"""
+
+    def __init__(self, release=None, update_processor=None):
+        self.bot = None
+        self.update_processor = update_processor or SimpleUpdateProcessor(8)
+        self.release = release
+        self.update_ids = []
+
+    def create_task(self, coroutine, update=None):
+        return asyncio.get_running_loop().create_task(coroutine)
+
+    async def process_update(self, update):
+        if self.release is not None:
+            await self.release.wait()
+        self.update_ids.append(update.update_id)
+
+def make_update(update_id, user_id=1):
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id, "date": 0, "text": "/start",
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": "Test"}
+        }
+    }
+
+def client_for(ingress):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(ingress, "/webhook")), base_url="http://bot")
+
+def test_updates_are_acknowledged_then_processed():
+    """Every POST gets a 200 and each update reaches the application once"""
+    async def scenario():
+        application = FakeApplication()
+        ingress = WebhookIngress(workers=4, queue_size=100, secret="")
+        await ingress.start(application)
+        async with client_for(ingress) as client:
+            responses = await asyncio.gather(*(client.post("/webhook", json=make_update(i)) for i in range(50)))
+        await ingress.stop()
+        return application, ingress, responses
+
+    application, ingress, responses = asyncio.run(scenario())
+    assert [response.status_code for response in responses] == [200] * 50
+    assert sorted(application.update_ids) == list(range(50))
+    assert ingress.stats()["processed"] == 50
+
+def test_full_queue_sheds_with_503():
+    """Once the processor, workers and queue are busy, further POSTs are refused so Telegram redelivers them"""
+    async def scenario():
+        release = asyncio.Event()
+        application = FakeApplication(release, SimpleUpdateProcessor(1))
+        ingress = WebhookIngress(workers=1, queue_size=2, secret="")
+        await ingress.start(application)
+        async with client_for(ingress) as client:
+            statuses = []
+            for i in range(6):
+                statuses.append((await client.post("/webhook", json=make_update(i))).status_code)
+                await asyncio.sleep(0.01)  # lets the worker pick the first update up
+            release.set()
+        await ingress.stop()
+        return application, ingress, statuses
+
+    application, ingress, statuses = asyncio.run(scenario())
+    # One update running, one with the worker waiting for a slot, two queued, the rest shed
+    assert statuses == [200, 200, 200, 200, 503, 503]
+    assert application.update_ids == [0, 1, 2, 3]
+    assert ingress.stats()["shed"] == 2
+
+def test_secret_and_body_are_checked():
+    """A wrong secret token is refused and malformed bodies never reach the queue"""
+    async def scenario():
+        ingress = WebhookIngress(workers=1, queue_size=10, secret="s3cret")
+        await ingress.start(FakeApplication())
+        async with client_for(ingress) as client:
+            statuses = [
+                (await client.post("/webhook", json=make_update(1))).status_code,
+                (await client.post("/webhook", json=make_update(2), headers={SECRET_HEADER: "wrong"})).status_code,
+                (await client.post("/webhook", content=b"not json", headers={SECRET_HEADER: "s3cret"})).status_code,
+                (await client.post("/webhook", json=[1, 2], headers={SECRET_HEADER: "s3cret"})).status_code,
+                (await client.post("/webhook", json=make_update(3), headers={SECRET_HEADER: "s3cret"})).status_code
+            ]
+        await ingress.stop()
+        return ingress, statuses
+
+    ingress, statuses = asyncio.run(scenario())
+    assert statuses == [403, 403, 400, 400, 200]
+    assert ingress.stats()["received"] == 1
+
+def test_busy_user_does_not_hold_the_workers():
+    """A user whose updates queue on each other leaves the workers free for everyone else"""
+    async def scenario():
+        release = asyncio.Event()
+        done = asyncio.Event()
+
+        class OneSlowUser(FakeApplication):
+            async def process_update(self, update):
+                if update.effective_user.id == 1:
+                    await release.wait()
+                self.update_ids.append(update.update_id)
+                if update.effective_user.id == 2:
+                    done.set()
+
+        application = OneSlowUser(update_processor=UserOrderedUpdateProcessor(max_running=8, max_admitted=64))
+        ingress = WebhookIngress(workers=2, queue_size=100, secret="")
+        await ingress.start(application)
+        async with client_for(ingress) as client:
+            for i in range(10):
+                await client.post("/webhook", json=make_update(i, user_id=1))
+            await client.post("/webhook", json=make_update(10, user_id=2))
+            await asyncio.wait_for(done.wait(), 1.0)
+            release.set()
+        await ingress.stop()
+        return application
+
+    application = asyncio.run(scenario())
+    assert application.update_ids == [10] + list(range(10))